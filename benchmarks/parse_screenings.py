@@ -0,0 +1,99 @@
+"""Time movie-page parsing: streaming extractor vs a BeautifulSoup tree.
+
+Run from the repository root:
+
+    python -m benchmarks.parse_screenings --columns 40 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.screenings import ScreeningDiscovery
+
+FILLER = """
+<section class="qb-movie-details">
+  <h2 class="title">Feature {idx}</h2>
+  <ul class="tags">{tags}</ul>
+  <p>Synopsis paragraph with <em>markup</em>, <a href="/more">links</a> and &amp; entities.</p>
+</section>
+"""
+
+COLUMN = """
+<div class="qb-movie-info-column">
+  <div class="qb-screening-attributes"><span>IMAX</span><span>2D</span></div>
+  {anchors}
+</div>
+"""
+
+ANCHOR = (
+    '<a class="btn btn-primary btn-lg" data-url="https://tickets.example.com/order/{idx}" '
+    'data-attrs="{attrs}" data-cinema="1052" data-event="{idx}">'
+    '{hour:02d}:{minute:02d} <span class="event-seats-available">...</span></a>'
+)
+
+
+def build_page(columns: int, anchors_per_column: int = 6) -> str:
+    parts = ["<html><body>"]
+    for column in range(columns):
+        parts.append(
+            FILLER.format(idx=column, tags="".join(f"<li>tag {n}</li>" for n in range(10)))
+        )
+        anchors = []
+        for slot in range(anchors_per_column):
+            idx = column * anchors_per_column + slot
+            attrs = "imax,original-lang-en,subbed" if slot % 3 else "2d,dubbed-lang-cs"
+            anchors.append(
+                ANCHOR.format(idx=idx, attrs=attrs, hour=10 + slot * 2, minute=(idx * 5) % 60)
+            )
+        parts.append(COLUMN.format(anchors="".join(anchors)))
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def parse_with_soup(html: str) -> int:
+    soup = BeautifulSoup(html, "html.parser")
+    found = 0
+    for column in soup.select("div.qb-movie-info-column"):
+        for anchor in column.select("a.btn.btn-primary.btn-lg"):
+            attrs = str(anchor.get("data-attrs") or "").lower()
+            if "original-lang-en" in attrs and "imax" in attrs:
+                anchor.get_text(strip=True)
+                found += 1
+    return found
+
+
+def _time(fn: Callable[[], int], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / max(repeat, 1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    html = build_page(args.columns)
+    discovery = ScreeningDiscovery()
+    streaming = len(discovery._parse_screenings(html))
+    soup = parse_with_soup(html)
+    if streaming != soup:
+        raise SystemExit(f"Parsers disagree: streaming={streaming} soup={soup}")
+
+    soup_ms = _time(lambda: parse_with_soup(html), args.repeat)
+    streaming_ms = _time(lambda: len(discovery._parse_screenings(html)), args.repeat)
+    print(f"{len(html):,} bytes, {streaming} matching showtimes, {args.repeat} runs")
+    print(f"{'parser':<12} {'ms/page':>9}")
+    print(f"{'soup':<12} {soup_ms:>9.2f}")
+    print(f"{'streaming':<12} {streaming_ms:>9.2f}  ({soup_ms / streaming_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
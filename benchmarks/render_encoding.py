@@ -0,0 +1,80 @@
+"""Compare seat-map preview encodings by payload size and encode time.
+
+Run from the repository root:
+
+    python -m benchmarks.render_encoding --rows 20 --seats 30 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.seatmap_renderer import RenderEncoding, SeatMapRenderer
+
+STATUSES = [SeatStatus.AVAILABLE, SeatStatus.OCCUPIED, SeatStatus.OCCUPIED, SeatStatus.WHEELCHAIR]
+
+
+def build_hall(rows: int, seats_per_row: int, *, seed: int = 7) -> SeatMap:
+    rng = random.Random(seed)
+    return SeatMap.from_seats(
+        Seat(
+            row_number=row,
+            seat_number=number,
+            label=str(number),
+            status=rng.choice(STATUSES),
+            grid_x=number + (2 if number > seats_per_row // 2 else 0),
+            grid_row=row,
+        )
+        for row in range(1, rows + 1)
+        for number in range(1, seats_per_row + 1)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--seats", type=int, default=30, help="Seats per row.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-dimension", type=int, default=800)
+    args = parser.parse_args(argv)
+
+    seat_map = build_hall(args.rows, args.seats)
+    middle = args.seats // 2
+    suggestion = SeatBlockSuggestion(
+        row_number=args.rows // 2,
+        seat_numbers=[middle, middle + 1],
+        labels=[str(middle), str(middle + 1)],
+        grid_positions=[middle, middle + 1],
+        score=1.0,
+    )
+    image = SeatMapRenderer().render_image(seat_map, suggestion)
+
+    options = [(name, RenderEncoding.preset(name)) for name in RenderEncoding.PRESETS]
+    options.append(("webp-lossy", RenderEncoding(format="webp", webp_lossless=False)))
+    options += [
+        (
+            f"{name}@{args.max_dimension}",
+            RenderEncoding.preset(name, max_dimension=args.max_dimension),
+        )
+        for name in ("png-palette", "webp")
+    ]
+
+    print(f"{len(seat_map.seats)} seats, {image.width}x{image.height} px, {args.repeat} runs")
+    print(f"{'encoding':<22} {'bytes':>10} {'vs png':>8} {'ms/encode':>10}")
+    baseline: Optional[int] = None
+    for name, encoding in options:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            data = encoding.encode(image)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / max(args.repeat, 1)
+        baseline = baseline or len(data)
+        print(f"{name:<22} {len(data):>10,} {len(data) / baseline:>7.0%} {elapsed_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Compare the array and draw seat painters on a synthetic hall.
+
+Run from the repository root:
+
+    python -m benchmarks.render_painter --rows 25 --seats 40 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List, Optional
+
+from benchmarks.render_encoding import build_hall
+from src.seatmap_renderer import SeatMapRenderer
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=25)
+    parser.add_argument("--seats", type=int, default=40, help="Seats per row (25x40 = 1000).")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seat-size", type=int, nargs="+", default=[26, 12])
+    args = parser.parse_args(argv)
+
+    seat_map = build_hall(args.rows, args.seats)
+    print(f"{len(seat_map.seats)} seats, {args.repeat} runs, base layer cache disabled")
+    print(f"{'seat_size':>9} {'painter':<8} {'ms/paint':>9} {'speedup':>8}")
+    for seat_size in args.seat_size:
+        timings = {}
+        images = {}
+        for painter in SeatMapRenderer.PAINTERS:
+            renderer = SeatMapRenderer(
+                seat_size=seat_size,
+                seat_gap=max(seat_size // 4, 1),
+                base_cache_size=0,
+                painter=painter,
+            )
+            images[painter] = renderer._base_image(seat_map).tobytes()
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                renderer._base_image(seat_map)
+            timings[painter] = (time.perf_counter() - started) * 1000 / max(args.repeat, 1)
+        if images["array"] != images["draw"]:
+            raise SystemExit(f"Painters disagree at seat_size={seat_size}")
+        for painter, elapsed_ms in timings.items():
+            speedup = timings["draw"] / elapsed_ms if elapsed_ms else float("inf")
+            print(f"{seat_size:>9} {painter:<8} {elapsed_ms:>9.2f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure the import time of a CLI start-up with ``python -X importtime``.
+
+Run from the repository root:
+
+    python -m benchmarks.startup_imports --repeat 5
+
+The no-op run filters out every date (like ``tests/test_main.py``), so it shows
+the cost of starting the CLI without touching the network.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+SCENARIOS = {"--help": ["--help"], "no-op run": []}
+
+
+def _noop_env(home: str) -> Dict[str, str]:
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in {"WATCHLIST", "WATCHLIST_FILE", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"}
+    }
+    env.update(
+        {
+            "HOME": home,
+            "LOG_FILE": str(Path(home) / "monitor.log"),
+            # 2026-01-05 is a Monday; the three-day horizon holds no Sunday.
+            "DATE": "2026-01-05",
+            "ALLOWED_WEEKDAYS": "sun",
+        }
+    )
+    return env
+
+
+def profile(args: Sequence[str], env: Dict[str, str]) -> Tuple[float, Dict[str, float]]:
+    """Return (total seconds, seconds per top-level package) of one CLI start-up."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.main", *args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    total_us = 0
+    packages: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if name.startswith("  "):
+            continue
+        total_us += int(cumulative_us)
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(cumulative_us) / 1_000_000
+    return total_us / 1_000_000, packages
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest packages to list.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as home:
+        env = _noop_env(home)
+        print(f"{'scenario':<10} {'best ms':>8} {'median ms':>10}  slowest packages")
+        for label, cli_args in SCENARIOS.items():
+            runs = [profile(cli_args, env) for _ in range(max(args.repeat, 1))]
+            totals = sorted(total for total, _packages in runs)
+            _best, packages = min(runs, key=lambda run: run[0])
+            slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            listed = ", ".join(
+                f"{name} {seconds * 1000:.0f}" for name, seconds in slowest[: args.top]
+            )
+            print(
+                f"{label:<10} {totals[0] * 1000:>8.1f} {totals[len(totals) // 2] * 1000:>10.1f}"
+                f"  {listed}"
+            )
+
+
+if __name__ == "__main__":
+    main()
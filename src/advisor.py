@@ -3,17 +3,22 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import date
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+from src import metrics
 from src.config import AppConfig
+from src.logging_setup import log_context
 from src.screenings import ScreeningDescriptor, ScreeningDiscovery, ScreeningDiscoveryError
 from src.screenings_browser import BrowserScreeningDiscovery
 from src.seat_map import SeatMap, SeatMapParser
 from src.seat_selection import SeatBlockSuggestion, SeatScoringConfig, SeatSelector
 from src.seatmap_fetcher import SeatMapFetcher, SeatMapFetcherError
+from src.single_flight import SingleFlightSeatMapFetcher
 
 logger = logging.getLogger(__name__)
 
+ScreeningFilter = Callable[[date, ScreeningDescriptor], bool]
+
 
 @dataclass
 class SeatRecommendation:
@@ -33,12 +38,25 @@ class SeatAdvisor:
         fetcher: Optional[SeatMapFetcher] = None,
         parser: Optional[SeatMapParser] = None,
         browser_discovery: Optional[BrowserScreeningDiscovery] = None,
+        *,
+        fetch_freshness_seconds: float = 30.0,
     ):
         self.discovery = discovery or ScreeningDiscovery()
         self.fetcher = fetcher or SeatMapFetcher()
         self.parser = parser or SeatMapParser()
         self.browser_discovery = browser_discovery or BrowserScreeningDiscovery()
+        # Identical order URLs (overlapping targets, retries) share one fetch + parse.
+        self.seat_maps = SingleFlightSeatMapFetcher(
+            self.fetcher, parser=self.parser, freshness_seconds=fetch_freshness_seconds
+        )
         self.last_screening_dates: set[date] = set()
+        self.last_observations: List[SeatRecommendation] = []
+
+    def close(self) -> None:
+        """Release long-lived discovery resources (the browser session, if any)."""
+        close_browser = getattr(self.browser_discovery, "close", None)
+        if callable(close_browser):
+            close_browser()
 
     def recommend(
         self,
@@ -48,79 +66,214 @@ class SeatAdvisor:
         top_n: int = 3,
         include_wheelchair: bool = False,
         dates: Optional[Iterable[date]] = None,
+        screening_filter: Optional[ScreeningFilter] = None,
     ) -> List[SeatRecommendation]:
+        """Return seat suggestions for every screening on the requested dates.
+
+        `screening_filter` lets schedulers skip screenings that are not due yet;
+        every seat map that was actually fetched is kept in `last_observations`,
+        including those without suggestions. Both `last_observations` and
+        `last_screening_dates` describe the latest call only.
+        """
         if party_size < 1:
             raise ValueError("party_size must be >= 1")
 
         target_dates = list(dates) if dates else [config.movie_date()]
         results: List[SeatRecommendation] = []
-        self.last_screening_dates = set()
+        observations: List[SeatRecommendation] = []
+        screening_dates: Set[date] = set()
 
+        discovered = self.discover_dates(config, target_dates)
         for screening_date in target_dates:
-            movie_url = config.movie_url_for_date(screening_date)
-            try:
+            screenings = discovered.get(screening_date)
+            if screenings is None:
+                continue
+            for screening in screenings:
+                if screening_filter is not None and not screening_filter(screening_date, screening):
+                    continue
+                recommendation, seen_date = self._observe(
+                    screening_date,
+                    screening,
+                    party_size=party_size,
+                    top_n=top_n,
+                    include_wheelchair=include_wheelchair,
+                )
+                if seen_date is not None:
+                    screening_dates.add(seen_date)
+                if recommendation is None:
+                    continue
+                observations.append(recommendation)
+                if recommendation.suggestions:
+                    results.append(recommendation)
+
+        self.last_screening_dates = screening_dates
+        self.last_observations = observations
+        return results
+
+    def discover_screenings(
+        self, config: AppConfig, screening_date: date
+    ) -> Optional[List[ScreeningDescriptor]]:
+        """Discover screenings for one date, falling back to the browser.
+
+        Returns ``None`` when both discovery paths failed.
+        """
+        movie_url = config.movie_url_for_date(screening_date)
+        try:
+            with metrics.stage("discovery_http"):
                 screenings = self.discovery.discover(movie_url, config, target_date=screening_date)
-            except ScreeningDiscoveryError as exc:
-                logger.warning("Failed to discover screenings for %s: %s", movie_url, exc)
-                screenings = []
+        except ScreeningDiscoveryError as exc:
+            logger.warning("Failed to discover screenings for %s: %s", movie_url, exc)
+            screenings = []
+
+        if not screenings:
+            return self._discover_in_browser(config, screening_date)
+        return screenings
+
+    def _discover_in_browser(
+        self, config: AppConfig, screening_date: date
+    ) -> Optional[List[ScreeningDescriptor]]:
+        movie_url = config.movie_url_for_date(screening_date)
+        try:
+            with metrics.stage("discovery_browser"):
+                screenings: List[ScreeningDescriptor] = self.browser_discovery.discover(
+                    movie_url, config, target_date=screening_date
+                )
+        except ScreeningDiscoveryError as exc:
+            logger.warning("Browser discovery failed for %s: %s", movie_url, exc)
+            return None
+        return screenings
 
-            if not screenings:
+    def discover_dates(
+        self, config: AppConfig, dates: Sequence[date]
+    ) -> Dict[date, Optional[List[ScreeningDescriptor]]]:
+        """Discover every date with one page load per discovery path.
+
+        Dates without HTTP results go to the browser in one session. A date maps
+        to ``None`` when both paths failed. Discovery objects without
+        `discover_many` are queried date by date.
+        """
+        if not hasattr(self.discovery, "discover_many"):
+            return {day: self.discover_screenings(config, day) for day in dates}
+
+        results: Dict[date, Optional[List[ScreeningDescriptor]]] = {}
+        try:
+            with metrics.stage("discovery_http"):
+                results.update(self.discovery.discover_many(config, dates))
+        except ScreeningDiscoveryError as exc:
+            logger.warning("Failed to discover screenings for %s: %s", config.movie_name_slug, exc)
+
+        missing = [day for day in dates if not results.get(day)]
+        if missing:
+            if hasattr(self.browser_discovery, "discover_many"):
                 try:
-                    screenings = self.browser_discovery.discover(
-                        movie_url, config, target_date=screening_date
-                    )
+                    with metrics.stage("discovery_browser"):
+                        results.update(self.browser_discovery.discover_many(config, missing))
                 except ScreeningDiscoveryError as exc:
-                    logger.warning("Browser discovery failed for %s: %s", movie_url, exc)
-                    continue
-            for screening in screenings:
-                try:
-                    svg_markup = self.fetcher.fetch_svg(screening.order_url)
-                    presentation_date = getattr(self.fetcher, "last_presentation_date", None)
-                    if presentation_date and presentation_date != screening_date:
-                        logger.warning(
-                            "Skipping screening %s: order page shows %s instead of %s",
-                            screening.order_url,
-                            presentation_date.isoformat(),
-                            screening_date.isoformat(),
-                        )
-                        self.last_screening_dates.add(presentation_date)
-                        continue
-                    seat_map = self.parser.parse(svg_markup)
-                except (SeatMapFetcherError, ValueError) as exc:
                     logger.warning(
-                        "Skipping screening %s due to seat map error: %s", screening.order_url, exc
+                        "Browser discovery failed for %s: %s", config.movie_name_slug, exc
                     )
-                    if "captcha" in str(exc).lower():
-                        logger.warning(
-                            "Possible CAPTCHA encountered while fetching %s", screening.order_url
-                        )
-                    continue
+                    results.update({day: None for day in missing})
+            else:
+                for day in missing:
+                    results[day] = self._discover_in_browser(config, day)
+        return {day: results.get(day) for day in dates}
 
-                selector = SeatSelector(
-                    seat_map, SeatScoringConfig(include_wheelchair=include_wheelchair)
-                )
-                suggestions = (
-                    selector.best_blocks(size=party_size, top_n=top_n)
-                    if party_size > 1
-                    else selector.best_single_seats(top_n=top_n)
-                )
+    def evaluate_screening(
+        self,
+        screening_date: date,
+        screening: ScreeningDescriptor,
+        *,
+        party_size: int = 1,
+        top_n: int = 3,
+        include_wheelchair: bool = False,
+    ) -> Optional[SeatRecommendation]:
+        """Fetch, parse and score one screening.
 
-                if not suggestions:
-                    continue
+        Returns ``None`` when the seat map could not be loaded or belongs to a
+        different day; otherwise a recommendation whose `suggestions` may be empty.
+        Records logged meanwhile carry ``screening``, ``screening_date`` and
+        ``order_url`` fields (see `log_context`). Unlike `recommend` it keeps no
+        state on the advisor, so concurrent callers do not share anything.
+        """
+        recommendation, _seen_date = self._observe(
+            screening_date,
+            screening,
+            party_size=party_size,
+            top_n=top_n,
+            include_wheelchair=include_wheelchair,
+        )
+        return recommendation
 
-                if presentation_date:
-                    self.last_screening_dates.add(presentation_date)
-                else:
-                    self.last_screening_dates.add(screening_date)
-
-                results.append(
-                    SeatRecommendation(
-                        screening_date=screening_date,
-                        screening=screening,
-                        seat_map=seat_map,
-                        suggestions=suggestions,
-                        presentation_date=presentation_date,
-                    )
+    def _observe(
+        self,
+        screening_date: date,
+        screening: ScreeningDescriptor,
+        *,
+        party_size: int,
+        top_n: int,
+        include_wheelchair: bool,
+    ) -> Tuple[Optional[SeatRecommendation], Optional[date]]:
+        """Evaluate one screening; also return the screening date it revealed, if any."""
+        with log_context(
+            screening=screening.label,
+            screening_date=screening_date.isoformat(),
+            order_url=screening.order_url,
+        ):
+            return self._evaluate_screening(
+                screening_date,
+                screening,
+                party_size=party_size,
+                top_n=top_n,
+                include_wheelchair=include_wheelchair,
+            )
+
+    def _evaluate_screening(
+        self,
+        screening_date: date,
+        screening: ScreeningDescriptor,
+        *,
+        party_size: int,
+        top_n: int,
+        include_wheelchair: bool,
+    ) -> Tuple[Optional[SeatRecommendation], Optional[date]]:
+        try:
+            with metrics.stage("seatmap_fetch"):
+                fetched = self.seat_maps.fetch(screening.order_url)
+            presentation_date = fetched.presentation_date
+            if presentation_date and presentation_date != screening_date:
+                logger.warning(
+                    "Skipping screening %s: order page shows %s instead of %s",
+                    screening.order_url,
+                    presentation_date.isoformat(),
+                    screening_date.isoformat(),
+                )
+                return None, presentation_date
+            seat_map = fetched.seat_map
+        except (SeatMapFetcherError, ValueError) as exc:
+            logger.warning(
+                "Skipping screening %s due to seat map error: %s", screening.order_url, exc
+            )
+            if "captcha" in str(exc).lower():
+                logger.warning(
+                    "Possible CAPTCHA encountered while fetching %s", screening.order_url
                 )
+            return None, None
 
-        return results
+        with metrics.stage("select"):
+            selector = SeatSelector(
+                seat_map, SeatScoringConfig(include_wheelchair=include_wheelchair)
+            )
+            suggestions = (
+                selector.best_blocks(size=party_size, top_n=top_n)
+                if party_size > 1
+                else selector.best_single_seats(top_n=top_n)
+            )
+
+        recommendation = SeatRecommendation(
+            screening_date=screening_date,
+            screening=screening,
+            seat_map=seat_map,
+            suggestions=suggestions,
+            presentation_date=presentation_date,
+        )
+        return recommendation, (presentation_date or screening_date) if suggestions else None
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import enum
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Set
+
+from src.seat_map import SeatMap
+from src.seat_selection import SeatBlockSuggestion
+from src.state_store import AlertRecord, StateStore
+
+logger = logging.getLogger(__name__)
+
+
+class RealertMode(enum.Enum):
+    """When an alert for an already-notified screening/seat set may be repeated."""
+
+    IMPROVEMENT = "improvement"
+    COOLDOWN = "cooldown"
+    STATUS_CHANGE = "status_change"
+
+    @classmethod
+    def parse(cls, value: "str | RealertMode") -> "RealertMode":
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(str(value).strip().lower())
+        except ValueError as exc:
+            raise ValueError(f"Invalid re-alert mode: {value}") from exc
+
+
+@dataclass
+class AlertLedgerConfig:
+    mode: RealertMode = RealertMode.COOLDOWN
+    # COOLDOWN: minimum gap before the same seat set is alerted again.
+    cooldown_seconds: float = 6 * 3600.0
+    # IMPROVEMENT: a new seat set must beat the best alerted score by this much.
+    min_improvement: float = 0.01
+    # Informational notices (e.g. "no new screening day") repeat at most this often.
+    notice_cooldown_seconds: float = 24 * 3600.0
+    # Recently recorded alerts kept in memory (least recently used are dropped first).
+    cache_size: int = 1024
+
+
+def _digest(*parts: object) -> str:
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class AlertTicket:
+    """What the ledger records once an alert is delivered.
+
+    Plain values only, so the notification queue can spool it with the alert and
+    settle a replayed alert after a restart.
+    """
+
+    alert_key: str
+    screening_key: str
+    content_hash: str
+    score: float
+    status_hash: str
+
+
+class AlertLedger:
+    """Persistent record of sent alerts used to suppress repeats before rendering.
+
+    Alerts are keyed by screening and seat set. Each entry stores a content hash
+    (row, seats, score), a hash of the screening's seat statuses and the send
+    time, so the configured `RealertMode` can decide whether a repeat is useful.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        config: Optional[AlertLedgerConfig] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store
+        self.config = config or AlertLedgerConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Read-your-writes cache: the store may buffer writes until the cycle ends,
+        # so only the latest writes need to stay; both are bounded LRUs.
+        self._recent: "OrderedDict[str, AlertRecord]" = OrderedDict()
+        self._best_scores: "OrderedDict[str, float]" = OrderedDict()
+        # Alerts handed to the notifier whose delivery is not confirmed yet.
+        self._in_flight: Set[str] = set()
+        self.suppressed = 0
+
+    def should_send(
+        self, screening_key: str, suggestion: SeatBlockSuggestion, seat_map: SeatMap
+    ) -> bool:
+        alert_key = self._alert_key(screening_key, suggestion)
+        with self._lock:
+            if alert_key in self._in_flight:
+                self.suppressed += 1
+                return False
+        record = self._load(alert_key)
+        mode = self.config.mode
+        send = True
+
+        if mode is RealertMode.IMPROVEMENT:
+            best = self._best_score(screening_key)
+            send = record is None and (
+                best is None or suggestion.score >= best + self.config.min_improvement
+            )
+        elif record is not None and mode is RealertMode.COOLDOWN:
+            send = self._clock() - record.last_sent >= self.config.cooldown_seconds
+        elif record is not None and mode is RealertMode.STATUS_CHANGE:
+            send = record.status_hash != _digest(seat_map.status_vector())
+
+        if not send:
+            self.suppressed += 1
+            logger.debug(
+                "Suppressing repeat alert for %s row %s seats %s (%s)",
+                screening_key,
+                suggestion.row_number,
+                suggestion.seat_numbers,
+                mode.value,
+            )
+        return send
+
+    def ticket(
+        self, screening_key: str, suggestion: SeatBlockSuggestion, seat_map: SeatMap
+    ) -> AlertTicket:
+        return AlertTicket(
+            alert_key=self._alert_key(screening_key, suggestion),
+            screening_key=screening_key,
+            content_hash=_digest(
+                suggestion.row_number, suggestion.seat_numbers, f"{suggestion.score:.4f}"
+            ),
+            score=suggestion.score,
+            status_hash=_digest(seat_map.status_vector()),
+        )
+
+    def mark_in_flight(self, screening_key: str, suggestion: SeatBlockSuggestion) -> None:
+        """Hold back repeats of an alert until `record_sent` or `release` settles it."""
+        with self._lock:
+            self._in_flight.add(self._alert_key(screening_key, suggestion))
+
+    def hold(self, ticket: AlertTicket) -> None:
+        """`mark_in_flight` for an alert known only by its ticket (e.g. a replayed one)."""
+        with self._lock:
+            self._in_flight.add(ticket.alert_key)
+
+    def release(self, screening_key: str, suggestion: SeatBlockSuggestion) -> None:
+        """Forget an in-flight alert that was not delivered, so it can be sent again."""
+        with self._lock:
+            self._in_flight.discard(self._alert_key(screening_key, suggestion))
+
+    def record_sent(
+        self, screening_key: str, suggestion: SeatBlockSuggestion, seat_map: SeatMap
+    ) -> None:
+        """Record a delivered alert; call only once delivery is confirmed."""
+        self.settle(self.ticket(screening_key, suggestion, seat_map), delivered=True)
+
+    def settle(self, ticket: AlertTicket, *, delivered: bool) -> None:
+        """Record a delivered alert, or release an undelivered one."""
+        with self._lock:
+            self._in_flight.discard(ticket.alert_key)
+        if not delivered:
+            return
+        now = self._clock()
+        previous = self._load(ticket.alert_key)
+        record = AlertRecord(
+            alert_key=ticket.alert_key,
+            screening_key=ticket.screening_key,
+            content_hash=ticket.content_hash,
+            score=ticket.score,
+            status_hash=ticket.status_hash,
+            first_sent=previous.first_sent if previous else now,
+            last_sent=now,
+            times_sent=(previous.times_sent + 1) if previous else 1,
+        )
+        self._remember(record)
+
+    def should_send_notice(self, notice_key: str, message: str) -> bool:
+        """Allow an informational message unless the same text went out recently."""
+        record = self._load(f"notice|{notice_key}")
+        if record is None or record.content_hash != _digest(message):
+            return True
+        if self._clock() - record.last_sent >= self.config.notice_cooldown_seconds:
+            return True
+        self.suppressed += 1
+        logger.debug("Suppressing repeated notice %s", notice_key)
+        return False
+
+    def record_notice(self, notice_key: str, message: str) -> None:
+        alert_key = f"notice|{notice_key}"
+        now = self._clock()
+        previous = self._load(alert_key)
+        self._remember(
+            AlertRecord(
+                alert_key=alert_key,
+                screening_key=notice_key,
+                content_hash=_digest(message),
+                score=0.0,
+                status_hash="",
+                first_sent=previous.first_sent if previous else now,
+                last_sent=now,
+                times_sent=(previous.times_sent + 1) if previous else 1,
+            )
+        )
+
+    def _alert_key(self, screening_key: str, suggestion: SeatBlockSuggestion) -> str:
+        seats = ",".join(str(number) for number in sorted(suggestion.seat_numbers))
+        return _digest(screening_key, suggestion.row_number, seats)
+
+    def _load(self, alert_key: str) -> Optional[AlertRecord]:
+        with self._lock:
+            record = self._recent.get(alert_key)
+            if record is not None:
+                self._recent.move_to_end(alert_key)
+        return record if record is not None else self.store.load_alert(alert_key)
+
+    def _best_score(self, screening_key: str) -> Optional[float]:
+        with self._lock:
+            cached = self._best_scores.get(screening_key)
+        stored = self.store.best_alert_score(screening_key)
+        candidates = [score for score in (cached, stored) if score is not None]
+        return max(candidates) if candidates else None
+
+    def _remember(self, record: AlertRecord) -> None:
+        with self._lock:
+            self._recent[record.alert_key] = record
+            self._recent.move_to_end(record.alert_key)
+            best = self._best_scores.get(record.screening_key)
+            if best is None or record.score > best:
+                self._best_scores[record.screening_key] = record.score
+            self._best_scores.move_to_end(record.screening_key)
+            for cache in (self._recent, self._best_scores):
+                while len(cache) > max(self.config.cache_size, 1):
+                    cache.popitem(last=False)
+        self.store.save_alert(record)
@@ -63,6 +63,7 @@ class AppConfig:
     telegram_chat_id: Optional[str] = None
     log_level: Optional[str] = None
     log_file: Optional[str] = "logs/cinema-monitor.log"
+    log_format: str = "text"
     min_score: Optional[float] = 0.8
     avoid_aisle: bool = True
     aisle_distance: int = 3
@@ -75,6 +76,24 @@ class AppConfig:
     lang: str = "en_GB"
     earliest_show_time: Optional[str] = None
     allowed_weekdays: Optional[str] = None
+    seatmap_freshness_seconds: float = 30.0
+    realert_mode: str = "cooldown"
+    realert_cooldown_seconds: int = 6 * 3600
+    notification_queue_size: int = 100
+    notification_spool_dir: Optional[str] = None
+    alert_batch_linger_seconds: float = 0.0
+    alert_batch_max_size: int = 10
+    render_archive: bool = False
+    browser_session: bool = False
+    render_encoding: str = "png"
+    render_max_dimension: int = 0
+    render_workers: int = 0
+    render_executor: str = "process"
+    metrics_enabled: bool = False
+    metrics_file: Optional[str] = None
+    metrics_port: int = 0
+    metrics_host: str = "127.0.0.1"
+    health_max_age_seconds: float = 3600.0
 
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -87,6 +106,7 @@ class AppConfig:
             telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID"),
             log_level=_get_log_level_env("LOG_LEVEL", cls.log_level),
             log_file=os.getenv("LOG_FILE", cls.log_file),
+            log_format=os.getenv("LOG_FORMAT", cls.log_format).strip().lower(),
             min_score=_get_float_env("MIN_SCORE", cls.min_score),
             avoid_aisle=_get_bool_env("AVOID_AISLE", cls.avoid_aisle),
             aisle_distance=_get_int_env("AISLE_DISTANCE", cls.aisle_distance),
@@ -99,6 +119,37 @@ class AppConfig:
             # lang=os.getenv("LANG", cls.lang),
             earliest_show_time=os.getenv("EARLIEST_SHOW_TIME", cls.earliest_show_time),
             allowed_weekdays=os.getenv("ALLOWED_WEEKDAYS", cls.allowed_weekdays),
+            seatmap_freshness_seconds=_get_float_env(
+                "SEATMAP_FRESHNESS_SECONDS", cls.seatmap_freshness_seconds
+            )
+            or 0.0,
+            realert_mode=os.getenv("REALERT_MODE", cls.realert_mode),
+            realert_cooldown_seconds=_get_int_env(
+                "REALERT_COOLDOWN_SECONDS", cls.realert_cooldown_seconds
+            ),
+            notification_queue_size=_get_int_env(
+                "NOTIFICATION_QUEUE_SIZE", cls.notification_queue_size
+            ),
+            notification_spool_dir=os.getenv("NOTIFICATION_SPOOL_DIR", cls.notification_spool_dir),
+            alert_batch_linger_seconds=_get_float_env(
+                "ALERT_BATCH_LINGER_SECONDS", cls.alert_batch_linger_seconds
+            )
+            or 0.0,
+            alert_batch_max_size=_get_int_env("ALERT_BATCH_MAX_SIZE", cls.alert_batch_max_size),
+            render_archive=_get_bool_env("RENDER_ARCHIVE", cls.render_archive),
+            browser_session=_get_bool_env("BROWSER_SESSION", cls.browser_session),
+            render_encoding=os.getenv("RENDER_ENCODING", cls.render_encoding),
+            render_max_dimension=_get_int_env("RENDER_MAX_DIMENSION", cls.render_max_dimension),
+            render_workers=_get_int_env("RENDER_WORKERS", cls.render_workers),
+            render_executor=os.getenv("RENDER_EXECUTOR", cls.render_executor),
+            metrics_enabled=_get_bool_env("METRICS_ENABLED", cls.metrics_enabled),
+            metrics_file=os.getenv("METRICS_FILE", cls.metrics_file),
+            metrics_port=_get_int_env("METRICS_PORT", cls.metrics_port),
+            metrics_host=os.getenv("METRICS_HOST", cls.metrics_host),
+            health_max_age_seconds=_get_float_env(
+                "HEALTH_MAX_AGE_SECONDS", cls.health_max_age_seconds
+            )
+            or 0.0,
         )
 
     def movie_url(self) -> str:
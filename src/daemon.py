@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.advisor import SeatRecommendation
+from src.config import AppConfig
+from src.scheduler import MonitorScheduler, SchedulerConfig
+from src.screenings import ScreeningDescriptor
+from src.watchlist import Watchlist, WatchlistFile, WatchTarget
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_JOB = "discovery"
+SCREENING_JOB = "screening"
+
+
+@dataclass
+class DaemonConfig:
+    max_concurrent_jobs: int = 4
+    discovery_interval_seconds: float = 1800.0
+    # Used for screening jobs when the scheduler has no adaptive polling policy.
+    screening_interval_seconds: float = 300.0
+    retry_interval_seconds: float = 120.0
+    drain_timeout_seconds: float = 30.0
+    # Watchlist file (JSON/TOML/YAML) reloaded whenever it changes on disk.
+    config_file: Optional[str] = None
+    config_check_interval_seconds: float = 5.0
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """Timer entry; ordered by due time, then insertion sequence."""
+
+    due_at: float
+    seq: int
+    kind: str = field(compare=False)
+    target: WatchTarget = field(compare=False)
+    config: AppConfig = field(compare=False)
+    screening_date: date = field(compare=False)
+    screening: Optional[ScreeningDescriptor] = field(default=None, compare=False)
+
+    @property
+    def key(self) -> str:
+        if self.screening is None:
+            return f"{self.kind}|{self.target.key}|{self.screening_date.isoformat()}"
+        return MonitorScheduler.screening_key(self.target, self.screening)
+
+
+class MonitorDaemon:
+    """Long-running asyncio loop where every discovery date and screening is its own timer.
+
+    Jobs sit in a priority queue ordered by due time. Discovery jobs (one per
+    target and date) add screening jobs for newly listed showtimes; screening jobs
+    fetch one seat map, dispatch alerts through the wrapped `MonitorScheduler`
+    and reschedule themselves using its adaptive polling policy when enabled.
+    Blocking work runs on a thread pool capped at `max_concurrent_jobs`.
+    SIGTERM/SIGINT stop new jobs from starting and let in-flight ones drain.
+
+    With `config_file` set, the watchlist file is checked for changes and applied
+    through `apply_watchlist`: only the timers of added or removed targets change,
+    while the scheduler's pools, caches and state carry on.
+    """
+
+    def __init__(
+        self,
+        scheduler: MonitorScheduler,
+        config: Optional[DaemonConfig] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.scheduler = scheduler
+        self.config = config or DaemonConfig()
+        self._clock = clock
+        self._queue: List[ScheduledJob] = []
+        self._seq = itertools.count()
+        self._scheduled: Set[str] = set()
+        self._live_screenings: Dict[str, Set[str]] = {}
+        self._running: Set[asyncio.Task[None]] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.completed_jobs = 0
+        self._targets = {target.key: target for target in scheduler.watchlist.targets}
+        self._config_stamp = self._config_file_stamp()
+
+    async def run(self) -> None:
+        """Run until `request_stop` (or SIGTERM/SIGINT), then drain in-flight jobs."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        limit = max(self.config.max_concurrent_jobs, 1)
+        semaphore = asyncio.Semaphore(limit)
+        executor = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="monitor-job")
+        self._install_signal_handlers()
+        self._seed_discovery_jobs()
+        logger.info("Daemon started with %d job(s), max %d concurrent.", len(self._queue), limit)
+        watcher = (
+            asyncio.create_task(self._watch_config_file()) if self.config.config_file else None
+        )
+
+        try:
+            while not self._stopping:
+                job = await self._next_due_job()
+                if job is None:
+                    continue
+                await semaphore.acquire()
+                if self._stopping:
+                    semaphore.release()
+                    self._push(job)
+                    break
+                task = asyncio.create_task(self._run_job(job, executor))
+                self._running.add(task)
+
+                def _on_done(done: asyncio.Task[None]) -> None:
+                    self._running.discard(done)
+                    semaphore.release()
+
+                task.add_done_callback(_on_done)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+            await self._drain()
+            self._remove_signal_handlers()
+            executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Daemon stopped after %d job(s).", self.completed_jobs)
+
+    def request_stop(self) -> None:
+        """Stop scheduling new jobs; safe to call from any thread or signal handler."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._stopping = True
+            return
+        loop.call_soon_threadsafe(self._set_stopping)
+
+    def reload_config(self) -> bool:
+        """Re-read `config_file` and apply it; on errors the current watchlist stays.
+
+        The file's ``scheduler`` settings are applied on top of the environment defaults.
+        """
+        path = self.config.config_file
+        if not path:
+            return False
+        self._config_stamp = self._config_file_stamp()
+        try:
+            watchlist_file = WatchlistFile.load(path)
+            scheduler_config = SchedulerConfig.from_app_config(
+                self.scheduler.app_config
+            ).with_overrides(watchlist_file.settings)
+        except ValueError as exc:
+            logger.error("Ignoring invalid watchlist file %s: %s", path, exc)
+            return False
+        self.apply_watchlist(watchlist_file.watchlist, scheduler_config)
+        return True
+
+    def apply_watchlist(
+        self, watchlist: Watchlist, scheduler_config: Optional[SchedulerConfig] = None
+    ) -> None:
+        """Reconfigure the scheduler and add/drop only the timers of changed targets.
+
+        Queued jobs of removed targets are dropped and in-flight ones are not
+        re-armed; targets whose overrides changed keep their timers; new targets
+        get discovery jobs.
+        """
+        previous = self._targets
+        self.scheduler.reconfigure(watchlist, scheduler_config)
+        self._targets = {target.key: target for target in watchlist.targets}
+        removed = previous.keys() - self._targets.keys()
+        added = self._targets.keys() - previous.keys()
+        changed = {
+            key
+            for key in previous.keys() & self._targets.keys()
+            if previous[key] != self._targets[key]
+        }
+
+        kept: List[ScheduledJob] = []
+        for job in self._queue:
+            key = job.target.key
+            if key in removed:
+                self._scheduled.discard(job.key)
+                continue
+            if key in changed:
+                job.target = self._targets[key]
+                job.config = job.target.apply(self.scheduler.app_config)
+            kept.append(job)
+        heapq.heapify(kept)
+        self._queue = kept
+        for discovery_key in list(self._live_screenings):
+            if discovery_key.split("|", 2)[1] in removed:
+                del self._live_screenings[discovery_key]
+
+        # Idempotent: seeds new targets and any dates a longer horizon now covers.
+        self._seed_discovery_jobs()
+        logger.info(
+            "Watchlist reloaded: %d added, %d removed, %d changed target(s).",
+            len(added),
+            len(removed),
+            len(changed),
+        )
+
+    @property
+    def pending_jobs(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running_jobs(self) -> int:
+        return len(self._running)
+
+    def status(self) -> Dict[str, float]:
+        """Scheduler gauges plus the timer queue; safe to call from other threads."""
+        gauges = self.scheduler.status()
+        gauges.update(
+            jobs_pending=len(self._queue),
+            jobs_running=len(self._running),
+            jobs_completed=self.completed_jobs,
+            watch_targets=len(self._targets),
+        )
+        return gauges
+
+    def _set_stopping(self) -> None:
+        if not self._stopping:
+            logger.info("Stop requested; draining %d in-flight job(s).", len(self._running))
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _config_file_stamp(self) -> Optional[Tuple[int, int]]:
+        path = self.config.config_file
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def _watch_config_file(self) -> None:
+        interval = max(self.config.config_check_interval_seconds, 0.1)
+        while not self._stopping:
+            await asyncio.sleep(interval)
+            stamp = self._config_file_stamp()
+            if stamp is not None and stamp != self._config_stamp:
+                logger.info("Watchlist file %s changed; reloading.", self.config.config_file)
+                self.reload_config()
+
+    def _seed_discovery_jobs(self) -> None:
+        """Arm a discovery timer for every planned date not already scheduled.
+
+        The plan starts no earlier than today, so the horizon rolls forward.
+        """
+        now = self._clock()
+        today = date.fromtimestamp(now)
+        for target, config in self.scheduler.watchlist.configs(self.scheduler.app_config):
+            for screening_date in self.scheduler._plan_dates(config, today=today):
+                self._schedule(DISCOVERY_JOB, target, config, screening_date, due_at=now)
+
+    def _is_past(self, screening_date: date) -> bool:
+        return screening_date < date.fromtimestamp(self._clock())
+
+    def _schedule(
+        self,
+        kind: str,
+        target: WatchTarget,
+        config: AppConfig,
+        screening_date: date,
+        *,
+        due_at: float,
+        screening: Optional[ScreeningDescriptor] = None,
+    ) -> None:
+        job = ScheduledJob(
+            due_at=due_at,
+            seq=next(self._seq),
+            kind=kind,
+            target=target,
+            config=config,
+            screening_date=screening_date,
+            screening=screening,
+        )
+        if job.key in self._scheduled:
+            return
+        self._push(job)
+
+    def _push(self, job: ScheduledJob) -> None:
+        self._scheduled.add(job.key)
+        heapq.heappush(self._queue, job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _next_due_job(self) -> Optional[ScheduledJob]:
+        assert self._wakeup is not None
+        self._wakeup.clear()
+        timeout: Optional[float] = None
+        if self._queue:
+            delay = self._queue[0].due_at - self._clock()
+            if delay <= 0:
+                # The key stays in `_scheduled` while the job runs so discovery cannot
+                # enqueue a duplicate; `_finish` releases it.
+                return heapq.heappop(self._queue)
+            timeout = delay
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return None
+
+    async def _run_job(self, job: ScheduledJob, executor: ThreadPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            if job.kind == DISCOVERY_JOB:
+                screenings = await loop.run_in_executor(
+                    executor,
+                    self.scheduler.advisor.discover_screenings,
+                    job.config,
+                    job.screening_date,
+                )
+                self._after_discovery(job, screenings)
+            else:
+                recommendation = await loop.run_in_executor(executor, self._check_screening, job)
+                self._after_screening(job, recommendation)
+            self.completed_jobs += 1
+        except Exception as exc:
+            logger.exception("Job %s failed: %s", job.key, exc)
+            self._finish(job, self.config.retry_interval_seconds)
+
+    def _check_screening(self, job: ScheduledJob) -> Optional[SeatRecommendation]:
+        assert job.screening is not None
+        return self.scheduler.check_screening(
+            job.target, job.config, job.screening_date, job.screening
+        )
+
+    def _after_discovery(
+        self, job: ScheduledJob, screenings: Optional[List[ScreeningDescriptor]]
+    ) -> None:
+        if job.target.key not in self._targets:
+            # Removed from the watchlist while discovery was running.
+            self._finish(job, None)
+            return
+        if screenings is None:
+            self._finish(job, self.config.retry_interval_seconds)
+            return
+        self.scheduler.record_success()
+        now = self._clock()
+        live: Set[str] = set()
+        for screening in screenings:
+            live.add(MonitorScheduler.screening_key(job.target, screening))
+            self._schedule(
+                SCREENING_JOB,
+                job.target,
+                job.config,
+                job.screening_date,
+                due_at=now,
+                screening=screening,
+            )
+        self._live_screenings[job.key] = live
+        self._finish(job, self.config.discovery_interval_seconds)
+        # Keep polling and stored state bounded and roll the date horizon forward.
+        if self.scheduler.polling_policy is not None:
+            self.scheduler.polling_policy.prune(before=date.fromtimestamp(now))
+        self.scheduler.prune_state()
+        self._seed_discovery_jobs()
+
+    def _after_screening(
+        self, job: ScheduledJob, recommendation: Optional[SeatRecommendation]
+    ) -> None:
+        discovery_key = f"{DISCOVERY_JOB}|{job.target.key}|{job.screening_date.isoformat()}"
+        live = self._live_screenings.get(discovery_key)
+        if live is not None and job.key not in live:
+            logger.info("Screening %s no longer listed; dropping its timer.", job.key)
+            self._finish(job, None)
+            return
+        if recommendation is None:
+            self._finish(job, self.config.retry_interval_seconds)
+            return
+        self.scheduler.record_success()
+        interval = self.scheduler.next_check_interval(
+            job.target, recommendation, self.config.screening_interval_seconds
+        )
+        self._finish(job, interval)
+
+    def _finish(self, job: ScheduledJob, delay: Optional[float]) -> None:
+        """Release the job's key and re-arm its timer after `delay` (``None`` drops it)."""
+        self._scheduled.discard(job.key)
+        if delay is None or self._stopping:
+            return
+        if self._is_past(job.screening_date):
+            self._live_screenings.pop(job.key, None)
+            logger.info("Screening date of %s has passed; dropping it.", job.key)
+            return
+        target = self._targets.get(job.target.key)
+        if target is None:
+            logger.info("Target %s left the watchlist; dropping %s.", job.target.key, job.key)
+            return
+        config = job.config if target == job.target else target.apply(self.scheduler.app_config)
+        self._schedule(
+            job.kind,
+            target,
+            config,
+            job.screening_date,
+            due_at=self._clock() + max(delay, 0.0),
+            screening=job.screening,
+        )
+
+    async def _drain(self) -> None:
+        if not self._running:
+            return
+        pending = set(self._running)
+        logger.info(
+            "Waiting up to %.0fs for %d job(s).", self.config.drain_timeout_seconds, len(pending)
+        )
+        _done, still_running = await asyncio.wait(
+            pending, timeout=self.config.drain_timeout_seconds
+        )
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning("Cancelled %d job(s) that did not finish in time.", len(still_running))
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+    def _install_signal_handlers(self) -> None:
+        assert self._loop is not None
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.add_signal_handler(signum, self._set_stopping)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows or not running in the main thread (e.g. tests).
+                logger.debug("Signal handler for %s not installed.", signum)
+
+    def _remove_signal_handlers(self) -> None:
+        assert self._loop is not None
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.remove_signal_handler(signum)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    due_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    heartbeat_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_completed REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_due_idx ON jobs (due_at);
+"""
+
+
+@dataclass(frozen=True)
+class LeasedJob:
+    key: str
+    kind: str
+    payload: Dict[str, Any]
+    lease_owner: str
+    lease_expires: float
+    attempts: int
+
+
+class LeaseJobQueue:
+    """Broker-less job queue in a shared SQLite table with lease and heartbeat columns.
+
+    Workers (threads, processes, or hosts sharing the file) `claim` due jobs,
+    which leases them exclusively for `lease_seconds`. A worker keeps its leases
+    alive with `heartbeat` while it works and then `complete`s the job, which
+    pushes its due time one interval into the future; a screening is therefore
+    never checked twice within its interval. If a worker crashes, its leases
+    expire and the jobs become claimable again.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        lease_seconds: float = 120.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent claims serialise.
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(
+        self, key: str, kind: str, payload: Dict[str, Any], *, due_at: Optional[float] = None
+    ) -> bool:
+        """Add a job unless it already exists; returns True when it was inserted.
+
+        Existing jobs keep their schedule and lease but pick up the new payload.
+        """
+        due = self._clock() if due_at is None else due_at
+        encoded = json.dumps(payload, sort_keys=True)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (key, kind, payload, due_at) VALUES (?, ?, ?, ?)",
+                (key, kind, encoded, due),
+            )
+            inserted = cursor.rowcount > 0
+            if not inserted:
+                conn.execute("UPDATE jobs SET payload = ? WHERE key = ?", (encoded, key))
+        return inserted
+
+    def claim(self, worker_id: str, *, limit: int = 1) -> List[LeasedJob]:
+        """Lease up to `limit` due jobs that nobody else holds a live lease on."""
+        now = self._clock()
+        expires = now + self.lease_seconds
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT key, kind, payload, attempts FROM jobs "
+                "WHERE due_at <= ? AND (lease_owner IS NULL OR lease_expires < ?) "
+                "ORDER BY due_at LIMIT ?",
+                (now, now, max(limit, 1)),
+            ).fetchall()
+            for key, _kind, _payload, _attempts in rows:
+                conn.execute(
+                    "UPDATE jobs SET lease_owner = ?, lease_expires = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1 WHERE key = ?",
+                    (worker_id, expires, now, key),
+                )
+        return [
+            LeasedJob(
+                key=key,
+                kind=kind,
+                payload=json.loads(payload),
+                lease_owner=worker_id,
+                lease_expires=expires,
+                attempts=attempts + 1,
+            )
+            for key, kind, payload, attempts in rows
+        ]
+
+    def heartbeat(self, worker_id: str, keys: Sequence[str]) -> int:
+        """Extend the leases `worker_id` still holds; returns how many were renewed."""
+        if not keys:
+            return 0
+        now = self._clock()
+        renewed = 0
+        with self._transaction() as conn:
+            for key in keys:
+                cursor = conn.execute(
+                    "UPDATE jobs SET lease_expires = ?, heartbeat_at = ? "
+                    "WHERE key = ? AND lease_owner = ?",
+                    (now + self.lease_seconds, now, key, worker_id),
+                )
+                renewed += cursor.rowcount
+        return renewed
+
+    def complete(self, worker_id: str, key: str, *, next_due_in: Optional[float]) -> bool:
+        """Release the lease and reschedule after `next_due_in` seconds (``None`` removes it).
+
+        Returns False when the lease was lost (expired and taken by another worker).
+        """
+        now = self._clock()
+        with self._transaction() as conn:
+            if next_due_in is None:
+                cursor = conn.execute(
+                    "DELETE FROM jobs WHERE key = ? AND lease_owner = ?", (key, worker_id)
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE jobs SET lease_owner = NULL, lease_expires = NULL, due_at = ?, "
+                    "attempts = 0, last_completed = ? WHERE key = ? AND lease_owner = ?",
+                    (now + max(next_due_in, 0.0), now, key, worker_id),
+                )
+        if cursor.rowcount == 0:
+            logger.warning("Lease on %s lost before completion by %s", key, worker_id)
+            return False
+        return True
+
+    def release(self, worker_id: str, key: str, *, retry_in: float = 0.0) -> None:
+        """Hand a job back without completing it (e.g. on failure or shutdown)."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_owner = NULL, lease_expires = NULL, due_at = ? "
+                "WHERE key = ? AND lease_owner = ?",
+                (self._clock() + max(retry_in, 0.0), key, worker_id),
+            )
+
+    def remove(self, key: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM jobs WHERE key = ?", (key,))
+
+    def retain(self, kind: str, keep: Callable[[str], bool]) -> int:
+        """Delete jobs of `kind` whose key `keep` rejects; returns how many were removed.
+
+        Jobs under a live lease are left alone; their worker completes them and a
+        later call removes them.
+        """
+        now = self._clock()
+        with self._transaction() as conn:
+            keys = [
+                key
+                for (key,) in conn.execute(
+                    "SELECT key FROM jobs WHERE kind = ? "
+                    "AND (lease_owner IS NULL OR lease_expires < ?)",
+                    (kind, now),
+                ).fetchall()
+                if not keep(key)
+            ]
+            for key in keys:
+                conn.execute("DELETE FROM jobs WHERE key = ?", (key,))
+        return len(keys)
+
+    def seconds_until_next_due(self) -> Optional[float]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(CASE WHEN lease_owner IS NOT NULL AND lease_expires >= ? "
+                "THEN lease_expires ELSE due_at END) FROM jobs",
+                (now,),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return max(float(row[0]) - now, 0.0)
+
+    def stats(self) -> Dict[str, int]:
+        now = self._clock()
+        with self._lock:
+            total, due, leased = self._conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(CASE WHEN due_at <= ? THEN 1 ELSE 0 END), 0), "
+                "COALESCE(SUM(CASE WHEN lease_owner IS NOT NULL AND lease_expires >= ? "
+                "THEN 1 ELSE 0 END), 0) FROM jobs",
+                (now, now),
+            ).fetchone()
+        return {"total": int(total), "due": int(due), "leased": int(leased)}
+
+    @contextmanager
+    def keep_alive(self, worker_id: str, keys: Sequence[str]) -> Iterator[None]:
+        """Renew the given leases from a background thread while the block runs."""
+        stop = threading.Event()
+        interval = max(self.lease_seconds / 3.0, 0.05)
+
+        def _beat() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.heartbeat(worker_id, keys)
+                except sqlite3.Error as exc:
+                    logger.warning("Lease heartbeat failed for %s: %s", worker_id, exc)
+
+        thread = threading.Thread(target=_beat, name=f"lease-heartbeat-{worker_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
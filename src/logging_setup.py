@@ -1,22 +1,124 @@
 from __future__ import annotations
 
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
 import logging
 import logging.config
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LOG_FORMATS = ("text", "json")
+
+# Fields attached to every record logged inside `log_context` on this thread/task.
+_context: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "log_context", default=None
+)
+_listener: Optional[Tuple[QueueListener, QueueHandler]] = None
+
+# Attributes every LogRecord has; anything else was passed via `extra` or `log_context`.
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+@contextlib.contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Attach `fields` (e.g. ``screening=...``) to every record logged in the block."""
+    token = _context.set({**(_context.get() or {}), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and extra fields.
+
+    Fields from `log_context` or ``extra=`` (``stage``, ``duration_ms``,
+    ``screening``, ``order_url``, ...) become top-level keys; a traceback is
+    stored under ``exception``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, value in (_context.get() or {}).items():
+            if not hasattr(record, name):
+                setattr(record, name, value)
+        return True
+
+
+class _RecordQueueHandler(QueueHandler):
+    """Hands records to the listener thread with only the message interpolated.
+
+    Unlike `QueueHandler.prepare`, the traceback stays in ``exc_text`` instead of
+    being merged into the message, so the real handlers format it as usual.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 def setup_logging(
-    level: Optional[str] = None, log_file: Optional[str] = None, httpx_level: str = "WARNING"
+    level: Optional[str] = None,
+    log_file: Optional[str] = None,
+    httpx_level: str = "WARNING",
+    log_format: str = "text",
 ) -> None:
     """
     Configure application logging.
 
+    The root logger only gets a queue handler; formatting and console/file I/O
+    run on a `QueueListener` thread, which `shutdown_logging` flushes and stops
+    (also called at exit and by the next `setup_logging` call).
+
     Args:
         level: Base log level (defaults to INFO when omitted).
         log_file: Optional path to a rotating log file.
         httpx_level: Logging level for noisy third-party loggers.
+        log_format: ``text`` or ``json`` (one JSON object per line, see `JsonFormatter`).
     """
+    global _listener
+
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {log_format} (expected one of {LOG_FORMATS})")
+    shutdown_logging()
 
     log_level = (level or "INFO").upper()
     file_path = log_file
@@ -25,7 +127,7 @@ def setup_logging(
     handler_configs: Dict[str, Dict[str, Any]] = {
         "console": {
             "class": "logging.StreamHandler",
-            "formatter": "standard",
+            "formatter": log_format,
             "level": log_level,
         }
     }
@@ -35,7 +137,7 @@ def setup_logging(
         handlers.append("file")
         handler_configs["file"] = {
             "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "standard",
+            "formatter": log_format,
             "level": log_level,
             "filename": file_path,
             "maxBytes": 5 * 1024 * 1024,
@@ -47,9 +149,10 @@ def setup_logging(
             "version": 1,
             "disable_existing_loggers": False,
             "formatters": {
-                "standard": {
+                "text": {
                     "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-                }
+                },
+                "json": {"()": JsonFormatter},
             },
             "handlers": handler_configs,
             "root": {
@@ -59,6 +162,40 @@ def setup_logging(
         }
     )
 
+    # Move the configured handlers behind a queue so log calls never wait on I/O.
+    root = logging.getLogger()
+    targets = list(root.handlers)
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _RecordQueueHandler(records)
+    queue_handler.addFilter(_ContextFilter())
+    for handler in targets:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener = QueueListener(records, *targets, respect_handler_level=True)
+    listener.start()
+    _listener = (listener, queue_handler)
+
     # Reduce noise from httpx/httpcore unless explicitly overridden.
     logging.getLogger("httpx").setLevel(httpx_level)
     logging.getLogger("httpcore").setLevel(httpx_level)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread (idempotent).
+
+    The console/file handlers go back on the root logger, so anything logged
+    afterwards is written synchronously.
+    """
+    global _listener
+    active, _listener = _listener, None
+    if active is None:
+        return
+    listener, queue_handler = active
+    root = logging.getLogger()
+    root.removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
+atexit.register(shutdown_logging)
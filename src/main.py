@@ -1,21 +1,101 @@
+import argparse
+import asyncio
 import logging
+import os
+import signal
+import socket
+from typing import List, Optional
 
+from src import metrics
 from src.advisor import SeatAdvisor
 from src.config import AppConfig
+from src.daemon import DaemonConfig, MonitorDaemon
+from src.job_queue import LeaseJobQueue
 from src.logging_setup import setup_logging
+from src.metrics_server import MetricsServer, StatusProvider
 from src.notifier import Notifier
 from src.scheduler import MonitorScheduler, SchedulerConfig
+from src.screenings_browser import BrowserScreeningDiscovery
+from src.watchlist import Watchlist, WatchlistFile
 
 logger = logging.getLogger(__name__)
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cinema-monitor",
+        description="Check Cinema City seat maps and send alerts for good seats.",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run continuously with per-screening timers instead of a single sweep.",
+    )
+    parser.add_argument(
+        "--max-concurrent-jobs",
+        type=int,
+        default=DaemonConfig.max_concurrent_jobs,
+        help="Maximum number of discovery/screening jobs running at once in daemon mode.",
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help=(
+            "Watchlist file (JSON, TOML or YAML) with targets and scheduler settings; "
+            "reloaded on change in daemon mode (default: WATCHLIST_FILE)."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help=(
+            "Serve /metrics and /healthz on this port in --daemon/--worker mode "
+            "(default: METRICS_PORT; 0 disables)."
+        ),
+    )
+    mode.add_argument(
+        "--worker",
+        action="store_true",
+        help="Run as one of several workers sharing a lease-based job queue.",
+    )
+    parser.add_argument(
+        "--queue-path",
+        default=None,
+        help="Job queue database shared by workers (default: next to the state store).",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Identifier used for job leases (default: hostname:pid).",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
     config = AppConfig.from_env()
-    setup_logging(level=config.log_level, log_file=config.log_file)
+    setup_logging(level=config.log_level, log_file=config.log_file, log_format=config.log_format)
+    metrics_port = config.metrics_port if args.metrics_port is None else args.metrics_port
+    serve_metrics = metrics_port > 0 and (args.daemon or args.worker)
+    metrics.configure(enabled=config.metrics_enabled or bool(config.metrics_file) or serve_metrics)
+    config_path = args.config or os.getenv("WATCHLIST_FILE", "").strip() or None
+    scheduler_config = SchedulerConfig.from_app_config(config)
+    if config_path:
+        try:
+            watchlist_file = WatchlistFile.load(config_path)
+            scheduler_config = scheduler_config.with_overrides(watchlist_file.settings)
+        except ValueError as exc:
+            logger.error("Invalid watchlist file %s: %s", config_path, exc)
+            raise SystemExit(1) from exc
+        watchlist = watchlist_file.watchlist
+    else:
+        watchlist = Watchlist.from_env(config)
     logger.info(
-        "Starting Cinema Seat Advisor for %s (%s)",
-        config.movie_name_slug,
-        config.movie_id,
+        "Starting Cinema Seat Advisor for %d target(s): %s",
+        len(watchlist),
+        ", ".join(target.key for target in watchlist.targets),
     )
 
     if not config.telegram_bot_token or not config.telegram_chat_id:
@@ -23,21 +103,59 @@ def main():
             "Telegram credentials not found. Alerts will be logged but not sent via Telegram."
         )
 
-    advisor = SeatAdvisor()
+    advisor = SeatAdvisor(
+        browser_discovery=BrowserScreeningDiscovery(session=config.browser_session),
+        fetch_freshness_seconds=config.seatmap_freshness_seconds,
+    )
     notifier = Notifier(config)
     scheduler = MonitorScheduler(
         config,
         advisor=advisor,
         notifier=notifier,
-        scheduler_config=SchedulerConfig.from_app_config(config),
+        scheduler_config=scheduler_config,
+        watchlist=watchlist,
     )
 
+    server: Optional[MetricsServer] = None
+    job_queue: Optional[LeaseJobQueue] = None
     try:
-        scheduler.run_once()
+        if args.worker:
+            queue_path = args.queue_path or scheduler.state_store.path.with_name("jobs.sqlite3")
+            worker_id = args.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+            signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+            if serve_metrics:
+                server = _metrics_server(config, metrics_port, scheduler.status).start()
+            job_queue = LeaseJobQueue(queue_path)
+            scheduler.run_worker(job_queue, worker_id)
+        elif args.daemon:
+            daemon = MonitorDaemon(
+                scheduler,
+                DaemonConfig(max_concurrent_jobs=args.max_concurrent_jobs, config_file=config_path),
+            )
+            if serve_metrics:
+                server = _metrics_server(config, metrics_port, daemon.status).start()
+            asyncio.run(daemon.run())
+        else:
+            scheduler.run_once()
     except KeyboardInterrupt:
         logger.info("Stopping monitor...")
     except Exception as exc:
         logger.exception("Unexpected error: %s", exc)
+    finally:
+        if server is not None:
+            server.close()
+        if job_queue is not None:
+            job_queue.close()
+        scheduler.close()
+
+
+def _metrics_server(config: AppConfig, port: int, status: StatusProvider) -> MetricsServer:
+    return MetricsServer(
+        status,
+        host=config.metrics_host,
+        port=port,
+        max_age_seconds=config.health_max_age_seconds,
+    )
 
 
 if __name__ == "__main__":
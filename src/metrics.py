@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+PROMETHEUS_PREFIX = "cinema_monitor"
+
+_NOOP: ContextManager[None] = nullcontext()
+
+
+@dataclass
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    bounds: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class _StageTimer:
+    __slots__ = ("_registry", "_stage", "_started")
+
+    def __init__(self, registry: MetricsRegistry, stage: str):
+        self._registry = registry
+        self._stage = stage
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = self._registry.clock()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        elapsed = self._registry.clock() - self._started
+        self._registry.observe(self._stage, elapsed)
+        if exc_type is not None:
+            self._registry.increment(f"{self._stage}_errors")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Stage %s took %.1fms",
+                self._stage,
+                elapsed * 1000,
+                extra={
+                    "stage": self._stage,
+                    "duration_ms": round(elapsed * 1000, 3),
+                    "failed": exc_type is not None,
+                },
+            )
+
+
+class MetricsRegistry:
+    """Thread-safe counters and per-stage latency histograms.
+
+    Disabled registries return a shared no-op context manager from `stage()` and
+    ignore `observe`/`increment`, so instrumented code pays one attribute check.
+    Besides the lifetime totals, per-stage counts and time since the last
+    `take_cycle_summary()` call are tracked for the per-cycle log line.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._cycle: Dict[str, List[float]] = {}
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Time the enclosed block as stage `name`; failures also count `<name>_errors`."""
+        if not self.enabled:
+            return _NOOP
+        return _StageTimer(self, name)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            cycle = self._cycle.setdefault(stage, [0, 0.0])
+            cycle[0] += 1
+            cycle[1] += seconds
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._cycle.clear()
+
+    def take_cycle_summary(self) -> str:
+        """``stage=<count>x<seconds>s`` for every stage seen since the previous call."""
+        with self._lock:
+            cycle, self._cycle = self._cycle, {}
+        return " ".join(
+            f"{stage}={int(count)}x{total:.3f}s" for stage, (count, total) in sorted(cycle.items())
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly copy of every counter and histogram."""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "stages": {
+                    stage: {
+                        "count": histogram.count,
+                        "sum": histogram.total,
+                        "buckets": {
+                            _format_bound(bound): cumulative
+                            for bound, cumulative in _cumulative(histogram)
+                        },
+                    }
+                    for stage, histogram in sorted(self._histograms.items())
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, gauges: Optional[Mapping[str, float]] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4).
+
+        `gauges` are point-in-time values owned by the caller (queue depths, ...)
+        exported as ``cinema_monitor_<name>``.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = [
+                (stage, list(_cumulative(histogram)), histogram.total, histogram.count)
+                for stage, histogram in sorted(self._histograms.items())
+            ]
+        lines: List[str] = []
+        for name, value in sorted((gauges or {}).items()):
+            metric = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {_format_value(value)}")
+        for name, value in counters:
+            metric = f"{PROMETHEUS_PREFIX}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {_format_value(value)}")
+        if histograms:
+            metric = f"{PROMETHEUS_PREFIX}_stage_seconds"
+            lines.append(f"# HELP {metric} Time spent per pipeline stage.")
+            lines.append(f"# TYPE {metric} histogram")
+            for stage, buckets, total, count in histograms:
+                label = f'stage="{stage}"'
+                for bound, cumulative in buckets:
+                    lines.append(
+                        f'{metric}_bucket{{{label},le="{_format_bound(bound)}"}} {cumulative}'
+                    )
+                lines.append(f"{metric}_sum{{{label}}} {_format_value(total)}")
+                lines.append(f"{metric}_count{{{label}}} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: str | Path) -> None:
+        """Atomically write a snapshot: Prometheus text for ``.prom``, JSON otherwise."""
+        target = Path(path)
+        content = self.to_prometheus() if target.suffix == ".prom" else self.to_json()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.tmp")
+        temporary.write_text(content, encoding="utf-8")
+        os.replace(temporary, target)
+
+
+def _cumulative(histogram: Histogram) -> List[Tuple[float, int]]:
+    running = 0
+    result: List[Tuple[float, int]] = []
+    for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts, strict=True):
+        running += count
+        result.append((bound, running))
+    return result
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+# Process-wide registry used by the instrumented modules; disabled by default.
+_registry = MetricsRegistry(enabled=False)
+
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+def set_registry(registry: MetricsRegistry) -> MetricsRegistry:
+    """Install `registry` process-wide and return the previous one."""
+    global _registry
+    previous, _registry = _registry, registry
+    return previous
+
+
+def configure(*, enabled: bool) -> MetricsRegistry:
+    """Enable or disable the process-wide registry (keeps recorded values)."""
+    _registry.enabled = enabled
+    return _registry
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time a block on the process-wide registry (no-op while disabled)."""
+    return _registry.stage(name)
+
+
+def increment(name: str, amount: float = 1) -> None:
+    _registry.increment(name, amount)
+
+
+def observe(name: str, seconds: float) -> None:
+    _registry.observe(name, seconds)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src import metrics
+from src.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+
+StatusProvider = Callable[[], Dict[str, float]]
+
+
+class MetricsServer:
+    """Embedded HTTP endpoint for ``/metrics`` and ``/healthz`` (standard library only).
+
+    Requests are served by a `ThreadingHTTPServer` on daemon threads, so a scrape
+    never runs on the monitoring loop. Per request it copies the metrics registry
+    and calls `status` (cheap gauges such as queue depths and cache hit counts).
+    A rendered body is reused for `cache_seconds`. At most `max_concurrent_requests`
+    are served at once and the rest get 503, and slow clients are cut off after
+    `request_timeout_seconds`.
+
+    ``/metrics`` returns Prometheus text, or JSON with ``?format=json``.
+    ``/healthz`` returns 200 while the ``last_success_timestamp_seconds`` gauge
+    (or the server start, before the first success) is at most
+    `max_age_seconds` old, and 503 otherwise.
+    """
+
+    def __init__(
+        self,
+        status: Optional[StatusProvider] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        registry: Optional[MetricsRegistry] = None,
+        max_age_seconds: float = 3600.0,
+        cache_seconds: float = 1.0,
+        max_concurrent_requests: int = 4,
+        request_timeout_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.status = status or dict
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.max_age_seconds = max_age_seconds
+        self.cache_seconds = max(cache_seconds, 0.0)
+        self.request_timeout_seconds = request_timeout_seconds
+        self._clock = clock
+        self._slots = threading.BoundedSemaphore(max(max_concurrent_requests, 1))
+        self._cache_lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, bytes]] = {}
+        self._started_at = clock()
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound host and port (the real port when started with ``port=0``)."""
+        if self._httpd is None:
+            return self.host, self.port
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> "MetricsServer":
+        if self._httpd is not None:
+            return self
+        self._httpd = _Server((self.host, self.port), _Handler, self)
+        self._started_at = self._clock()
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info("Serving /metrics and /healthz on http://%s:%d", *self.address)
+        return self
+
+    def close(self) -> None:
+        httpd, self._httpd = self._httpd, None
+        if httpd is None:
+            return
+        httpd.shutdown()
+        httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=self.request_timeout_seconds)
+            self._thread = None
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def render_metrics(self, fmt: str = "prometheus") -> bytes:
+        """Body of ``/metrics`` in `fmt` (``prometheus`` or ``json``), cached briefly."""
+        now = self._clock()
+        with self._cache_lock:
+            cached = self._cache.get(fmt)
+            if cached is not None and now < cached[0]:
+                return cached[1]
+            body = self._render(fmt)
+            self._cache[fmt] = (now + self.cache_seconds, body)
+            return body
+
+    def health(self) -> Tuple[bool, Dict[str, Any]]:
+        """``(healthy, details)`` for ``/healthz``."""
+        last_success = self._gauges().get("last_success_timestamp_seconds")
+        reference = self._started_at if last_success is None else last_success
+        age = max(self._clock() - reference, 0.0)
+        healthy = age <= self.max_age_seconds
+        return healthy, {
+            "status": "ok" if healthy else "stale",
+            "last_success_age_seconds": None if last_success is None else round(age, 3),
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+    def _render(self, fmt: str) -> bytes:
+        registry = self.registry or metrics.get_registry()
+        gauges = self._gauges()
+        if fmt == "json":
+            snapshot = registry.snapshot()
+            snapshot["gauges"] = dict(sorted(gauges.items()))
+            return json.dumps(snapshot, indent=2, sort_keys=True).encode("utf-8")
+        return registry.to_prometheus(gauges).encode("utf-8")
+
+    def _gauges(self) -> Dict[str, float]:
+        try:
+            return dict(self.status())
+        except Exception as exc:
+            logger.warning("Status provider failed: %s", exc)
+            return {}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        handler: type[BaseHTTPRequestHandler],
+        owner: MetricsServer,
+    ):
+        self.owner = owner
+        super().__init__(address, handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.settimeout(self.server.owner.request_timeout_seconds)
+
+    def do_GET(self) -> None:
+        owner = self.server.owner
+        if not owner._slots.acquire(blocking=False):
+            self._respond(503, b"busy\n", "text/plain; charset=utf-8")
+            return
+        try:
+            url = urlsplit(self.path)
+            if url.path == "/metrics":
+                fmt = parse_qs(url.query).get("format", ["prometheus"])[0]
+                if fmt == "json":
+                    self._respond(200, owner.render_metrics("json"), JSON_CONTENT_TYPE)
+                else:
+                    self._respond(200, owner.render_metrics(), PROMETHEUS_CONTENT_TYPE)
+            elif url.path == "/healthz":
+                healthy, details = owner.health()
+                body = json.dumps(details).encode("utf-8")
+                self._respond(200 if healthy else 503, body, JSON_CONTENT_TYPE)
+            else:
+                self._respond(404, b"not found\n", "text/plain; charset=utf-8")
+        except Exception as exc:
+            logger.exception("Metrics request %s failed: %s", self.path, exc)
+            self._respond(500, b"internal error\n", "text/plain; charset=utf-8")
+        finally:
+            owner._slots.release()
+
+    def _respond(self, code: int, body: bytes, content_type: str) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
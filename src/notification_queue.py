@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import base64
+import collections
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import IO, Callable, Deque, Dict, List, Optional
+
+from src.alert_ledger import AlertTicket
+from src.notifier import DeliveryCallback, Notifier, send_via
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAME = ".lock"
+
+
+@dataclass(frozen=True)
+class Notification:
+    message: str
+    screenshot_path: Optional[str] = None
+    # In-memory encoded image; spooled as base64.
+    photo: Optional[bytes] = None
+    # Alerts for the same screening; passed on when the sender batches alerts.
+    group_key: Optional[str] = None
+    # Ledger entry settled by the delivery outcome, also after a replay.
+    ticket: Optional[AlertTicket] = None
+    # Failed deliveries so far; spooled so the cap holds across restarts.
+    attempts: int = 0
+    id: str = field(default_factory=lambda: f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}")
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class NotificationQueueConfig:
+    max_size: int = 100
+    workers: int = 1
+    # Producers block this long on a full queue before overflowing to the spool.
+    put_timeout_seconds: float = 5.0
+    # `close()` waits this long for queued alerts before leaving them in the spool.
+    flush_timeout_seconds: float = 30.0
+    spool_dir: Optional[Path] = None
+    # A spooled alert that failed this often is dropped instead of replayed again.
+    max_attempts: int = 3
+
+
+class NotificationQueue:
+    """Bounded outbound alert queue drained by background worker threads.
+
+    `submit` returns as soon as the alert is queued, so a slow Telegram API no
+    longer stalls the sweep. With a spool directory every accepted alert is
+    written to disk first and removed only once the sender reports it
+    delivered: alerts that overflow the in-memory queue wait there, and alerts
+    left over after a crash, a failed send or an unfinished `close()` are
+    replayed on the next start.
+
+    Each queue spools into its own subdirectory, held with an exclusive file
+    lock while the process lives, so several worker processes can share one
+    spool directory. On start a queue adopts the subdirectories whose lock is
+    free (their process has exited) and any files spooled at the top level;
+    files are claimed with an atomic rename, so each alert is replayed once.
+
+    A failed alert that carries a ledger ticket is dropped from the spool: the
+    ledger releases it and the scheduler sends a fresh one if it still applies.
+    Other failed alerts are replayed at most `max_attempts` times. Replayed
+    tickets go to `on_replay` on start, which returns their delivery callback
+    (the scheduler holds them in the ledger, so it does not send them twice).
+    """
+
+    def __init__(
+        self,
+        sender: Notifier,
+        config: Optional[NotificationQueueConfig] = None,
+        *,
+        on_replay: Optional[Callable[[AlertTicket], DeliveryCallback]] = None,
+    ):
+        self.sender = sender
+        self.config = config or NotificationQueueConfig()
+        self._queue: "queue.Queue[Optional[Notification]]" = queue.Queue(
+            maxsize=max(self.config.max_size, 1)
+        )
+        self._overflow: Deque[Path] = collections.deque()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._closed = False
+        self._workers: List[threading.Thread] = []
+        # Delivery callbacks by notification id; replayed alerts get theirs from `on_replay`.
+        self._callbacks: Dict[str, DeliveryCallback] = {}
+        self.sent = 0
+        self.overflowed = 0
+        self.spool_dir: Optional[Path] = None
+        self._lock_file: Optional[IO[str]] = None
+        if self.config.spool_dir:
+            self.spool_dir = self._open_spool(Path(self.config.spool_dir))
+            recovered = self._adopt_spools(self.spool_dir.parent)
+            if recovered:
+                logger.info("Replaying %d spooled notification(s).", len(recovered))
+            if on_replay is not None:
+                self._register_replays(recovered, on_replay)
+            self._overflow.extend(recovered)
+            self._pending = len(recovered)
+        for idx in range(max(self.config.workers, 1)):
+            worker = threading.Thread(
+                target=self._work, name=f"notification-worker-{idx}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def submit(
+        self,
+        message: str,
+        screenshot_path: Optional[str] = None,
+        *,
+        photo: Optional[bytes] = None,
+        group_key: Optional[str] = None,
+        on_result: Optional[DeliveryCallback] = None,
+        ticket: Optional[AlertTicket] = None,
+    ) -> None:
+        """Queue an alert; blocks only while the queue is full (backpressure).
+
+        `on_result` is called with the delivery outcome once a worker sent it;
+        `ticket` is spooled with the alert for `on_replay`.
+        """
+        notification = Notification(
+            message=message,
+            screenshot_path=screenshot_path,
+            photo=photo,
+            group_key=group_key,
+            ticket=ticket,
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Notification queue is closed")
+            self._pending += 1
+            if on_result is not None:
+                self._callbacks[notification.id] = on_result
+        spooled = self._spool(notification)
+        try:
+            self._queue.put(
+                notification,
+                timeout=self.config.put_timeout_seconds if spooled is not None else None,
+            )
+        except queue.Full:
+            assert spooled is not None
+            logger.warning("Notification queue full; alert %s kept in spool.", notification.id)
+            with self._lock:
+                self.overflowed += 1
+                self._overflow.append(spooled)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued alert was handed to the sender."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Stop accepting alerts, drain what is queued and stop the workers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if not self.flush(self.config.flush_timeout_seconds):
+            where = "spool" if self.spool_dir is not None else "memory and will be lost"
+            logger.warning("%d notification(s) still pending in %s.", self.pending, where)
+        for _worker in self._workers:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break  # Workers also stop once the closed queue runs empty.
+        for worker in self._workers:
+            worker.join(timeout=self.config.flush_timeout_seconds)
+        self._close_spool()
+
+    def _work(self) -> None:
+        while True:
+            notification = self._next()
+            if notification is None:
+                if self._closed and self._queue.empty():
+                    return
+                continue
+            try:
+                self._deliver(notification)
+            except Exception as exc:
+                # Left in the spool (if any) and retried on the next start.
+                logger.exception("Failed to deliver notification %s: %s", notification.id, exc)
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+
+    def _deliver(self, notification: Notification) -> None:
+        with self._lock:
+            callback = self._callbacks.pop(notification.id, None)
+
+        def on_result(delivered: bool) -> None:
+            # Batching senders report later, from their own thread.
+            if delivered:
+                self._unspool(notification)
+                with self._lock:
+                    self.sent += 1
+            else:
+                self._record_failure(notification)
+            if callback is not None:
+                callback(delivered)
+
+        send_via(
+            self.sender,
+            notification.message,
+            notification.screenshot_path,
+            photo=notification.photo,
+            group_key=notification.group_key,
+            on_result=on_result,
+        )
+
+    def _record_failure(self, notification: Notification) -> None:
+        if self.spool_dir is None:
+            return
+        attempts = notification.attempts + 1
+        if notification.ticket is None and attempts < self.config.max_attempts:
+            self._spool(replace(notification, attempts=attempts))
+            return
+        if notification.ticket is None:
+            logger.warning(
+                "Dropping notification %s after %d failed attempts.", notification.id, attempts
+            )
+        self._unspool(notification)
+
+    def _register_replays(
+        self, paths: List[Path], on_replay: Callable[[AlertTicket], DeliveryCallback]
+    ) -> None:
+        for path in paths:
+            try:
+                ticket = json.loads(path.read_text(encoding="utf-8")).get("ticket")
+                if ticket is not None:
+                    self._callbacks[path.stem] = on_replay(AlertTicket(**ticket))
+            except (OSError, ValueError, TypeError, AttributeError):
+                continue  # `_load` discards the file when its turn comes.
+
+    def _next(self) -> Optional[Notification]:
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            path = self._overflow.popleft() if self._overflow else None
+        if path is not None:
+            return self._load(path)
+        try:
+            return self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    def _open_spool(self, root: Path) -> Path:
+        """Create and lock this queue's spool directory under `root`."""
+        root.mkdir(parents=True, exist_ok=True)
+        name = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Locked under a hidden name first, so no other queue adopts it half-made.
+        staging = root / f".{name}"
+        staging.mkdir()
+        self._lock_file = open(staging / _LOCK_NAME, "w", encoding="utf-8")
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        own = root / name
+        os.replace(staging, own)
+        return own
+
+    def _adopt_spools(self, root: Path) -> List[Path]:
+        """Move spooled alerts of exited processes into this queue's spool."""
+        assert self.spool_dir is not None
+        adopted = [self._claim(path) for path in root.glob("*.json")]
+        # Without fcntl a live owner cannot be told apart from an exited one.
+        if fcntl is not None:
+            for directory in root.iterdir():
+                if directory.name.startswith(".") or directory == self.spool_dir:
+                    continue
+                if directory.is_dir():
+                    adopted.extend(self._adopt_dir(directory))
+        return sorted((path for path in adopted if path is not None), key=lambda p: p.name)
+
+    def _adopt_dir(self, directory: Path) -> List[Optional[Path]]:
+        try:
+            handle = open(directory / _LOCK_NAME, "a", encoding="utf-8")
+        except OSError:
+            return []
+        with handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return []  # Still owned by a running process.
+            claimed = [self._claim(path) for path in directory.glob("*.json")]
+            _remove_spool_dir(directory)
+        return claimed
+
+    def _claim(self, path: Path) -> Optional[Path]:
+        assert self.spool_dir is not None
+        target = self.spool_dir / path.name
+        try:
+            os.replace(path, target)
+        except FileNotFoundError:
+            return None  # Claimed by another queue first.
+        return target
+
+    def _close_spool(self) -> None:
+        if self._lock_file is None:
+            return
+        if self.spool_dir is not None and not any(self.spool_dir.glob("*.json")):
+            _remove_spool_dir(self.spool_dir)
+        # Releases the lock; a later queue adopts whatever is still spooled.
+        self._lock_file.close()
+        self._lock_file = None
+
+    def _spool_path(self, notification: Notification) -> Optional[Path]:
+        return self.spool_dir / f"{notification.id}.json" if self.spool_dir else None
+
+    def _spool(self, notification: Notification) -> Optional[Path]:
+        path = self._spool_path(notification)
+        if path is None:
+            return None
+        tmp_path = path.with_suffix(".tmp")
+        record = asdict(notification)
+        if notification.photo is not None:
+            record["photo"] = base64.b64encode(notification.photo).decode("ascii")
+        tmp_path.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def _unspool(self, notification: Notification) -> None:
+        path = self._spool_path(notification)
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def _load(self, path: Path) -> Optional[Notification]:
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+            if record.get("photo") is not None:
+                record["photo"] = base64.b64decode(record["photo"])
+            # The file name is what gets unspooled once the alert is delivered.
+            record["id"] = path.stem
+            if record.get("ticket") is not None:
+                record["ticket"] = AlertTicket(**record["ticket"])
+            return Notification(**record)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Discarding unreadable spooled notification %s: %s", path, exc)
+            path.unlink(missing_ok=True)
+            with self._idle:
+                self._pending -= 1
+                self._idle.notify_all()
+            return None
+
+
+def _remove_spool_dir(directory: Path) -> None:
+    for path in directory.glob("*.tmp"):
+        path.unlink(missing_ok=True)
+    (directory / _LOCK_NAME).unlink(missing_ok=True)
+    try:
+        directory.rmdir()
+    except OSError:
+        pass
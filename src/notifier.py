@@ -1,134 +1,507 @@
+from __future__ import annotations
+
 import asyncio
+import concurrent.futures
 import logging
-from typing import Any, Awaitable, Callable, Coroutine, Optional
-
-from telegram import Bot
+import threading
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
 
+from src import metrics
 from src.config import AppConfig
+from src.rate_limit import RateLimitedSender
+
+if TYPE_CHECKING:
+    from telegram import Bot
 
 logger = logging.getLogger(__name__)
 
 
 FallbackHandler = Callable[[str, Optional[str], Optional[str]], None]
+# Called once with True when an alert was delivered, False when it fell back.
+DeliveryCallback = Callable[[bool], None]
+
+T = TypeVar("T")
+
+# A photo attachment: a file path or already encoded image bytes.
+Photo = Union[str, bytes]
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+MEDIA_GROUP_LIMIT = 10
+
+
+@dataclass
+class AlertBatchConfig:
+    """Coalesce alerts sharing a group key (one screening) into one message + album."""
+
+    max_batch_size: int = MEDIA_GROUP_LIMIT
+    linger_seconds: float = 5.0
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> Optional["AlertBatchConfig"]:
+        if config.alert_batch_linger_seconds <= 0:
+            return None
+        return cls(
+            max_batch_size=config.alert_batch_max_size,
+            linger_seconds=config.alert_batch_linger_seconds,
+        )
+
+
+@dataclass
+class _PendingBatch:
+    messages: List[str] = field(default_factory=list)
+    photos: List[Photo] = field(default_factory=list)
+    callbacks: List[DeliveryCallback] = field(default_factory=list)
+
+
+def _split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Split on blank lines so each chunk fits into one Telegram message."""
+    chunks: List[str] = []
+    current = ""
+    for part in text.split("\n\n"):
+        candidate = f"{current}\n\n{part}" if current else part
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        while len(part) > limit:
+            chunks.append(part[:limit])
+            part = part[limit:]
+        current = part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _report(on_result: Optional[DeliveryCallback], delivered: bool) -> None:
+    if on_result is None:
+        return
+    try:
+        on_result(delivered)
+    except Exception as exc:
+        logger.exception("Delivery callback failed: %s", exc)
+
+
+def send_via(
+    sender: Any,
+    message: str,
+    screenshot_path: Optional[str] = None,
+    *,
+    photo: Optional[bytes] = None,
+    group_key: Optional[str] = None,
+    on_result: Optional[DeliveryCallback] = None,
+) -> None:
+    """Send an alert through `sender` and report the outcome to `on_result`.
+
+    Optional keywords are only passed when set, so plain notifiers keep working.
+    Senders with ``reports_delivery`` (like `Notifier`) call `on_result`
+    themselves, possibly later for batched alerts; for other senders an
+    alert counts as delivered when `send_alert_sync` returns without raising.
+    """
+    kwargs: Dict[str, Any] = {}
+    if photo is not None:
+        kwargs["photo"] = photo
+    if group_key is not None and getattr(sender, "batching", False):
+        kwargs["group_key"] = group_key
+    if getattr(sender, "reports_delivery", False):
+        sender.send_alert_sync(message, screenshot_path, on_result=on_result, **kwargs)
+        return
+    try:
+        sender.send_alert_sync(message, screenshot_path, **kwargs)
+    except Exception:
+        _report(on_result, False)
+        raise
+    _report(on_result, True)
+
+
+def _default_bot_factory(token: str) -> Bot:
+    # python-telegram-bot is only imported once an alert is actually sent.
+    from telegram import Bot
+
+    return Bot(token)
 
 
 class Notifier:
+    """Telegram notifier that keeps one bot and HTTP session alive between alerts.
+
+    The bot lives on a dedicated event-loop thread started on first use;
+    synchronous callers submit coroutines to it and wait for the result, so
+    connections are reused across alerts instead of being rebuilt per message.
+    Call `close()` on shutdown to release the session and stop the thread.
+
+    With a batch config, alerts sent with the same `group_key` are held for up
+    to `linger_seconds` (or until `max_batch_size` is reached, or
+    `flush_batches_sync()`) and then go out as one message plus one album.
+
+    Failed sends go to the fallback handler instead of raising; callers learn
+    the outcome from the return value or the `on_result` callback.
+    """
+
+    # `send_alert_sync` accepts `on_result` and reports failures (see `send_via`).
+    reports_delivery = True
+
     def __init__(
         self,
         config: AppConfig,
         *,
         fallback_handler: Optional[FallbackHandler] = None,
-        bot_factory: Callable[[str], Bot] = Bot,
+        bot_factory: Optional[Callable[[str], Bot]] = None,
         async_runner: Optional[Callable[[Callable[[], Awaitable[None]]], None]] = None,
+        send_timeout_seconds: float = 60.0,
+        batch_config: Optional[AlertBatchConfig] = None,
+        rate_limiter: Optional[RateLimitedSender] = None,
     ):
         self.config = config
         self.token: Optional[str] = config.telegram_bot_token
         self.chat_id: Optional[str] = config.telegram_chat_id
-        self._bot = None
-        self._bot_factory = bot_factory
+        self._bot: Optional[Bot] = None
+        self._bot_factory = bot_factory or _default_bot_factory
         self._fallback_handler = fallback_handler or self._default_fallback
         self._async_runner = async_runner or self._default_async_runner
+        self._send_timeout_seconds = send_timeout_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self.batch_config = batch_config or AlertBatchConfig.from_app_config(config)
+        self._batches: Dict[str, _PendingBatch] = {}
+        self._batch_lock = threading.Lock()
+        # Linger timers still sleeping; only touched on the background loop.
+        self._lingering: Set["asyncio.Task[Any]"] = set()
+        # All API calls go through the limiter (token buckets, 429 and retry handling).
+        self.rate_limiter = rate_limiter or RateLimitedSender()
 
     def is_configured(self) -> bool:
         return bool(self.token and self.chat_id)
 
-    async def send_alert(self, message: str, screenshot_path: Optional[str] = None) -> None:
-        """Sends a Telegram alert with optional screenshot, falling back if needed."""
+    @property
+    def batching(self) -> bool:
+        return self.batch_config is not None
+
+    async def send_alert(
+        self,
+        message: str,
+        screenshot_path: Optional[str] = None,
+        *,
+        photo: Optional[bytes] = None,
+    ) -> bool:
+        """Sends a Telegram alert with optional screenshot, falling back if needed.
+
+        `photo` takes an in-memory encoded image instead of a file path. Returns
+        whether the alert was delivered (``False`` when it went to the fallback).
+        """
+        attachment = photo if photo is not None else screenshot_path
+        if self._on_background_loop():
+            return await self._send_alert(message, attachment)
+        # The bot's HTTP session belongs to the background loop; hop over to it.
+        return await asyncio.wrap_future(self._submit(self._send_alert(message, attachment)))
+
+    async def _send_alert(self, message: str, photo: Optional[Photo]) -> bool:
+        screenshot_path = photo if isinstance(photo, str) else None
         if not self.is_configured():
             self._fallback_handler(message, screenshot_path, "missing_config")
-            return
+            return False
         token = self.token
         chat_id = self.chat_id
         if not token or not chat_id:
             self._fallback_handler(message, screenshot_path, "missing_config")
-            return
+            return False
 
-        bot = self._get_bot()
+        bot = await self._get_bot()
         if not bot:
             self._fallback_handler(message, screenshot_path, "bot_init_failed")
-            return
+            return False
 
         try:
-            await self._send_via_bot(bot, chat_id, message, screenshot_path)
+            with metrics.stage("notify"):
+                await self._send_via_bot(bot, chat_id, message, photo)
         except Exception as exc:
             logger.exception("Failed to send Telegram alert: %s", exc)
             self._fallback_handler(message, screenshot_path, str(exc))
+            return False
+        return True
+
+    async def _send_and_report(
+        self, message: str, photo: Optional[Photo], on_result: Optional[DeliveryCallback]
+    ) -> None:
+        delivered = False
+        try:
+            delivered = await self._send_alert(message, photo)
+        finally:
+            _report(on_result, delivered)
+
+    def send_alert_sync(
+        self,
+        message: str,
+        screenshot_path: Optional[str] = None,
+        *,
+        photo: Optional[bytes] = None,
+        group_key: Optional[str] = None,
+        on_result: Optional[DeliveryCallback] = None,
+    ) -> Optional[bool]:
+        """Wrapper for sync calls; alerts with a `group_key` are batched when enabled.
+
+        Returns whether the alert was delivered, or ``None`` when it is held for
+        a batch or sent in the background. `on_result` is called once with the
+        outcome in every case.
+        """
+        attachment: Optional[Photo] = photo if photo is not None else screenshot_path
+        if group_key is not None and self.batch_config is not None:
+            self._add_to_batch(group_key, message, attachment, on_result)
+            return None
 
-    def send_alert_sync(self, message: str, screenshot_path: Optional[str] = None) -> None:
-        """Wrapper for sync calls."""
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
             loop = None
 
         if loop and loop.is_running():
-            self._async_runner(lambda: self.send_alert(message, screenshot_path))
+            # Never block a running loop; the alert is sent in the background.
+            self._async_runner(lambda: self._send_and_report(message, attachment, on_result))
+            return None
+
+        if not self.is_configured():
+            self._fallback_handler(message, screenshot_path, "missing_config")
+            _report(on_result, False)
+            return False
+
+        delivered = self._wait(self._submit(self._send_alert(message, attachment)), message)
+        _report(on_result, delivered)
+        return delivered
+
+    def flush_batches_sync(self) -> None:
+        """Send every pending batch now instead of waiting for its linger time."""
+        with self._batch_lock:
+            batches = list(self._batches.values())
+            self._batches.clear()
+        for batch in batches:
+            self._send_batch_sync(batch)
+
+    def close(self) -> None:
+        """Shut down the bot's HTTP session and stop the background loop thread.
+
+        Sends still in flight get up to the send timeout to finish before they
+        are cancelled.
+        """
+        self.flush_batches_sync()
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
             return
+        try:
+            # Draining in-flight sends may take one send timeout, then the bot shuts down.
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(
+                timeout=2 * self._send_timeout_seconds
+            )
+        except Exception as exc:
+            logger.warning("Failed to shut down Telegram bot cleanly: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=self._send_timeout_seconds)
+        if not thread.is_alive():
+            loop.close()
 
-        asyncio.run(self._send_with_fresh_bot(message, screenshot_path))
+    def _wait(self, future: "concurrent.futures.Future[bool]", message: str) -> bool:
+        try:
+            return future.result(timeout=self._send_timeout_seconds)
+        except concurrent.futures.TimeoutError:
+            # Stop the send (and its retries) so it cannot arrive after the fallback.
+            future.cancel()
+            logger.error("Timed out sending Telegram alert")
+            self._fallback_handler(message, None, "timeout")
+            return False
 
-    def _default_async_runner(self, coro_factory: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    def _add_to_batch(
+        self,
+        group_key: str,
+        message: str,
+        photo: Optional[Photo],
+        on_result: Optional[DeliveryCallback] = None,
+    ) -> None:
+        assert self.batch_config is not None
+        limit = max(min(self.batch_config.max_batch_size, MEDIA_GROUP_LIMIT), 1)
+        with self._batch_lock:
+            batch = self._batches.get(group_key)
+            if batch is None:
+                batch = self._batches[group_key] = _PendingBatch()
+                self._submit(self._flush_after_linger(group_key, batch))
+            batch.messages.append(message)
+            if photo:
+                batch.photos.append(photo)
+            if on_result is not None:
+                batch.callbacks.append(on_result)
+            full = len(batch.messages) >= limit
+            if full:
+                del self._batches[group_key]
+        if full:
+            self._send_batch_sync(batch)
+
+    def _send_batch_sync(self, batch: _PendingBatch) -> None:
+        delivered = self._wait(self._submit(self._send_batch(batch)), "\n\n".join(batch.messages))
+        self._report_batch(batch, delivered)
+
+    @staticmethod
+    def _report_batch(batch: _PendingBatch, delivered: bool) -> None:
+        for on_result in batch.callbacks:
+            _report(on_result, delivered)
+
+    async def _flush_after_linger(self, group_key: str, batch: _PendingBatch) -> None:
+        assert self.batch_config is not None
+        task = asyncio.current_task()
+        assert task is not None
+        self._lingering.add(task)
         try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
+            await asyncio.sleep(self.batch_config.linger_seconds)
+        finally:
+            self._lingering.discard(task)
+        with self._batch_lock:
+            if self._batches.get(group_key) is not batch:
+                return
+            del self._batches[group_key]
+        delivered = False
+        try:
+            delivered = await self._send_batch(batch)
+        finally:
+            self._report_batch(batch, delivered)
 
-        if loop and loop.is_running():
-            task: asyncio.Task[None] = loop.create_task(coro_factory())
+    async def _send_batch(self, batch: _PendingBatch) -> bool:
+        message = "\n\n".join(batch.messages)
+        if not self.is_configured() or not self.chat_id:
+            self._fallback_handler(message, None, "missing_config")
+            return False
+        bot = await self._get_bot()
+        if not bot:
+            self._fallback_handler(message, None, "bot_init_failed")
+            return False
+        try:
+            logger.info("Sending batched Telegram alert (%d item(s))", len(batch.messages))
+            with metrics.stage("notify"):
+                for chunk in _split_message(message):
+                    await self._send_text(bot, self.chat_id, chunk)
+                await self._send_preview(bot, self.chat_id, batch.photos)
+        except Exception as exc:
+            logger.exception("Failed to send batched Telegram alert: %s", exc)
+            self._fallback_handler(message, None, str(exc))
+            return False
+        return True
 
-            async def _consume() -> None:
-                try:
-                    await task
-                except Exception:
-                    logger.exception("Async notifier task failed")
+    async def _send_text(self, bot: Bot, chat_id: str, text: str) -> None:
+        await self.rate_limiter.call(chat_id, lambda: bot.send_message(chat_id=chat_id, text=text))
+
+    async def _send_photos(self, bot: Bot, chat_id: str, photos: List[Photo]) -> None:
+        from telegram import InputMediaPhoto
+
+        for start in range(0, len(photos), MEDIA_GROUP_LIMIT):
+            group = photos[start : start + MEDIA_GROUP_LIMIT]
+
+            # Files are reopened on every attempt because a failed upload consumes them.
+            async def _upload(group: List[Photo] = group) -> None:
+                with ExitStack() as stack:
+                    files = [
+                        item if isinstance(item, bytes) else stack.enter_context(open(item, "rb"))
+                        for item in group
+                    ]
+                    if len(files) == 1:
+                        await bot.send_photo(chat_id=chat_id, photo=files[0])
+                    else:
+                        await bot.send_media_group(
+                            chat_id=chat_id,
+                            media=[InputMediaPhoto(media=file) for file in files],
+                        )
+
+            await self.rate_limiter.call(chat_id, _upload)
+
+    def _default_async_runner(self, coro_factory: Callable[[], Coroutine[Any, Any, None]]) -> None:
+        future = self._submit(coro_factory())
 
-            loop.create_task(_consume())
-        else:
-            asyncio.run(coro_factory())
+        def _consume(done: "concurrent.futures.Future[None]") -> None:
+            if not done.cancelled() and done.exception() is not None:
+                logger.error("Async notifier task failed", exc_info=done.exception())
 
-    def _get_bot(self):
+        future.add_done_callback(_consume)
+
+    def _submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="telegram-notifier", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _on_background_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def _get_bot(self) -> Optional[Bot]:
         if not self.is_configured():
             return None
         if not self._bot:
             try:
                 if not self.token:
                     return None
-                self._bot = self._bot_factory(self.token)
+                bot = self._bot_factory(self.token)
+                if hasattr(bot, "initialize"):
+                    await bot.initialize()
+                self._bot = bot
             except Exception as exc:
                 logger.exception("Unable to initialise Telegram bot: %s", exc)
                 return None
         return self._bot
 
-    async def _send_with_fresh_bot(self, message: str, screenshot_path: Optional[str]) -> None:
-        if not self.is_configured():
-            self._fallback_handler(message, screenshot_path, "missing_config")
-            return
-        if not self.token or not self.chat_id:
-            self._fallback_handler(message, screenshot_path, "missing_config")
-            return
-
-        try:
-            bot = self._bot_factory(self.token)
-        except Exception as exc:
-            logger.exception("Unable to initialise Telegram bot: %s", exc)
-            self._fallback_handler(message, screenshot_path, "bot_init_failed")
-            return
-
-        try:
-            await self._send_via_bot(bot, self.chat_id, message, screenshot_path)
-        except Exception as exc:
-            logger.exception("Failed to send Telegram alert: %s", exc)
-            self._fallback_handler(message, screenshot_path, str(exc))
+    async def _shutdown(self) -> None:
+        # Let in-flight sends finish (bounded), then cancel them and the linger
+        # timers so the loop can stop cleanly. Pending batches were flushed by `close`.
+        current = asyncio.current_task()
+        others = [task for task in asyncio.all_tasks() if task is not current]
+        in_flight = [task for task in others if task not in self._lingering]
+        if in_flight:
+            _done, still_running = await asyncio.wait(in_flight, timeout=self._send_timeout_seconds)
+            if still_running:
+                logger.warning("Cancelling %d unfinished Telegram send(s).", len(still_running))
+        for task in others:
+            task.cancel()
+        await asyncio.gather(*others, return_exceptions=True)
+        bot, self._bot = self._bot, None
+        if bot is not None and hasattr(bot, "shutdown"):
+            await bot.shutdown()
 
     async def _send_via_bot(
-        self, bot: Bot, chat_id: str, message: str, screenshot_path: Optional[str]
+        self, bot: Bot, chat_id: str, message: str, photo: Optional[Photo]
     ) -> None:
         logger.info("Sending Telegram alert")
-        await bot.send_message(chat_id=chat_id, text=message)
+        await self._send_text(bot, chat_id, message)
 
-        if screenshot_path:
-            with open(screenshot_path, "rb") as photo:
-                await bot.send_photo(chat_id=chat_id, photo=photo)
+        if photo:
+            await self._send_preview(bot, chat_id, [photo])
+
+    async def _send_preview(self, bot: Bot, chat_id: str, photos: List[Photo]) -> None:
+        # The alert text is already out: a failed preview (after the rate limiter's
+        # retries) still counts as delivered, so the text is never sent twice.
+        try:
+            await self._send_photos(bot, chat_id, photos)
+        except Exception as exc:
+            logger.warning("Alert text sent but its seat map preview failed: %s", exc)
 
     def _default_fallback(
         self, message: str, screenshot_path: Optional[str], reason: Optional[str]
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+
+from src.advisor import SeatRecommendation
+from src.state_store import SeatSnapshot, StateStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdaptivePollingConfig:
+    """Bounds and weights for per-screening polling intervals."""
+
+    min_interval_seconds: float = 60.0
+    max_interval_seconds: float = 3600.0
+    # Shows closer than `imminent_hours` poll at the minimum interval, shows further
+    # away than `distant_hours` at the maximum; in between the interval grows
+    # geometrically.
+    imminent_hours: float = 6.0
+    distant_hours: float = 7 * 24.0
+    # Interval is divided by (1 + change_weight * changed seats per hour).
+    change_weight: float = 0.5
+    # EWMA smoothing applied to the observed change rate.
+    change_smoothing: float = 0.5
+    # Multiplier applied while a qualifying block exists.
+    block_factor: float = 0.5
+
+
+@dataclass
+class ScreeningPollState:
+    show_at: datetime
+    last_checked: float
+    next_check: float
+    status_vector: str
+    change_rate: float = 0.0
+    has_block: bool = False
+
+
+class AdaptivePollingPolicy:
+    """Assign each screening its own next-check time.
+
+    The interval shrinks as showtime approaches, as seats change between polls
+    and while a qualifying block exists, always staying within the configured
+    min/max bounds. Unknown screenings are always due. With a `StateStore`, the
+    state is persisted as seat snapshots so cron runs start warm.
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdaptivePollingConfig] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+        store: Optional[StateStore] = None,
+    ):
+        self.config = config or AdaptivePollingConfig()
+        self._clock = clock
+        self._store = store
+        self._states: Dict[str, ScreeningPollState] = {}
+
+    def is_due(self, key: str) -> bool:
+        state = self.state_for(key)
+        return state is None or self._clock() >= state.next_check
+
+    def observe(self, key: str, recommendation: SeatRecommendation, *, has_block: bool) -> float:
+        """Record a fresh seat map for `key` and return the interval until the next check."""
+        now = self._clock()
+        show_at = datetime.combine(
+            recommendation.screening_date, recommendation.screening.show_time
+        )
+        status_vector = recommendation.seat_map.status_vector()
+
+        state = self.state_for(key)
+        change_rate = 0.0
+        if state is not None:
+            elapsed_hours = max(now - state.last_checked, 1.0) / 3600.0
+            changed = _count_changes(state.status_vector, status_vector)
+            alpha = self.config.change_smoothing
+            change_rate = alpha * (changed / elapsed_hours) + (1 - alpha) * state.change_rate
+
+        interval = self.interval_for(show_at, change_rate=change_rate, has_block=has_block, now=now)
+        self._states[key] = ScreeningPollState(
+            show_at=show_at,
+            last_checked=now,
+            next_check=now + interval,
+            status_vector=status_vector,
+            change_rate=change_rate,
+            has_block=has_block,
+        )
+        if self._store is not None:
+            self._store.save_snapshot(
+                SeatSnapshot(
+                    key=key,
+                    layout_fingerprint=recommendation.seat_map.layout_fingerprint(),
+                    status_vector=status_vector,
+                    captured_at=now,
+                    show_at=show_at.timestamp(),
+                    next_check=now + interval,
+                    change_rate=change_rate,
+                    has_block=has_block,
+                )
+            )
+        logger.debug(
+            "Next check for %s in %.0fs (change rate %.2f/h, block=%s)",
+            key,
+            interval,
+            change_rate,
+            has_block,
+        )
+        return interval
+
+    def interval_for(
+        self,
+        show_at: datetime,
+        *,
+        change_rate: float = 0.0,
+        has_block: bool = False,
+        now: Optional[float] = None,
+    ) -> float:
+        config = self.config
+        low = max(config.min_interval_seconds, 1.0)
+        high = max(config.max_interval_seconds, low)
+        now = self._clock() if now is None else now
+
+        hours_until = (show_at.timestamp() - now) / 3600.0
+        if hours_until <= 0:
+            return high
+        span = max(config.distant_hours - config.imminent_hours, 1e-6)
+        position = min(max((hours_until - config.imminent_hours) / span, 0.0), 1.0)
+        interval = low * math.pow(high / low, position)
+
+        interval /= 1.0 + max(config.change_weight, 0.0) * max(change_rate, 0.0)
+        if has_block:
+            interval *= config.block_factor
+        return min(max(interval, low), high)
+
+    def seconds_until_next_due(self) -> Optional[float]:
+        """Seconds until the earliest tracked screening is due, or ``None`` if none are."""
+        if not self._states:
+            return None
+        earliest = min(state.next_check for state in self._states.values())
+        return max(earliest - self._clock(), 0.0)
+
+    def prune(self, before: Optional[date] = None) -> None:
+        """Forget screenings that have already started (or ended before `before`)."""
+        now = datetime.fromtimestamp(self._clock())
+        for key in [
+            key
+            for key, state in self._states.items()
+            if state.show_at <= now or (before is not None and state.show_at.date() < before)
+        ]:
+            del self._states[key]
+
+    def state_for(self, key: str) -> Optional[ScreeningPollState]:
+        state = self._states.get(key)
+        if state is None and self._store is not None:
+            snapshot = self._store.load_snapshot(key)
+            if snapshot is not None:
+                state = ScreeningPollState(
+                    show_at=datetime.fromtimestamp(snapshot.show_at),
+                    last_checked=snapshot.captured_at,
+                    next_check=snapshot.next_check,
+                    status_vector=snapshot.status_vector,
+                    change_rate=snapshot.change_rate,
+                    has_block=snapshot.has_block,
+                )
+                self._states[key] = state
+        return state
+
+
+def _count_changes(previous: str, current: str) -> int:
+    if len(previous) != len(current):
+        # Layout changed; treat every seat as changed.
+        return max(len(previous), len(current))
+    return sum(1 for old, new in zip(previous, current, strict=True) if old != new)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from telegram.error import RetryAfter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Sleep = Callable[[float], Awaitable[None]]
+
+
+@dataclass
+class RateLimitConfig:
+    # Telegram allows roughly 30 messages/second overall and 1/second per chat
+    # (short bursts are tolerated).
+    global_rate_per_second: float = 30.0
+    global_burst: int = 30
+    per_chat_rate_per_second: float = 1.0
+    per_chat_burst: int = 3
+    max_attempts: int = 4
+    backoff_base_seconds: float = 1.0
+    backoff_max_seconds: float = 30.0
+    # Extra wait added on top of `retry_after`, so the retry lands after the window.
+    retry_after_margin_seconds: float = 0.5
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens/second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int, *, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * max(self.rate, 0.0)
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            wait = 0.0 if self._tokens >= 0 or self.rate <= 0 else -self._tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every caller for `seconds` (used when Telegram answers 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+
+@dataclass
+class SenderStats:
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.latency_total / self.sent if self.sent else 0.0
+
+    @property
+    def average_queue_wait(self) -> float:
+        attempts = self.sent + self.failed
+        return self.queue_wait_total / attempts if attempts else 0.0
+
+
+def _retry_after_seconds(exc: RetryAfter) -> float:
+    # python-telegram-bot >= 22.2 warns that the int form will become a timedelta.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        value = exc.retry_after
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+class RateLimitedSender:
+    """Runs Telegram API calls under global and per-chat token buckets.
+
+    A 429 (`RetryAfter`) blocks the chat's bucket for the requested time and the
+    call is retried; timeouts and network errors are retried with jittered
+    exponential backoff. `BadRequest` and other API errors are not retried.
+    `stats` records queue wait (time spent waiting for tokens) and send latency.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RateLimitConfig] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.config = config or RateLimitConfig()
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._global = TokenBucket(
+            self.config.global_rate_per_second, self.config.global_burst, clock=clock
+        )
+        self._chats: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.stats = SenderStats()
+
+    async def call(self, chat_id: str, request: Callable[[], Awaitable[T]]) -> T:
+        """Await `request()` once tokens are available, retrying transient failures.
+
+        `request` is invoked again on every attempt, so it must open any files itself.
+        """
+        from telegram.error import BadRequest, NetworkError, RetryAfter
+
+        chat_bucket = self._chat_bucket(chat_id)
+        attempt = 0
+        while True:
+            attempt += 1
+            queued_at = self._clock()
+            wait = max(self._global.reserve(), chat_bucket.reserve())
+            if wait > 0:
+                await self._sleep(wait)
+            self._record_wait(self._clock() - queued_at)
+            started = self._clock()
+            try:
+                result = await request()
+            except RetryAfter as exc:
+                delay = _retry_after_seconds(exc) + self.config.retry_after_margin_seconds
+                chat_bucket.block_for(delay)
+                self.stats.rate_limited += 1
+                logger.warning("Telegram rate limit hit; retrying in %.1fs", delay)
+                error: Exception = exc
+            except BadRequest:
+                # A `NetworkError` subclass, but repeating the request cannot help.
+                self.stats.failed += 1
+                raise
+            except NetworkError as exc:
+                delay = self._backoff(attempt)
+                logger.warning("Telegram request failed (%s); retrying in %.1fs", exc, delay)
+                error = exc
+            except Exception:
+                # `Forbidden` and other API errors are not retried either.
+                self.stats.failed += 1
+                raise
+            else:
+                self._record_latency(self._clock() - started)
+                return result
+
+            if attempt >= self.config.max_attempts:
+                self.stats.failed += 1
+                raise error
+            self.stats.retries += 1
+            if not isinstance(error, RetryAfter):
+                # Rate-limit waits are enforced by the bucket on the next attempt.
+                await self._sleep(delay)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._chats.get(chat_id)
+            if bucket is None:
+                bucket = self._chats[chat_id] = TokenBucket(
+                    self.config.per_chat_rate_per_second,
+                    self.config.per_chat_burst,
+                    clock=self._clock,
+                )
+            return bucket
+
+    def _backoff(self, attempt: int) -> float:
+        base = self.config.backoff_base_seconds * (1 << (attempt - 1))
+        capped = min(base, self.config.backoff_max_seconds)
+        # Equal jitter: spread retries over [capped / 2, capped].
+        return capped / 2 + capped / 2 * self._jitter()
+
+    def _record_wait(self, seconds: float) -> None:
+        self.stats.queue_wait_total += seconds
+        self.stats.queue_wait_max = max(self.stats.queue_wait_max, seconds)
+
+    def _record_latency(self, seconds: float) -> None:
+        self.stats.sent += 1
+        self.stats.latency_total += seconds
+        self.stats.latency_max = max(self.stats.latency_max, seconds)
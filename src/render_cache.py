@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from src.seat_map import SeatMap
+from src.seat_selection import SeatBlockSuggestion
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    total_bytes: int
+
+
+@dataclass
+class _Entry:
+    path: Path
+    size: int
+    last_used: float
+
+
+class RenderCache:
+    """Content-addressed directory of rendered previews with size/age limits.
+
+    A render is identified by the hash of the hall layout, the seat statuses,
+    the highlighted seats and the encoding variant, so an identical preview is
+    reused instead of rendered again. Entries unused for `max_age_seconds` are
+    dropped and the least recently used ones are evicted once the directory
+    exceeds `max_entries` or `max_bytes`. Last use is kept in the file mtime, so
+    the LRU order survives restarts.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 1000,
+        max_age_seconds: float = 7 * 24 * 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_existing()
+
+    @staticmethod
+    def key_for(
+        seat_map: SeatMap,
+        suggestions: Sequence[SeatBlockSuggestion],
+        variant: str = "png",
+    ) -> str:
+        highlights = sorted(
+            (suggestion.row_number, number)
+            for suggestion in suggestions
+            for number in suggestion.seat_numbers
+        )
+        digest = hashlib.sha1()
+        digest.update(seat_map.layout_fingerprint().encode())
+        digest.update(seat_map.status_vector().encode())
+        digest.update(repr(highlights).encode())
+        digest.update(variant.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:
+            self._forget(key)
+            return None
+
+    def get_path(self, key: str) -> Optional[Path]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry.last_used > self.max_age_seconds:
+                self.misses += 1
+                return None
+            entry.last_used = now
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(entry.path, (now, now))
+        except OSError:
+            self._forget(key)
+            return None
+        return entry.path
+
+    def put(self, key: str, data: bytes, *, suffix: str = ".png") -> Path:
+        path = self.directory / f"{key}{suffix}"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        now = self._clock()
+        os.utime(path, (now, now))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+            self._entries[key] = _Entry(path=path, size=len(data), last_used=now)
+            self._total_bytes += len(data)
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until within limits."""
+        now = self._clock()
+        doomed = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if now - entry.last_used > self.max_age_seconds:
+                    doomed.append(self._pop(key))
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                doomed.append(self._pop(oldest))
+            self.evictions += len(doomed)
+        for entry in doomed:
+            entry.path.unlink(missing_ok=True)
+        if doomed:
+            logger.debug("Evicted %d render(s) from %s", len(doomed), self.directory)
+        return len(doomed)
+
+    def stats(self) -> RenderCacheStats:
+        with self._lock:
+            return RenderCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                total_bytes=self._total_bytes,
+            )
+
+    def _pop(self, key: str) -> _Entry:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        return entry
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+    def _load_existing(self) -> None:
+        found = []
+        for path in self.directory.iterdir():
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.stem, _Entry(path, stat.st_size, stat.st_mtime)))
+        for _mtime, key, entry in sorted(found, key=lambda item: item[0]):
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+        self.evict()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.seatmap_renderer import SeatMapRenderer
+
+logger = logging.getLogger(__name__)
+
+_STATUS_BY_CODE: Dict[str, SeatStatus] = {
+    "a": SeatStatus.AVAILABLE,
+    "o": SeatStatus.OCCUPIED,
+    "w": SeatStatus.WHEELCHAIR,
+    "u": SeatStatus.UNKNOWN,
+}
+
+
+@dataclass(frozen=True)
+class RenderPayload:
+    """Everything the renderer needs, as flat tuples that pickle cheaply.
+
+    `layout` holds `(row_number, seat_number, grid_x, grid_row)` per seat,
+    `statuses` is `SeatMap.status_vector()` for the same seat order, and
+    `highlights` lists `(row_number, seat_numbers)` per suggestion. Labels and
+    seat metadata are dropped; the renderer does not draw them.
+    """
+
+    layout: Tuple[Tuple[int, int, int, int], ...]
+    statuses: str
+    highlights: Tuple[Tuple[int, Tuple[int, ...]], ...]
+
+    @classmethod
+    def from_seat_map(
+        cls, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion]
+    ) -> "RenderPayload":
+        return cls(
+            layout=tuple(
+                (seat.row_number, seat.seat_number, seat.grid_x, seat.grid_row)
+                for seat in seat_map.seats
+            ),
+            statuses=seat_map.status_vector(),
+            highlights=tuple(
+                (suggestion.row_number, tuple(suggestion.seat_numbers))
+                for suggestion in suggestions
+            ),
+        )
+
+    def seat_map(self) -> SeatMap:
+        return SeatMap.from_seats(
+            Seat(
+                row_number=row_number,
+                seat_number=seat_number,
+                label=str(seat_number),
+                status=_STATUS_BY_CODE[code],
+                grid_x=grid_x,
+                grid_row=grid_row,
+            )
+            for (row_number, seat_number, grid_x, grid_row), code in zip(
+                self.layout, self.statuses, strict=True
+            )
+        )
+
+    def suggestions(self) -> List[SeatBlockSuggestion]:
+        return [
+            SeatBlockSuggestion(
+                row_number=row_number,
+                seat_numbers=list(seat_numbers),
+                labels=[str(number) for number in seat_numbers],
+                grid_positions=[],
+                score=0.0,
+            )
+            for row_number, seat_numbers in self.highlights
+        ]
+
+
+def _renderer_options(renderer: SeatMapRenderer) -> Dict[str, Any]:
+    return {
+        "output_dir": renderer.output_dir.parent,
+        "seat_size": renderer.seat_size,
+        "seat_gap": renderer.seat_gap,
+        "margin": renderer.margin,
+        # The parent archives what workers return (see `RenderExecutor.submit`).
+        "archive": False,
+        "base_cache_size": renderer.base_cache_size,
+        "encoding": renderer.encoding,
+        "painter": renderer.painter,
+    }
+
+
+# One renderer per worker process, so its base-layer cache is reused across jobs.
+_worker_renderer: Optional[SeatMapRenderer] = None
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    global _worker_renderer
+    _worker_renderer = SeatMapRenderer(**options)
+
+
+def _render_in_worker(payload: RenderPayload) -> bytes:
+    if _worker_renderer is None:
+        raise RuntimeError("Render worker was not initialised")
+    return _worker_renderer.render_composite_bytes(payload.seat_map(), payload.suggestions())
+
+
+class RenderExecutor:
+    """Renders seat-map previews off the calling thread and returns futures.
+
+    `kind="process"` (default) renders in a spawned process pool, so drawing and
+    encoding do not hold the scheduler's GIL; each worker builds its own
+    renderer from the settings of `renderer`. `kind="thread"` shares `renderer`
+    across a thread pool, which is cheaper to start and enough when Pillow
+    releases the GIL during encoding. Jobs cross the pool as `RenderPayload`s.
+    """
+
+    KINDS = ("process", "thread")
+
+    def __init__(
+        self,
+        renderer: Optional[SeatMapRenderer] = None,
+        *,
+        kind: str = "process",
+        max_workers: Optional[int] = None,
+    ):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown render executor kind: {kind} (expected one of {self.KINDS})")
+        self.renderer = renderer or SeatMapRenderer()
+        self.kind = kind
+        self._pool: Executor
+        if kind == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(_renderer_options(self.renderer),),
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="seatmap-render"
+            )
+
+    def submit(
+        self, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion]
+    ) -> "Future[bytes]":
+        """Queue one preview highlighting `suggestions`; the future yields encoded bytes."""
+        payload = RenderPayload.from_seat_map(seat_map, suggestions)
+        if self.kind == "thread":
+            return self._pool.submit(self._render_in_thread, payload)
+        # Worker processes have no cache; the parent's is checked and filled here.
+        data = self.renderer.cached_bytes(seat_map, suggestions)
+        if data is not None:
+            done: "Future[bytes]" = Future()
+            done.set_result(data)
+            return done
+        future = self._pool.submit(_render_in_worker, payload)
+
+        def _store(rendered: "Future[bytes]") -> None:
+            if rendered.cancelled() or rendered.exception() is not None:
+                return
+            try:
+                self.renderer.store_bytes(seat_map, suggestions, rendered.result())
+            except OSError as exc:
+                logger.warning("Failed to cache rendered preview: %s", exc)
+
+        future.add_done_callback(_store)
+        return future
+
+    def _render_in_thread(self, payload: RenderPayload) -> bytes:
+        return self.renderer.render_composite_bytes(payload.seat_map(), payload.suggestions())
+
+    def close(self, *, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> "RenderExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,22 +1,34 @@
 from __future__ import annotations
 
+import collections
 import logging
 import time
-from dataclasses import dataclass
-from datetime import date
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date, datetime
+from datetime import time as time_of_day
 from pathlib import Path
-from threading import Event
-from typing import Callable, Iterable, List, Optional
+from threading import Event, Lock
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 
+from src import metrics
 from src.advisor import SeatAdvisor, SeatRecommendation
+from src.alert_ledger import AlertLedger, AlertLedgerConfig, AlertTicket, RealertMode
 from src.config import AppConfig
 from src.date_sweep import DateSweepConfig, iter_available_dates
-from src.notifier import Notifier
+from src.job_queue import LeasedJob, LeaseJobQueue
+from src.notification_queue import NotificationQueue, NotificationQueueConfig
+from src.notifier import DeliveryCallback, Notifier, send_via
+from src.polling import AdaptivePollingConfig, AdaptivePollingPolicy
+from src.render_cache import RenderCache
+from src.render_executor import RenderExecutor
 from src.screenings import ScreeningDescriptor
 from src.seat_map import SeatMap
 from src.seat_selection import SeatBlockSuggestion
 from src.seatmap_fetcher import normalize_order_url
-from src.seatmap_renderer import SeatMapRenderer
+from src.seatmap_renderer import RenderEncoding, SeatMapRenderer
+from src.state_store import StateStore
+from src.watchlist import Watchlist, WatchlistError, WatchTarget
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +45,50 @@ class SchedulerConfig:
     min_score: Optional[float] = 0.8
     avoid_aisle: bool = True
     aisle_boundary: int = 3
+    adaptive_polling: bool = False
+    min_poll_interval_seconds: int = 60
+    max_poll_interval_seconds: int = 3600
+    realert_mode: str = "cooldown"
+    realert_cooldown_seconds: int = 6 * 3600
+    realert_min_improvement: float = 0.01
+    discovery_interval_seconds: int = 1800
+    # Screenings, snapshots and sent alerts untouched this long are dropped from the
+    # state store (never sooner than the re-alert cooldown).
+    state_retention_seconds: int = 14 * 24 * 3600
+    # 0 sends alerts synchronously; otherwise alerts go through a background queue.
+    notification_queue_size: int = 0
+    notification_spool_dir: Optional[str] = None
+    # 0 renders previews inline; otherwise a pool of this many workers renders them.
+    render_workers: int = 0
+    render_executor: str = "process"
+    # Snapshot written after every `run_once` when metrics are enabled (.prom or JSON).
+    metrics_file: Optional[str] = None
+
+    # Fields that size long-lived resources; `MonitorScheduler.reconfigure` keeps them.
+    RESTART_FIELDS = frozenset(
+        {
+            "adaptive_polling",
+            "notification_queue_size",
+            "notification_spool_dir",
+            "render_workers",
+            "render_executor",
+        }
+    )
+
+    def with_overrides(self, settings: Dict[str, Any]) -> "SchedulerConfig":
+        """Copy with `settings` (e.g. a watchlist file's ``scheduler`` table) applied.
+
+        Values are converted to the field's type (``"60"`` for an int field, ``"yes"``
+        for a flag); unknown names and unconvertible values raise `WatchlistError`.
+        """
+        types = {item.name: str(item.type) for item in fields(self)}
+        unknown = sorted(set(settings) - types.keys())
+        if unknown:
+            raise WatchlistError(f"Unknown scheduler settings: {', '.join(unknown)}")
+        return replace(
+            self,
+            **{name: _coerce_setting(name, types[name], value) for name, value in settings.items()},
+        )
 
     @classmethod
     def from_app_config(cls, config: AppConfig) -> "SchedulerConfig":
@@ -40,13 +96,96 @@ class SchedulerConfig:
             min_score=config.min_score,
             avoid_aisle=config.avoid_aisle,
             aisle_boundary=config.aisle_distance,
+            realert_mode=config.realert_mode,
+            realert_cooldown_seconds=config.realert_cooldown_seconds,
+            notification_queue_size=config.notification_queue_size,
+            notification_spool_dir=config.notification_spool_dir,
+            render_workers=config.render_workers,
+            render_executor=config.render_executor,
+            metrics_file=config.metrics_file,
         )
 
 
+_BOOL_WORDS = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "on": True,
+    "0": False,
+    "false": False,
+    "no": False,
+    "off": False,
+}
+
+
+def _coerce_setting(name: str, annotation: str, value: Any) -> Any:
+    """Convert a `SchedulerConfig` setting to its (string) field annotation."""
+    if annotation.startswith("Optional["):
+        if value is None:
+            return None
+        annotation = annotation[len("Optional[") : -1]
+    try:
+        if annotation == "bool":
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, str) and value.strip().lower() in _BOOL_WORDS:
+                return _BOOL_WORDS[value.strip().lower()]
+        elif annotation == "int" and not isinstance(value, bool):
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError(value)
+            if isinstance(value, (int, float, str)):
+                return int(value)
+        elif annotation == "float" and not isinstance(value, bool):
+            if isinstance(value, (int, float, str)):
+                return float(value)
+        elif annotation == "str" and isinstance(value, str):
+            return value
+    except ValueError:
+        pass
+    raise WatchlistError(f"Invalid scheduler setting {name}={value!r}: expected {annotation}")
+
+
+@dataclass
+class _LedgerCallback:
+    """Settles an alert in the ledger once the notifier reports the outcome."""
+
+    ledger: AlertLedger
+    ticket: AlertTicket
+    # Without Telegram credentials the fallback log line is the alert, so it counts
+    # as sent instead of being rendered and logged again every cycle.
+    log_only: bool = False
+
+    def __call__(self, delivered: bool) -> None:
+        delivered = delivered or self.log_only
+        if not delivered:
+            logger.warning(
+                "Alert for %s was not delivered; it will be retried.", self.ticket.screening_key
+            )
+        self.ledger.settle(self.ticket, delivered=delivered)
+
+
+@dataclass
+class _PendingAlert:
+    """An alert whose preview is still being rendered by the render executor."""
+
+    render: "Future[bytes]"
+    recommendation: SeatRecommendation
+    suggestion: SeatBlockSuggestion
+    config: AppConfig
+    group_key: Optional[str]
+    on_result: Optional[DeliveryCallback] = None
+
+
 class MonitorScheduler:
-    """Runs SeatAdvisor periodically with retry/backoff and notification dispatch."""
+    """Runs SeatAdvisor periodically with retry/backoff and notification dispatch.
+
+    Every target of the watchlist is processed by the same advisor, notifier and
+    renderer, so one scheduler replaces one process per movie.
+    """
 
     _LATEST_DATE_FILENAME = "latest_screening_date.txt"
+    _STATE_FILENAME = "state.sqlite3"
+    _STATE_PRUNE_INTERVAL_SECONDS = 3600.0
 
     def __init__(
         self,
@@ -60,51 +199,348 @@ class MonitorScheduler:
         sleep_fn: Callable[[float], None] = time.sleep,
         stop_event: Optional[Event] = None,
         latest_date_path: Optional[Path] = None,
+        watchlist: Optional[Watchlist] = None,
+        polling_policy: Optional[AdaptivePollingPolicy] = None,
+        state_store: Optional[StateStore] = None,
+        alert_ledger: Optional[AlertLedger] = None,
+        notification_queue: Optional[NotificationQueue] = None,
+        render_executor: Optional[RenderExecutor] = None,
     ):
         self.app_config = app_config
+        self.watchlist = watchlist or Watchlist.from_app_config(app_config)
         self.advisor = advisor or SeatAdvisor()
         self.notifier = notifier or Notifier(app_config)
         self.scheduler_config = scheduler_config or SchedulerConfig.from_app_config(app_config)
         self.date_iterator = date_iterator
-        self.renderer = renderer or SeatMapRenderer()
+        # The legacy text file is only read to migrate it into the state store.
+        self._latest_date_path = latest_date_path or self._default_latest_date_path()
+        state_dir = self._latest_date_path.parent
+        # Previews stay in memory; with RENDER_ARCHIVE they are also kept on disk
+        # next to the state store.
+        self.renderer = renderer or SeatMapRenderer(
+            output_dir=state_dir,
+            cache=RenderCache(state_dir / "renders") if app_config.render_archive else None,
+            archive=app_config.render_archive,
+            encoding=RenderEncoding.preset(
+                app_config.render_encoding, max_dimension=app_config.render_max_dimension or None
+            ),
+        )
+        self.render_executor = render_executor
+        if (
+            self.render_executor is None
+            and self.scheduler_config.render_workers > 0
+            and isinstance(self.renderer, SeatMapRenderer)
+        ):
+            self.render_executor = RenderExecutor(
+                self.renderer,
+                kind=self.scheduler_config.render_executor,
+                max_workers=self.scheduler_config.render_workers,
+            )
+        self._pending_alerts: Deque[_PendingAlert] = collections.deque()
+        self._pending_lock = Lock()
         self.sleep_fn = sleep_fn
         self._stop_event = stop_event or Event()
-        self._latest_date_path = latest_date_path or self._default_latest_date_path()
+        self.state_store = state_store or StateStore(state_dir / self._STATE_FILENAME)
+        self.alert_ledger = alert_ledger or AlertLedger(
+            self.state_store,
+            AlertLedgerConfig(
+                mode=RealertMode.parse(self.scheduler_config.realert_mode),
+                cooldown_seconds=self.scheduler_config.realert_cooldown_seconds,
+                min_improvement=self.scheduler_config.realert_min_improvement,
+            ),
+        )
+        self.notification_queue = notification_queue
+        if self.notification_queue is None and self.scheduler_config.notification_queue_size > 0:
+            spool_dir = self.scheduler_config.notification_spool_dir
+            self.notification_queue = NotificationQueue(
+                self.notifier,
+                NotificationQueueConfig(
+                    max_size=self.scheduler_config.notification_queue_size,
+                    spool_dir=(Path(spool_dir) if spool_dir else state_dir / "outbox"),
+                ),
+                on_replay=self._replayed_alert,
+            )
+        self._cycle = 0
+        self._last_state_prune = 0.0
+        # Wall-clock time of the last completed cycle or job (see `record_success`).
+        self.last_success_at: Optional[float] = None
+        self.polling_policy = polling_policy
+        if self.polling_policy is None and self.scheduler_config.adaptive_polling:
+            self.polling_policy = AdaptivePollingPolicy(
+                AdaptivePollingConfig(
+                    min_interval_seconds=self.scheduler_config.min_poll_interval_seconds,
+                    max_interval_seconds=self.scheduler_config.max_poll_interval_seconds,
+                ),
+                store=self.state_store,
+            )
+
+    def reconfigure(
+        self, watchlist: Watchlist, scheduler_config: Optional[SchedulerConfig] = None
+    ) -> None:
+        """Swap in a new watchlist and settings, keeping pools, caches and stored state.
+
+        Settings in `SchedulerConfig.RESTART_FIELDS` keep their current value until
+        the next restart. Realert and polling bounds are applied to the live
+        alert ledger and polling policy, which keep their history.
+        """
+        self.watchlist = watchlist
+        if scheduler_config is None:
+            return
+        current = self.scheduler_config
+        pinned: Dict[str, Any] = {}
+        for name in sorted(SchedulerConfig.RESTART_FIELDS):
+            if getattr(scheduler_config, name) != getattr(current, name):
+                logger.warning("Setting %s changed; it takes effect after a restart.", name)
+            pinned[name] = getattr(current, name)
+        updated = replace(scheduler_config, **pinned)
+        self.scheduler_config = updated
+
+        realert = ("realert_mode", "realert_cooldown_seconds", "realert_min_improvement")
+        if any(getattr(updated, name) != getattr(current, name) for name in realert):
+            self.alert_ledger.config = AlertLedgerConfig(
+                mode=RealertMode.parse(updated.realert_mode),
+                cooldown_seconds=updated.realert_cooldown_seconds,
+                min_improvement=updated.realert_min_improvement,
+            )
+        bounds = ("min_poll_interval_seconds", "max_poll_interval_seconds")
+        if self.polling_policy is not None and any(
+            getattr(updated, name) != getattr(current, name) for name in bounds
+        ):
+            self.polling_policy.config = replace(
+                self.polling_policy.config,
+                min_interval_seconds=updated.min_poll_interval_seconds,
+                max_interval_seconds=updated.max_poll_interval_seconds,
+            )
+
+    def settings_for(self, target: Optional[WatchTarget]) -> SchedulerConfig:
+        """`scheduler_config` with the target's party size and threshold overrides."""
+        overrides = target.overrides() if target is not None else {}
+        return replace(self.scheduler_config, **overrides) if overrides else self.scheduler_config
 
-    def _plan_dates(self) -> List[date]:
+    def _plan_dates(
+        self, config: Optional[AppConfig] = None, *, today: Optional[date] = None
+    ) -> List[date]:
+        """Dates to sweep; with `today` the sweep never starts before it (rolling horizon)."""
+        config = config or self.app_config
+        start_date = config.movie_date()
+        if today is not None:
+            start_date = max(start_date, today)
         sweep_config = DateSweepConfig(
-            start_date=self.app_config.movie_date(),
+            start_date=start_date,
             days=self.scheduler_config.horizon_days,
-            allowed_weekdays=self.app_config.allowed_weekday_indices(),
+            allowed_weekdays=config.allowed_weekday_indices(),
         )
         return list(self.date_iterator(sweep_config))
 
+    def _ordered_targets(self) -> List[Tuple[WatchTarget, AppConfig]]:
+        """Rotate the watchlist every cycle so no target is always processed last."""
+        targets = self.watchlist.configs(self.app_config)
+        offset = self._cycle % len(targets)
+        self._cycle += 1
+        return targets[offset:] + targets[:offset]
+
     def run_once(self) -> int:
-        dates = self._plan_dates()
+        try:
+            with metrics.stage("cycle"):
+                dispatched = self._run_cycle()
+            self.record_success()
+            return dispatched
+        finally:
+            self._report_cycle_metrics()
+
+    def _run_cycle(self) -> int:
+        dispatched = 0
+        failures: List[Exception] = []
+        targets = self._ordered_targets()
+
+        # All state written during the cycle is committed in one transaction.
+        with self.state_store.batch():
+            for target, config in targets:
+                try:
+                    dispatched += self._run_target(target, config)
+                except Exception as exc:
+                    if len(targets) == 1:
+                        raise
+                    logger.exception("Monitoring %s failed: %s", target.key, exc)
+                    failures.append(exc)
+
+        self.send_rendered_alerts()
+        self._flush_alert_batches()
+        self.prune_state()
+        if failures and len(failures) == len(targets):
+            raise failures[0]
+        if dispatched == 0:
+            logger.info("No seat suggestions available for configured dates.")
+        return dispatched
+
+    def _report_cycle_metrics(self) -> None:
+        registry = metrics.get_registry()
+        if not registry.enabled:
+            return
+        logger.info("Cycle metrics: %s", registry.take_cycle_summary() or "no stages recorded")
+        if self.scheduler_config.metrics_file:
+            try:
+                registry.write(self.scheduler_config.metrics_file)
+            except OSError as exc:
+                logger.warning("Failed to write metrics snapshot: %s", exc)
+
+    def _run_target(self, target: WatchTarget, config: AppConfig) -> int:
+        dates = self._plan_dates(config)
         if not dates:
-            logger.info("No eligible dates to check (filters excluded all days).")
+            logger.info(
+                "No eligible dates to check for %s (filters excluded all days).", target.key
+            )
             return 0
 
-        recommendations = self.advisor.recommend(
-            self.app_config,
-            party_size=self.scheduler_config.party_size,
-            top_n=self.scheduler_config.top_n,
-            include_wheelchair=self.scheduler_config.include_wheelchair,
-            dates=dates,
+        settings = self.settings_for(target)
+        policy = self.polling_policy
+        if policy is None:
+            recommendations = self.advisor.recommend(
+                config,
+                party_size=settings.party_size,
+                top_n=settings.top_n,
+                include_wheelchair=settings.include_wheelchair,
+                dates=dates,
+            )
+        else:
+            policy.prune(before=dates[0])
+            recommendations = self.advisor.recommend(
+                config,
+                party_size=settings.party_size,
+                top_n=settings.top_n,
+                include_wheelchair=settings.include_wheelchair,
+                dates=dates,
+                screening_filter=lambda _date, screening: policy.is_due(
+                    self.screening_key(target, screening)
+                ),
+            )
+            for observation in getattr(self.advisor, "last_observations", recommendations):
+                policy.observe(
+                    self.screening_key(target, observation.screening),
+                    observation,
+                    has_block=bool(self._filter_suggestions(observation, target)),
+                )
+        self._record_observations(
+            target, getattr(self.advisor, "last_observations", recommendations)
         )
 
         dispatched = 0
         for recommendation in recommendations:
-            filtered = self._filter_suggestions(recommendation)
-            for suggestion in filtered:
-                self._notify(recommendation, suggestion)
-                dispatched += 1
-        self._notify_if_no_new_screening_day()
+            dispatched += self.dispatch(recommendation, config, target)
+        self._notify_if_no_new_screening_day(target)
+        return dispatched
 
-        if dispatched == 0:
-            logger.info("No seat suggestions available for configured dates.")
+    def check_screening(
+        self,
+        target: WatchTarget,
+        config: AppConfig,
+        screening_date: date,
+        screening: ScreeningDescriptor,
+    ) -> Optional[SeatRecommendation]:
+        """Fetch and score a single screening and dispatch its alerts.
+
+        Used by the daemon and queue workers, which schedule screenings individually.
+        """
+        settings = self.settings_for(target)
+        recommendation: Optional[SeatRecommendation] = self.advisor.evaluate_screening(
+            screening_date,
+            screening,
+            party_size=settings.party_size,
+            top_n=settings.top_n,
+            include_wheelchair=settings.include_wheelchair,
+        )
+        if recommendation is None:
+            return None
+        self._record_observations(target, [recommendation])
+        if recommendation.suggestions:
+            self.dispatch(recommendation, config, target)
+            self.send_rendered_alerts()
+        return recommendation
+
+    def next_check_interval(
+        self, target: WatchTarget, recommendation: SeatRecommendation, default: float
+    ) -> float:
+        """Seconds until the screening is due again: adaptive when enabled, else `default`."""
+        if self.polling_policy is None:
+            return default
+        return self.polling_policy.observe(
+            self.screening_key(target, recommendation.screening),
+            recommendation,
+            has_block=bool(self._filter_suggestions(recommendation, target)),
+        )
+
+    def _record_observations(
+        self, target: WatchTarget, observations: Iterable[SeatRecommendation]
+    ) -> None:
+        for observation in observations:
+            metrics.increment("screenings_checked")
+            screening = observation.screening
+            self.state_store.record_screening(
+                self.screening_key(target, screening),
+                target=target.key,
+                screening_date=observation.screening_date,
+                show_time=screening.show_time.isoformat(),
+                label=screening.label,
+                order_url=normalize_order_url(screening.order_url),
+            )
+            seat_map = observation.seat_map
+            self.state_store.record_layout(seat_map.layout_fingerprint(), len(seat_map.seats))
+
+    def dispatch(
+        self,
+        recommendation: SeatRecommendation,
+        config: Optional[AppConfig] = None,
+        target: Optional[WatchTarget] = None,
+    ) -> int:
+        """Filter a recommendation's suggestions and send an alert for each survivor.
+
+        Suggestions the alert ledger already reported are skipped before rendering.
+        An alert is recorded in the ledger only once the notifier confirms its
+        delivery; until then repeats are held back, and a failed send is
+        released so a later cycle can try again.
+        """
+        config = config or self.app_config
+        target = target or WatchTarget.from_app_config(config)
+        screening_key = self.screening_key(target, recommendation.screening)
+        dispatched = 0
+        for suggestion in self._filter_suggestions(recommendation, target):
+            if not self.alert_ledger.should_send(
+                screening_key, suggestion, recommendation.seat_map
+            ):
+                continue
+            self.alert_ledger.mark_in_flight(screening_key, suggestion)
+            try:
+                self._notify(
+                    recommendation,
+                    suggestion,
+                    config,
+                    group_key=screening_key,
+                    on_result=self._ledger_callback(
+                        screening_key, suggestion, recommendation.seat_map
+                    ),
+                )
+            except Exception:
+                self.alert_ledger.release(screening_key, suggestion)
+                raise
+            dispatched += 1
+        metrics.increment("alerts_dispatched", dispatched)
         return dispatched
 
+    def _ledger_callback(
+        self, screening_key: str, suggestion: SeatBlockSuggestion, seat_map: SeatMap
+    ) -> DeliveryCallback:
+        ticket = self.alert_ledger.ticket(screening_key, suggestion, seat_map)
+        return _LedgerCallback(self.alert_ledger, ticket, log_only=self._log_only())
+
+    def _replayed_alert(self, ticket: AlertTicket) -> DeliveryCallback:
+        # A spooled alert from an earlier run: hold it so `dispatch` does not send it again.
+        self.alert_ledger.hold(ticket)
+        return _LedgerCallback(self.alert_ledger, ticket, log_only=self._log_only())
+
+    def _log_only(self) -> bool:
+        is_configured = getattr(self.notifier, "is_configured", None)
+        return callable(is_configured) and not is_configured()
+
     def poll_with_retry(self) -> int:
         attempt = 0
         last_error: Optional[Exception] = None
@@ -134,41 +570,344 @@ class MonitorScheduler:
 
     def run_forever(self) -> None:
         logger.info(
-            "Starting scheduler loop (interval=%ss).", self.scheduler_config.poll_interval_seconds
+            "Starting scheduler loop (interval=%ss, adaptive=%s).",
+            self.scheduler_config.poll_interval_seconds,
+            self.polling_policy is not None,
         )
         while not self._stop_event.is_set():
             try:
                 self.poll_with_retry()
             except Exception as exc:
                 logger.exception("Polling failed: %s", exc)
-            if self._stop_event.wait(self.scheduler_config.poll_interval_seconds):
+            if self._stop_event.wait(self._next_wait_seconds()):
                 break
 
+    def _next_wait_seconds(self) -> float:
+        """Sleep until the next screening is due, never longer than the global interval."""
+        interval = float(self.scheduler_config.poll_interval_seconds)
+        if self.polling_policy is None:
+            return interval
+        due_in = self.polling_policy.seconds_until_next_due()
+        if due_in is None:
+            return interval
+        floor = float(self.scheduler_config.min_poll_interval_seconds)
+        return min(max(due_in, floor), interval)
+
+    @staticmethod
+    def screening_key(target: WatchTarget, screening: ScreeningDescriptor) -> str:
+        return f"{target.key}|{normalize_order_url(screening.order_url)}"
+
     def stop(self) -> None:
         self._stop_event.set()
 
-    def _notify(self, recommendation: SeatRecommendation, suggestion: SeatBlockSuggestion) -> None:
+    def prune_state(self) -> None:
+        """Drop stored state older than the retention window (at most once an hour)."""
+        now = time.time()
+        if now - self._last_state_prune < self._STATE_PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_state_prune = now
+        retention = max(
+            self.scheduler_config.state_retention_seconds,
+            self.scheduler_config.realert_cooldown_seconds,
+        )
+        self.state_store.prune(retention)
+
+    def record_success(self) -> None:
+        """Note that a cycle, discovery or screening check just completed."""
+        self.last_success_at = time.time()
+
+    def status(self) -> Dict[str, float]:
+        """Point-in-time gauges for health checks and the metrics endpoint.
+
+        Only reads counters that are already maintained, so it is cheap enough
+        to call on every scrape; components that are not in use are left out.
+        """
+        gauges: Dict[str, float] = {"pending_renders": len(self._pending_alerts)}
+        if self.last_success_at is not None:
+            gauges["last_success_timestamp_seconds"] = self.last_success_at
+        if self.notification_queue is not None:
+            gauges["notification_queue_pending"] = self.notification_queue.pending
+        seat_maps = getattr(self.advisor, "seat_maps", None)
+        if seat_maps is not None:
+            gauges["seatmap_cache_hits"] = seat_maps.hits
+            gauges["seatmap_cache_misses"] = seat_maps.misses
+        cache_stats = getattr(self.renderer, "cache_stats", None)
+        stats = cache_stats() if callable(cache_stats) else None
+        if stats is not None:
+            gauges["render_cache_hits"] = stats.hits
+            gauges["render_cache_misses"] = stats.misses
+            gauges["render_cache_entries"] = stats.entries
+            gauges["render_cache_bytes"] = stats.total_bytes
+        browser = getattr(self.advisor, "browser_discovery", None)
+        if browser is not None and hasattr(browser, "session_open"):
+            gauges["browser_session_open"] = int(browser.session_open)
+            gauges["browser_page_loads"] = browser.page_loads
+            gauges["browser_fragment_navigations"] = browser.fragment_navigations
+        return gauges
+
+    def close(self) -> None:
+        """Release long-lived resources (notifier and browser sessions, state database)."""
+        self.stop()
+        self.send_rendered_alerts()
+        if self.render_executor is not None:
+            self.render_executor.close()
+        if self.notification_queue is not None:
+            self.notification_queue.close()
+        close_notifier = getattr(self.notifier, "close", None)
+        if callable(close_notifier):
+            close_notifier()
+        close_advisor = getattr(self.advisor, "close", None)
+        if callable(close_advisor):
+            close_advisor()
+        self.state_store.close()
+
+    def seed_queue(self, queue: LeaseJobQueue, *, today: Optional[date] = None) -> int:
+        """Enqueue one discovery job per target and date and drop jobs outside the plan.
+
+        The plan starts at the configured date or `today` (default: the current
+        date), whichever is later, so the horizon rolls forward as days pass.
+        Existing planned jobs keep their schedule. Discovery jobs for dates or
+        targets no longer planned, and screening jobs of removed targets, are
+        deleted. Returns how many jobs were inserted.
+        """
+        inserted = 0
+        planned: Set[str] = set()
+        target_keys: Set[str] = set()
+        for target, config in self.watchlist.configs(self.app_config):
+            target_keys.add(target.key)
+            for screening_date in self._plan_dates(config, today=today or date.today()):
+                key = f"discovery|{target.key}|{screening_date.isoformat()}"
+                planned.add(key)
+                inserted += queue.enqueue(
+                    key,
+                    "discovery",
+                    {"target": asdict(target), "date": screening_date.isoformat()},
+                )
+        removed = queue.retain("discovery", planned.__contains__)
+        # Screening keys start with the target key (see `screening_key`).
+        removed += queue.retain("screening", lambda key: key.split("|", 1)[0] in target_keys)
+        if removed:
+            logger.info("Removed %d queued job(s) no longer in the plan.", removed)
+        return inserted
+
+    def run_worker(self, queue: LeaseJobQueue, worker_id: str, *, batch_size: int = 1) -> None:
+        """Process discovery/screening jobs from a queue shared with other workers.
+
+        Several workers (processes or hosts sharing the queue file) can run this
+        concurrently; leases guarantee each job is handled by one worker at a time
+        and completed jobs are not due again until their interval has elapsed.
+        """
+        self.seed_queue(queue)
+        logger.info("Worker %s started (queue=%s).", worker_id, queue.path)
+        while not self._stop_event.is_set():
+            jobs = queue.claim(worker_id, limit=batch_size)
+            if not jobs:
+                due_in = queue.seconds_until_next_due()
+                interval = float(self.scheduler_config.poll_interval_seconds)
+                self._stop_event.wait(interval if due_in is None else min(due_in, interval))
+                continue
+            with queue.keep_alive(worker_id, [job.key for job in jobs]):
+                for job in jobs:
+                    if self._stop_event.is_set():
+                        queue.release(worker_id, job.key)
+                        continue
+                    with self.state_store.batch():
+                        self._run_queued_job(queue, worker_id, job)
+        logger.info("Worker %s stopped.", worker_id)
+
+    def _run_queued_job(self, queue: LeaseJobQueue, worker_id: str, job: LeasedJob) -> None:
+        retry_in = float(self.scheduler_config.poll_interval_seconds)
+        try:
+            target = WatchTarget.from_mapping(job.payload["target"])
+            config = target.apply(self.app_config)
+            screening_date = date.fromisoformat(job.payload["date"])
+            if job.kind == "discovery":
+                if screening_date < date.today():
+                    queue.complete(worker_id, job.key, next_due_in=None)
+                    return
+                screenings = self.advisor.discover_screenings(config, screening_date)
+                if screenings is None:
+                    queue.release(worker_id, job.key, retry_in=retry_in)
+                    return
+                for screening in screenings:
+                    queue.enqueue(
+                        self.screening_key(target, screening),
+                        "screening",
+                        {
+                            "target": asdict(target),
+                            "date": screening_date.isoformat(),
+                            "label": screening.label,
+                            "show_time": screening.show_time.isoformat(),
+                            "order_url": screening.order_url,
+                            "metadata": screening.metadata,
+                        },
+                    )
+                queue.complete(
+                    worker_id,
+                    job.key,
+                    next_due_in=self.scheduler_config.discovery_interval_seconds,
+                )
+                self.record_success()
+                self.prune_state()
+                # Rolls the date horizon forward and drops what left the plan.
+                self.seed_queue(queue)
+                return
+
+            screening = ScreeningDescriptor(
+                label=job.payload["label"],
+                show_time=time_of_day.fromisoformat(job.payload["show_time"]),
+                order_url=job.payload["order_url"],
+                metadata=dict(job.payload.get("metadata") or {}),
+            )
+            if datetime.combine(screening_date, screening.show_time) <= datetime.now():
+                queue.complete(worker_id, job.key, next_due_in=None)
+                return
+            recommendation = self.check_screening(target, config, screening_date, screening)
+            if recommendation is None:
+                queue.release(worker_id, job.key, retry_in=retry_in)
+                return
+            queue.complete(
+                worker_id,
+                job.key,
+                next_due_in=self.next_check_interval(target, recommendation, retry_in),
+            )
+            self.record_success()
+        except Exception as exc:
+            logger.exception("Queued job %s failed: %s", job.key, exc)
+            queue.release(worker_id, job.key, retry_in=retry_in)
+
+    def _notify(
+        self,
+        recommendation: SeatRecommendation,
+        suggestion: SeatBlockSuggestion,
+        config: Optional[AppConfig] = None,
+        *,
+        group_key: Optional[str] = None,
+        on_result: Optional[DeliveryCallback] = None,
+    ) -> None:
+        config = config or self.app_config
+        if self.render_executor is not None:
+            # Rendering continues in the pool while the sweep fetches the next screening.
+            future = self.render_executor.submit(recommendation.seat_map, [suggestion])
+            with self._pending_lock:
+                self._pending_alerts.append(
+                    _PendingAlert(future, recommendation, suggestion, config, group_key, on_result)
+                )
+            self.send_rendered_alerts(wait=False)
+            return
+
         screenshot_path: Optional[str] = None
+        photo: Optional[bytes] = None
         if self.renderer:
             try:
-                screenshot_path = self.renderer.render(recommendation.seat_map, suggestion)
+                # Render in memory when the renderer supports it; files are only for archiving.
+                if hasattr(self.renderer, "render_bytes"):
+                    photo = self.renderer.render_bytes(recommendation.seat_map, suggestion)
+                else:
+                    screenshot_path = self.renderer.render(recommendation.seat_map, suggestion)
             except Exception as exc:
                 logger.warning("Seat map rendering failed: %s", exc)
+        self._send_alert(
+            recommendation,
+            suggestion,
+            config,
+            screenshot_path,
+            photo=photo,
+            group_key=group_key,
+            on_result=on_result,
+        )
 
+    def send_rendered_alerts(self, *, wait: bool = True) -> int:
+        """Send alerts whose previews were rendered off-thread, in submission order.
+
+        With `wait=False` only alerts at the head of the queue whose render has
+        finished are sent. Returns the number of alerts sent.
+        """
+        sent = 0
+        while True:
+            with self._pending_lock:
+                if not self._pending_alerts:
+                    return sent
+                pending = self._pending_alerts[0]
+                if not wait and not pending.render.done():
+                    return sent
+                self._pending_alerts.popleft()
+            photo: Optional[bytes] = None
+            try:
+                photo = pending.render.result()
+            except Exception as exc:
+                logger.warning("Seat map rendering failed: %s", exc)
+            self._send_alert(
+                pending.recommendation,
+                pending.suggestion,
+                pending.config,
+                photo=photo,
+                group_key=pending.group_key,
+                on_result=pending.on_result,
+            )
+            sent += 1
+
+    def _send_alert(
+        self,
+        recommendation: SeatRecommendation,
+        suggestion: SeatBlockSuggestion,
+        config: AppConfig,
+        screenshot_path: Optional[str] = None,
+        *,
+        photo: Optional[bytes] = None,
+        group_key: Optional[str] = None,
+        on_result: Optional[DeliveryCallback] = None,
+    ) -> None:
         message = self._format_message(
             recommendation.screening,
             recommendation.screening_date,
             suggestion,
-            has_attachment=bool(screenshot_path),
+            has_attachment=bool(screenshot_path or photo),
+            config=config,
         )
         logger.info(
-            "Sending alert for %s on %s: Row %s Seats %s",
+            "Sending alert for %s %s on %s: Row %s Seats %s",
+            config.movie_name_slug,
             recommendation.screening.label,
             recommendation.screening_date,
             suggestion.row_number,
             ", ".join(map(str, suggestion.seat_numbers)),
         )
-        self.notifier.send_alert_sync(message, screenshot_path=screenshot_path)
+        self._send(message, screenshot_path, photo=photo, group_key=group_key, on_result=on_result)
+
+    def _send(
+        self,
+        message: str,
+        screenshot_path: Optional[str] = None,
+        *,
+        photo: Optional[bytes] = None,
+        group_key: Optional[str] = None,
+        on_result: Optional[DeliveryCallback] = None,
+    ) -> None:
+        if self.notification_queue is not None:
+            self.notification_queue.submit(
+                message,
+                screenshot_path,
+                photo=photo,
+                group_key=group_key,
+                on_result=on_result,
+                ticket=getattr(on_result, "ticket", None),
+            )
+            return
+        send_via(
+            self.notifier,
+            message,
+            screenshot_path,
+            photo=photo,
+            group_key=group_key,
+            on_result=on_result,
+        )
+
+    def _flush_alert_batches(self) -> None:
+        # With a notification queue the batches are flushed by their linger timers,
+        # so the sweep never waits for Telegram.
+        if self.notification_queue is None and getattr(self.notifier, "batching", False):
+            self.notifier.flush_batches_sync()
 
     def _format_message(
         self,
@@ -177,12 +916,14 @@ class MonitorScheduler:
         suggestion: SeatBlockSuggestion,
         *,
         has_attachment: bool = False,
+        config: Optional[AppConfig] = None,
     ) -> str:
+        config = config or self.app_config
         seats = ", ".join(str(num) for num in suggestion.seat_numbers)
         attachment_line = "\nSeat map preview attached." if has_attachment else ""
         return (
             "🎬 Seat Alert\n\n"
-            f"Movie: {self.app_config.movie_name_slug}\n"
+            f"Movie: {config.movie_name_slug}\n"
             f"Date: {screening_date} at {screening.label}\n"
             f"Row: {suggestion.row_number} — Seats: {seats}\n"
             f"Score: {suggestion.score:.2f}\n"
@@ -190,35 +931,63 @@ class MonitorScheduler:
             f"{attachment_line}"
         )
 
-    def _notify_if_no_new_screening_day(self) -> None:
+    def _notify_if_no_new_screening_day(self, target: Optional[WatchTarget] = None) -> None:
         if not hasattr(self.advisor, "last_screening_dates"):
             return
         if not self.advisor.last_screening_dates:
             logger.info("No screening dates discovered; skipping latest-date tracking.")
             return
 
+        state_key = self._latest_date_key(target)
         latest_seen = max(self.advisor.last_screening_dates)
-        previous = self._load_latest_screening_date()
+        previous = self.state_store.get_date(state_key)
+        if previous is None:
+            previous = self._load_latest_screening_date(self._latest_date_path_for(target))
         if previous is None or latest_seen > previous:
-            self._store_latest_screening_date(latest_seen)
+            self.state_store.set_date(state_key, latest_seen)
             logger.info(
                 "Stored latest screening date (%s) in %s",
                 latest_seen.isoformat(),
-                self._latest_date_path,
+                self.state_store.path,
             )
             return
 
+        movie_line = (
+            f"Movie: {target.movie_name_slug}\n" if len(self.watchlist) > 1 and target else ""
+        )
         message = (
             "📅 No new screening day yet.\n\n"
+            f"{movie_line}"
             f"Latest available screening date remains {previous.isoformat()}."
         )
-        self.notifier.send_alert_sync(message)
+        if not self.alert_ledger.should_send_notice(state_key, message):
+            return
+
+        def on_result(delivered: bool) -> None:
+            if delivered:
+                self.alert_ledger.record_notice(state_key, message)
+
+        self._send(message, on_result=on_result)
+
+    def _latest_date_key(self, target: Optional[WatchTarget]) -> str:
+        target = target or WatchTarget.from_app_config(self.app_config)
+        return f"latest_screening_date|{target.key}"
+
+    def _latest_date_path_for(self, target: Optional[WatchTarget]) -> Path:
+        """Legacy per-target text file, read once when the state store has no entry."""
+        if target is None or len(self.watchlist) == 1:
+            return self._latest_date_path
+        safe_key = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in target.key)
+        return self._latest_date_path.with_name(
+            f"{self._latest_date_path.stem}.{safe_key}{self._latest_date_path.suffix}"
+        )
 
-    def _load_latest_screening_date(self) -> Optional[date]:
+    def _load_latest_screening_date(self, path: Optional[Path] = None) -> Optional[date]:
+        path = path or self._latest_date_path
         try:
-            if not self._latest_date_path.exists():
+            if not path.exists():
                 return None
-            content = self._latest_date_path.read_text(encoding="utf-8").strip()
+            content = path.read_text(encoding="utf-8").strip()
             if not content:
                 return None
             return date.fromisoformat(content)
@@ -226,20 +995,15 @@ class MonitorScheduler:
             logger.debug("Failed to read latest screening date: %s", exc)
             return None
 
-    def _store_latest_screening_date(self, latest: date) -> None:
-        try:
-            self._latest_date_path.parent.mkdir(parents=True, exist_ok=True)
-            self._latest_date_path.write_text(latest.isoformat(), encoding="utf-8")
-        except Exception as exc:
-            logger.debug("Failed to store latest screening date: %s", exc)
-
     def _default_latest_date_path(self) -> Path:
         base_dir = Path.home() / ".local" / "share" / "cinema-monitor"
         return base_dir / self._LATEST_DATE_FILENAME
 
-    def _filter_suggestions(self, recommendation: SeatRecommendation) -> List[SeatBlockSuggestion]:
+    def _filter_suggestions(
+        self, recommendation: SeatRecommendation, target: Optional[WatchTarget] = None
+    ) -> List[SeatBlockSuggestion]:
         filtered: List[SeatBlockSuggestion] = []
-        min_score = self.scheduler_config.min_score
+        min_score = self.settings_for(target).min_score
         for suggestion in recommendation.suggestions:
             if min_score is not None and suggestion.score < min_score:
                 logger.debug(
@@ -3,14 +3,15 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass, field
 from datetime import date, time
-from typing import Dict, Iterable, List, Optional
-
-import httpx
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 
 from src.config import AppConfig
 
+if TYPE_CHECKING:
+    import httpx
+
 
 class ScreeningDiscoveryError(RuntimeError):
     """Raised when the screening list cannot be retrieved or parsed."""
@@ -35,11 +36,152 @@ def parse_show_time(text: str) -> Optional[time]:
     return time.fromisoformat(hour_str)
 
 
-def _matches_language_and_format(data_attrs: Optional[str]) -> bool:
+def _matches_language_and_format(data_attrs: Optional[str], film_format: str = "imax") -> bool:
     if not data_attrs:
         return False
     lowered = data_attrs.lower()
-    return "original-lang-en" in lowered and "imax" in lowered
+    return "original-lang-en" in lowered and film_format.lower() in lowered
+
+
+_COLUMN_CLASS = "qb-movie-info-column"
+_SHOWTIME_CLASSES = frozenset({"btn", "btn-primary", "btn-lg"})
+
+
+DatedScreening = Tuple[Optional[date], ScreeningDescriptor]
+
+
+class _ShowtimeExtractor(HTMLParser):
+    """Streams a movie page and keeps only showtime anchors inside info columns.
+
+    Equivalent to selecting `div.qb-movie-info-column a.btn.btn-primary.btn-lg`
+    in a parsed tree, but no tree is built: anchors without a `data-url` or whose
+    `data-attrs` fail the language/format check are dropped at their start tag,
+    and text is only collected for the anchors that remain.
+
+    When the page lists several days, each anchor is dated by its own
+    `data-date` or the nearest enclosing `<div data-date="YYYY-MM-DD">`.
+    """
+
+    def __init__(self, film_format: str):
+        super().__init__(convert_charrefs=True)
+        self.film_format = film_format
+        self.screenings: List[DatedScreening] = []
+        self._div_depth = 0
+        # (`_div_depth`, date) for every open div carrying a `data-date`.
+        self._dates: List[Tuple[int, date]] = []
+        # `_div_depth` values at which the enclosing info columns were opened.
+        self._columns: List[int] = []
+        self._anchor: Optional[Tuple[str, Dict[str, str], Optional[date]]] = None
+        self._anchor_depth = 0
+        self._anchor_div_depth = 0
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "div":
+            self._div_depth += 1
+            if _COLUMN_CLASS in _class_tokens(attrs):
+                self._columns.append(self._div_depth)
+            div_date = _date_attr(attrs)
+            if div_date is not None:
+                self._dates.append((self._div_depth, div_date))
+        elif tag == "a":
+            if self._anchor is not None:
+                self._anchor_depth += 1
+            elif self._columns and _SHOWTIME_CLASSES <= _class_tokens(attrs):
+                self._start_anchor(attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "div":
+            if self._anchor is not None and self._div_depth <= self._anchor_div_depth:
+                # The anchor was never closed; its parent closing ends it too.
+                self._finish_anchor()
+            if self._columns and self._columns[-1] == self._div_depth:
+                self._columns.pop()
+            if self._dates and self._dates[-1][0] == self._div_depth:
+                self._dates.pop()
+            self._div_depth = max(self._div_depth - 1, 0)
+        elif tag == "a" and self._anchor is not None:
+            if self._anchor_depth:
+                self._anchor_depth -= 1
+            else:
+                self._finish_anchor()
+
+    def handle_data(self, data: str) -> None:
+        if self._anchor is not None:
+            stripped = data.strip()
+            if stripped:
+                self._text.append(stripped)
+
+    def close(self) -> None:
+        super().close()
+        if self._anchor is not None:
+            self._finish_anchor()
+
+    def _start_anchor(self, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        values = {key: value or "" for key, value in attrs}
+        order_url = values.get("data-url")
+        if order_url is None or not _matches_language_and_format(
+            values.get("data-attrs"), self.film_format
+        ):
+            return
+        metadata = {
+            key: value
+            for key, value in values.items()
+            if key.startswith("data-") and key != "data-url"
+        }
+        screening_date = _date_attr(attrs)
+        if screening_date is None and self._dates:
+            screening_date = self._dates[-1][1]
+        self._anchor = (order_url, metadata, screening_date)
+        self._anchor_depth = 0
+        self._anchor_div_depth = self._div_depth
+        self._text = []
+
+    def _finish_anchor(self) -> None:
+        assert self._anchor is not None
+        order_url, metadata, screening_date = self._anchor
+        self._anchor = None
+        label = "".join(self._text)
+        show_time = parse_show_time(label)
+        if show_time is None:
+            return
+        self.screenings.append(
+            (
+                screening_date,
+                ScreeningDescriptor(
+                    label=label, show_time=show_time, order_url=order_url, metadata=metadata
+                ),
+            )
+        )
+
+
+def _class_tokens(attrs: List[Tuple[str, Optional[str]]]) -> frozenset[str]:
+    # Like tree builders, the last duplicate attribute wins.
+    return frozenset((dict(attrs).get("class") or "").split())
+
+
+def _date_attr(attrs: List[Tuple[str, Optional[str]]]) -> Optional[date]:
+    value = dict(attrs).get("data-date")
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def group_screenings_by_date(
+    screenings: Iterable[DatedScreening], dates: Sequence[date]
+) -> Dict[date, List[ScreeningDescriptor]]:
+    """Assign dated screenings to their day; undated ones apply to every date."""
+    grouped: Dict[date, List[ScreeningDescriptor]] = {day: [] for day in dates}
+    for screening_date, descriptor in screenings:
+        if screening_date is None:
+            for day in dates:
+                grouped[day].append(descriptor)
+        elif screening_date in grouped:
+            grouped[screening_date].append(descriptor)
+    return grouped
 
 
 def filter_screenings_for_config(
@@ -74,10 +216,41 @@ class ScreeningDiscovery:
         self, movie_url: str, config: AppConfig, target_date: Optional[date] = None
     ) -> List[ScreeningDescriptor]:
         html = self._fetch(movie_url)
-        screenings = self._parse_screenings(html)
+        screening_date = target_date or config.movie_date()
+        screenings = group_screenings_by_date(
+            self._parse_dated_screenings(html, film_format=config.film_format), [screening_date]
+        )[screening_date]
         return filter_screenings_for_config(screenings, config, target_date)
 
+    def discover_many(
+        self, config: AppConfig, dates: Sequence[date]
+    ) -> Dict[date, List[ScreeningDescriptor]]:
+        """Discover several dates with one request per distinct movie page.
+
+        The date only lives in the URL fragment, which is never sent to the
+        server, so every date of a movie maps to the same document and is served
+        by a single fetch and parse.
+        """
+        by_document: Dict[str, List[date]] = {}
+        for screening_date in dates:
+            document = urlsplit(config.movie_url_for_date(screening_date))._replace(fragment="")
+            by_document.setdefault(document.geturl(), []).append(screening_date)
+
+        results: Dict[date, List[ScreeningDescriptor]] = {}
+        for document_url, document_dates in by_document.items():
+            html = self._fetch(document_url)
+            grouped = group_screenings_by_date(
+                self._parse_dated_screenings(html, film_format=config.film_format), document_dates
+            )
+            for screening_date, screenings in grouped.items():
+                results[screening_date] = filter_screenings_for_config(
+                    screenings, config, screening_date
+                )
+        return results
+
     def _fetch(self, url: str) -> str:
+        import httpx
+
         try:
             with httpx.Client(
                 timeout=self._timeout,
@@ -92,48 +265,14 @@ class ScreeningDiscovery:
         except httpx.HTTPError as exc:
             raise ScreeningDiscoveryError(f"Failed to fetch screenings from {url}") from exc
 
-    def _parse_screenings(self, html: str) -> List[ScreeningDescriptor]:
-        soup = BeautifulSoup(html, "html.parser")
-        descriptors: List[ScreeningDescriptor] = []
-        columns = soup.select("div.qb-movie-info-column")
-
-        for column in columns:
-            if not isinstance(column, Tag):
-                continue
-            anchors = column.select("a.btn.btn-primary.btn-lg")
-            for anchor in anchors:
-                if not isinstance(anchor, Tag):
-                    continue
-                order_url_attr = anchor.get("data-url")
-                if not isinstance(order_url_attr, str):
-                    continue
-                data_attrs = anchor.get("data-attrs")
-                if not _matches_language_and_format(
-                    data_attrs if isinstance(data_attrs, str) else None
-                ):
-                    continue
-
-                label = anchor.get_text(strip=True)
-                show_time = parse_show_time(label)
-                if show_time is None:
-                    continue
-
-                metadata: Dict[str, str] = {}
-                for key, value in anchor.attrs.items():
-                    if not key.startswith("data-") or key == "data-url":
-                        continue
-                    metadata[key] = str(value)
-
-                descriptors.append(
-                    ScreeningDescriptor(
-                        label=label,
-                        show_time=show_time,
-                        order_url=order_url_attr,
-                        metadata=metadata,
-                    )
-                )
+    def _parse_screenings(self, html: str, film_format: str = "imax") -> List[ScreeningDescriptor]:
+        return [descriptor for _date, descriptor in self._parse_dated_screenings(html, film_format)]
 
-        return descriptors
+    def _parse_dated_screenings(self, html: str, film_format: str = "imax") -> List[DatedScreening]:
+        extractor = _ShowtimeExtractor(film_format)
+        extractor.feed(html)
+        extractor.close()
+        return extractor.screenings
 
     def _apply_filters(
         self, screenings: List[ScreeningDescriptor], config: AppConfig, target_date: Optional[date]
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, TypeVar
 from urllib.parse import parse_qs, urlsplit
 
-from playwright.sync_api import sync_playwright
-
+from src import metrics
 from src.config import AppConfig
 from src.screenings import (
     ScreeningDescriptor,
@@ -16,8 +18,32 @@ from src.screenings import (
     parse_show_time,
 )
 
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, Page, Playwright
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+SHOWTIME_SELECTOR = "a.btn.btn-primary.btn-lg[data-url]"
+
+# Resolves once the showtime anchors differ from `previous` and have stayed the
+# same for `settleMs`, i.e. the widget finished re-rendering for the new date.
+_SHOWTIMES_CHANGED_JS = """
+({selector, previous, settleMs}) => {
+  const signature = Array.from(document.querySelectorAll(selector))
+    .map((anchor) => anchor.getAttribute("data-url"))
+    .join("|");
+  const now = performance.now();
+  const state = window.__cinemaMonitorShowtimes;
+  if (!state || state.signature !== signature) {
+    window.__cinemaMonitorShowtimes = {signature, since: now};
+    return false;
+  }
+  return signature !== previous && now - state.since >= settleMs;
+}
+"""
+
 
 def _extract_date_from_url(url: str) -> Optional[date]:
     fragment = urlsplit(url).fragment
@@ -35,11 +61,44 @@ def _extract_date_from_url(url: str) -> Optional[date]:
 
 
 class BrowserScreeningDiscovery:
-    """Uses Playwright to load the dynamic movie page and extract showtimes."""
+    """Uses Playwright to load the dynamic movie page and extract showtimes.
 
-    def __init__(self, *, headless: bool = True, navigation_timeout_ms: int = 15000):
+    Each call launches its own browser unless `session=True`. In session mode
+    one browser page stays open between calls, on a dedicated thread, because
+    Playwright objects must stay on the thread that created them. Another date
+    of the page that is already open is reached by changing the URL fragment,
+    which the booking widget handles without reloading. The page is reloaded
+    at the start of `discover_many` and whenever it is older than
+    `page_max_age_seconds`, so showtimes never come from a stale widget.
+    Discovery waits for the showtime anchors to appear or change instead of
+    sleeping for a fixed time. Call `close()` to shut the session down.
+    """
+
+    def __init__(
+        self,
+        *,
+        headless: bool = True,
+        navigation_timeout_ms: int = 15000,
+        session: bool = False,
+        render_timeout_ms: int = 5000,
+        settle_ms: int = 250,
+        page_max_age_seconds: float = 60.0,
+    ):
         self.headless = headless
         self.navigation_timeout_ms = navigation_timeout_ms
+        self.session = session
+        self.render_timeout_ms = render_timeout_ms
+        self.settle_ms = settle_ms
+        self.page_max_age_seconds = page_max_age_seconds
+        self.page_loads = 0
+        self.fragment_navigations = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._page: Optional[Page] = None
+        self._locale: Optional[str] = None
+        self._loaded_at = float("-inf")
 
     def discover(
         self,
@@ -47,52 +106,201 @@ class BrowserScreeningDiscovery:
         config: AppConfig,
         target_date: Optional[date] = None,
     ) -> List[ScreeningDescriptor]:
-        try:
-            with sync_playwright() as playwright:
-                browser = playwright.chromium.launch(headless=self.headless)
-                context = browser.new_context(locale=config.lang)
-                page = context.new_page()
-                logger.info("Loading movie page via Playwright: %s", movie_url)
-                page.goto(
-                    movie_url, wait_until="domcontentloaded", timeout=self.navigation_timeout_ms
+        expected_date = target_date or config.movie_date()
+        return self._run(
+            config, lambda page: self._discover_on_page(page, movie_url, config, expected_date)
+        )
+
+    def discover_many(
+        self, config: AppConfig, dates: Sequence[date]
+    ) -> Dict[date, List[ScreeningDescriptor]]:
+        """Discover several dates with one page load plus in-page fragment changes."""
+        if not dates:
+            return {}
+
+        def discover_all(page: Page) -> Dict[date, List[ScreeningDescriptor]]:
+            return {
+                screening_date: self._discover_on_page(
+                    page,
+                    config.movie_url_for_date(screening_date),
+                    config,
+                    screening_date,
+                    reload=index == 0,
                 )
-                expected_date = target_date or config.movie_date()
-                actual_date = _extract_date_from_url(page.url)
-                if actual_date and actual_date != expected_date:
-                    logger.warning(
-                        "Screenings page redirected to %s (expected %s); skipping.",
-                        actual_date,
-                        expected_date,
-                    )
-                    browser.close()
-                    return []
-
-                selectors = page.query_selector_all("a.btn.btn-primary.btn-lg[data-url]")
-                if not selectors:
-                    page.wait_for_timeout(2000)
-                    selectors = page.query_selector_all("a.btn.btn-primary.btn-lg[data-url]")
-
-                descriptors: List[ScreeningDescriptor] = []
-                for anchor in selectors:
-                    order_url = anchor.get_attribute("data-url")
-                    data_attrs = anchor.get_attribute("data-attrs")
-                    label = (anchor.inner_text() or "").strip()
-                    if not order_url or not label:
-                        continue
-                    if not _matches_language_and_format(data_attrs):
-                        continue
-                    show_time = parse_show_time(label)
-                    if show_time is None:
-                        continue
-                    descriptors.append(
-                        ScreeningDescriptor(
-                            label=label,
-                            show_time=show_time,
-                            order_url=order_url,
-                            metadata={},
-                        )
+                for index, screening_date in enumerate(dates)
+            }
+
+        return self._run(config, discover_all)
+
+    @property
+    def session_open(self) -> bool:
+        """Whether a session browser is currently running."""
+        return self._browser is not None
+
+    def close(self) -> None:
+        """Close the session browser (no-op without `session`)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.submit(self._close_session).result()
+            executor.shutdown(wait=True)
+
+    def _run(self, config: AppConfig, work: Callable[[Page], T]) -> T:
+        from playwright.sync_api import sync_playwright
+
+        try:
+            if not self.session:
+                with sync_playwright() as playwright:
+                    with metrics.stage("browser_launch"):
+                        browser = playwright.chromium.launch(headless=self.headless)
+                        page = browser.new_context(locale=config.lang).new_page()
+                    try:
+                        return work(page)
+                    finally:
+                        browser.close()
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="browser-discovery"
                     )
-                browser.close()
-                return filter_screenings_for_config(descriptors, config, target_date)
+                executor = self._executor
+            return executor.submit(lambda: work(self._session_page(config))).result()
         except Exception as exc:
+            if self.session:
+                # The page may be in an unknown state; start over on the next call.
+                self._submit_reset()
             raise ScreeningDiscoveryError(f"Browser discovery failed: {exc}") from exc
+
+    def _session_page(self, config: AppConfig) -> Page:
+        if self._page is not None and self._locale == config.lang and not self._page.is_closed():
+            return self._page
+        from playwright.sync_api import sync_playwright
+
+        self._close_session()
+        with metrics.stage("browser_launch"):
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            self._page = self._browser.new_context(locale=config.lang).new_page()
+        self._locale = config.lang
+        logger.info("Started browser discovery session.")
+        return self._page
+
+    def _submit_reset(self) -> None:
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.submit(self._close_session)
+
+    def _close_session(self) -> None:
+        browser, playwright = self._browser, self._playwright
+        self._page = self._browser = self._playwright = None
+        self._loaded_at = float("-inf")
+        for closer in (getattr(browser, "close", None), getattr(playwright, "stop", None)):
+            if closer is None:
+                continue
+            try:
+                closer()
+            except Exception as exc:
+                logger.debug("Ignoring error while closing browser session: %s", exc)
+
+    def _navigate(self, page: Page, movie_url: str, *, reload: bool = False) -> None:
+        """Show `movie_url`, switching only the fragment while the open page is fresh."""
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        target = urlsplit(movie_url)
+        same_document = urlsplit(page.url)._replace(fragment="") == target._replace(fragment="")
+        fresh = time.monotonic() - self._loaded_at <= self.page_max_age_seconds
+        if same_document and fresh and not reload:
+            if page.url != movie_url:
+                previous = self._showtime_signature(page)
+                logger.info("Switching movie page to #%s", target.fragment)
+                self._set_fragment(page, target.fragment)
+                self.fragment_navigations += 1
+                self._wait_for_showtimes_change(page, previous)
+            return
+
+        if same_document:
+            # `goto` to the same document would only be a fragment navigation.
+            if page.url != movie_url:
+                self._set_fragment(page, target.fragment)
+            logger.info("Reloading movie page via Playwright: %s", movie_url)
+            page.reload(wait_until="domcontentloaded", timeout=self.navigation_timeout_ms)
+        else:
+            logger.info("Loading movie page via Playwright: %s", movie_url)
+            page.goto(movie_url, wait_until="domcontentloaded", timeout=self.navigation_timeout_ms)
+        self.page_loads += 1
+        self._loaded_at = time.monotonic()
+        try:
+            page.wait_for_selector(
+                SHOWTIME_SELECTOR, state="attached", timeout=self.render_timeout_ms
+            )
+        except PlaywrightTimeoutError:
+            logger.info("No showtimes rendered within %dms.", self.render_timeout_ms)
+
+    @staticmethod
+    def _set_fragment(page: Page, fragment: str) -> None:
+        page.evaluate("(fragment) => { window.location.hash = fragment; }", fragment)
+
+    def _wait_for_showtimes_change(self, page: Page, previous: str) -> None:
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        arg: Dict[str, Any] = {
+            "selector": SHOWTIME_SELECTOR,
+            "previous": previous,
+            "settleMs": self.settle_ms,
+        }
+        try:
+            page.wait_for_function(_SHOWTIMES_CHANGED_JS, arg=arg, timeout=self.render_timeout_ms)
+        except PlaywrightTimeoutError:
+            # Same showtimes as the previous date (often none at all).
+            logger.debug("Showtimes unchanged after switching date.")
+
+    def _showtime_signature(self, page: Page) -> str:
+        signature: str = page.evaluate(
+            "(selector) => Array.from(document.querySelectorAll(selector))"
+            ".map((anchor) => anchor.getAttribute('data-url')).join('|')",
+            SHOWTIME_SELECTOR,
+        )
+        return signature
+
+    def _discover_on_page(
+        self,
+        page: Page,
+        movie_url: str,
+        config: AppConfig,
+        expected_date: date,
+        *,
+        reload: bool = False,
+    ) -> List[ScreeningDescriptor]:
+        with metrics.stage("navigation"):
+            self._navigate(page, movie_url, reload=reload)
+        actual_date = _extract_date_from_url(page.url)
+        if actual_date and actual_date != expected_date:
+            logger.warning(
+                "Screenings page redirected to %s (expected %s); skipping.",
+                actual_date,
+                expected_date,
+            )
+            return []
+
+        descriptors: List[ScreeningDescriptor] = []
+        for anchor in page.query_selector_all(SHOWTIME_SELECTOR):
+            order_url = anchor.get_attribute("data-url")
+            data_attrs = anchor.get_attribute("data-attrs")
+            label = (anchor.inner_text() or "").strip()
+            if not order_url or not label:
+                continue
+            if not _matches_language_and_format(data_attrs, config.film_format):
+                continue
+            show_time = parse_show_time(label)
+            if show_time is None:
+                continue
+            descriptors.append(
+                ScreeningDescriptor(
+                    label=label,
+                    show_time=show_time,
+                    order_url=order_url,
+                    metadata={},
+                )
+            )
+        return filter_screenings_for_config(descriptors, config, expected_date)
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import enum
+import hashlib
 import logging
 import re
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional
 
-from bs4 import BeautifulSoup
-
 logger = logging.getLogger(__name__)
 
 
@@ -94,6 +93,27 @@ class SeatMap:
     def available_seats(self, include_wheelchair: bool = False) -> List[Seat]:
         return [seat for seat in self.seats if seat.is_available(include_wheelchair)]
 
+    def layout_fingerprint(self) -> str:
+        """Stable hash of the hall geometry (seat identities and grid positions)."""
+        digest = hashlib.sha1()
+        for seat in self.seats:
+            digest.update(
+                f"{seat.row_number},{seat.seat_number},{seat.grid_x},{seat.grid_row};".encode()
+            )
+        return digest.hexdigest()
+
+    def status_vector(self) -> str:
+        """One character per seat (in `seats` order) encoding its current status."""
+        return "".join(_STATUS_CODES[seat.status] for seat in self.seats)
+
+
+_STATUS_CODES: Dict[SeatStatus, str] = {
+    SeatStatus.AVAILABLE: "a",
+    SeatStatus.OCCUPIED: "o",
+    SeatStatus.WHEELCHAIR: "w",
+    SeatStatus.UNKNOWN: "u",
+}
+
 
 class SeatMapParser:
     """Parse Cinema City SVG seat maps into SeatMap structures."""
@@ -104,6 +124,8 @@ class SeatMapParser:
     )
 
     def parse(self, svg_markup: str) -> SeatMap:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(svg_markup, "html.parser")
         svg = soup.select_one("svg#svg-seatmap")
         if svg is None:
@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
 import time
 import urllib.parse
 from datetime import date
-from typing import Callable, Optional, cast
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, cast
 
-import httpx
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-from playwright.sync_api import Page, sync_playwright
+from src import metrics
+
+if TYPE_CHECKING:
+    import httpx
+    from playwright.sync_api import Page
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +51,22 @@ class SeatMapFetcher:
         self._navigation_timeout_ms = navigation_timeout_ms
         self._browser_args = browser_args or ["--no-sandbox", "--disable-setuid-sandbox"]
         self._chromium_sandbox = chromium_sandbox
-        self.last_presentation_date: Optional[date] = None
+        # Per-thread so concurrent fetches (daemon workers) never see each other's date.
+        self._local = threading.local()
+
+    @property
+    def last_presentation_date(self) -> Optional[date]:
+        value: Optional[date] = getattr(self._local, "presentation_date", None)
+        return value
+
+    @last_presentation_date.setter
+    def last_presentation_date(self, value: Optional[date]) -> None:
+        self._local.presentation_date = value
+
+    def fetch_svg_with_date(self, order_url: str) -> Tuple[str, Optional[date]]:
+        """`fetch_svg` plus the presentation date shown on the same order page."""
+        svg_markup = self.fetch_svg(order_url)
+        return svg_markup, self.last_presentation_date
 
     def fetch_svg(self, order_url: str) -> str:
         self.last_presentation_date = None
@@ -68,13 +85,18 @@ class SeatMapFetcher:
         raise SeatMapFetcherError(f"Failed to fetch seat map from {normalized_url}")
 
     def _fetch(self, url: str) -> str:
+        import httpx
+
         try:
-            with httpx.Client(
-                timeout=self._timeout,
-                follow_redirects=True,
-                headers={"User-Agent": "cinema-monitor/2.0"},
-                transport=self._transport,
-            ) as client:
+            with (
+                metrics.stage("seatmap_http"),
+                httpx.Client(
+                    timeout=self._timeout,
+                    follow_redirects=True,
+                    headers={"User-Agent": "cinema-monitor/2.0"},
+                    transport=self._transport,
+                ) as client,
+            ):
                 response = client.get(url)
                 response.raise_for_status()
                 return response.text
@@ -82,6 +104,9 @@ class SeatMapFetcher:
             raise SeatMapFetcherError(f"Failed to fetch seat map from {url}") from exc
 
     def _extract_svg(self, html: str) -> Optional[str]:
+        from bs4 import BeautifulSoup
+        from bs4.element import Tag
+
         soup = BeautifulSoup(html, "html.parser")
         svg = soup.find("svg", id="svg-seatmap")
         if not isinstance(svg, Tag):
@@ -109,41 +134,47 @@ class SeatMapFetcher:
         return None
 
     def _fetch_with_browser(self, order_url: str) -> str:
+        from playwright.sync_api import sync_playwright
+
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 with sync_playwright() as playwright:
-                    browser = playwright.chromium.launch(
-                        headless=self._headless,
-                        args=self._browser_args,
-                        chromium_sandbox=self._chromium_sandbox,
-                    )
-                    context = browser.new_context(
-                        user_agent=(
-                            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                            "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-                        ),
-                        viewport={"width": 1920, "height": 1080},
-                    )
-                    page = context.new_page()
+                    with metrics.stage("browser_launch"):
+                        browser = playwright.chromium.launch(
+                            headless=self._headless,
+                            args=self._browser_args,
+                            chromium_sandbox=self._chromium_sandbox,
+                        )
+                        context = browser.new_context(
+                            user_agent=(
+                                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                                "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+                            ),
+                            viewport={"width": 1920, "height": 1080},
+                        )
+                        page = context.new_page()
                     logger.info(
                         "Loading seat map via Playwright (attempt %d/%d): %s",
                         attempt + 1,
                         max_retries,
                         order_url,
+                        extra={"attempt": attempt + 1},
                     )
                     try:
-                        page.goto(
-                            order_url,
-                            wait_until="domcontentloaded",
-                            timeout=self._navigation_timeout_ms,
-                        )
+                        with metrics.stage("navigation"):
+                            page.goto(
+                                order_url,
+                                wait_until="domcontentloaded",
+                                timeout=self._navigation_timeout_ms,
+                            )
                     except Exception as exc:
                         logger.warning(
                             "Navigation timeout, proceeding to poll for SVG anyway: %s", exc
                         )
                     self.last_presentation_date = self._extract_presentation_date(page)
-                    svg_html = self._poll_for_svg(page, timeout_ms=5000)
+                    with metrics.stage("svg_poll"):
+                        svg_html = self._poll_for_svg(page, timeout_ms=5000)
                     browser.close()
                     if svg_html:
                         return svg_html
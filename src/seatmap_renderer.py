@@ -1,19 +1,132 @@
 from __future__ import annotations
 
+import io
 import tempfile
-import uuid
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Tuple
-
-from PIL import Image, ImageDraw
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, cast
 
+from src import metrics
+from src.render_cache import RenderCache, RenderCacheStats
 from src.seat_map import Seat, SeatMap, SeatStatus
 from src.seat_selection import SeatBlockSuggestion
 
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+@dataclass(frozen=True)
+class RenderEncoding:
+    """How previews are encoded; previews use only ~8 colours, so a palette is lossless."""
+
+    format: str = "png"  # "png" or "webp"
+    palette: bool = False
+    compress_level: int = 6  # PNG zlib level, 0-9
+    optimize: bool = False  # PNG: extra pass for the smallest zlib stream
+    webp_lossless: bool = True
+    webp_quality: int = 80
+    webp_method: int = 4  # 0 (fast) - 6 (smallest)
+    max_dimension: Optional[int] = None  # downscale so no side exceeds this
+
+    PRESETS = ("png", "png-palette", "png-optimized", "webp")
+
+    @classmethod
+    def preset(cls, name: str, *, max_dimension: Optional[int] = None) -> "RenderEncoding":
+        key = name.strip().lower()
+        presets = {
+            "png": cls(),
+            "png-palette": cls(palette=True),
+            "png-optimized": cls(palette=True, compress_level=9, optimize=True),
+            "webp": cls(format="webp"),
+        }
+        if key not in presets:
+            raise ValueError(f"Unknown render encoding: {name} (expected one of {cls.PRESETS})")
+        encoding = presets[key]
+        if max_dimension:
+            encoding = replace(encoding, max_dimension=max_dimension)
+        return encoding
+
+    @property
+    def suffix(self) -> str:
+        return f".{self.format}"
+
+    @property
+    def variant(self) -> str:
+        """Cache-key component; differs whenever the encoded bytes would."""
+        return (
+            f"{self.format}:p{int(self.palette)}:c{self.compress_level}:o{int(self.optimize)}"
+            f":l{int(self.webp_lossless)}:q{self.webp_quality}:m{self.webp_method}"
+            f":d{self.max_dimension or 0}"
+        )
+
+    def encode(self, image: Image.Image) -> bytes:
+        from PIL import Image
+
+        source = image
+        if self.max_dimension and max(image.size) > self.max_dimension:
+            image = image.copy()
+            image.thumbnail((self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS)
+            # Resampling blends neighbouring colours; snapping back to the flat
+            # source colours keeps the result as compressible as the original.
+            image = _snap_to_colors(image, source)
+        if self.palette and image.mode != "P":
+            image = image.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
+        buffer = io.BytesIO()
+        if self.format == "webp":
+            image.save(
+                buffer,
+                format="WEBP",
+                lossless=self.webp_lossless,
+                quality=self.webp_quality,
+                method=self.webp_method,
+            )
+        else:
+            image.save(
+                buffer, format="PNG", compress_level=self.compress_level, optimize=self.optimize
+            )
+        return buffer.getvalue()
+
+
+def _snap_to_colors(image: Image.Image, source: Image.Image) -> Image.Image:
+    from PIL import Image
+
+    colors = source.convert("RGB").getcolors(maxcolors=256)
+    if colors is None:
+        return image
+    palette = Image.new("P", (1, 1))
+    flat = [channel for _count, rgb in colors for channel in cast(Tuple[int, ...], rgb)]
+    palette.putpalette(flat + flat[:3] * (256 - len(colors)))
+    return image.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+
 
 class SeatMapRenderer:
-    """Render SeatMap data into PNG previews highlighting recommended seats."""
+    """Render SeatMap data into image previews highlighting recommended seats.
+
+    `render` writes an image file and returns its path (handy for debugging);
+    `render_bytes` returns the encoded image without touching the filesystem unless
+    `archive` is enabled, in which case a copy is also written to `output_dir`.
+    Files in `output_dir` are managed by a content-addressed `RenderCache`, so
+    identical previews are reused and the directory stays bounded. Pass `cache`
+    to also serve `render_bytes` from a cache. Otherwise, without `archive`, the
+    last `bytes_cache_size` encoded previews are kept in memory, so the alert path
+    never touches the disk. `encoding` selects the image format and compression
+    (see `RenderEncoding`).
+
+    The seat layer without highlights is drawn once per (layout fingerprint,
+    status vector) and kept in a small LRU cache; each suggestion copies it and
+    repaints only its highlighted seats.
+
+    With `painter="array"` (default) the seat layer is built from whole-image
+    operations instead of one `draw.rectangle` per seat: seat statuses are
+    scattered into a one-pixel-per-seat index image, stretched to seat pitch and
+    combined with a precomputed tile mask, then mapped to colours through a
+    palette. The output is pixel-identical to `painter="draw"`, which is used
+    automatically when seats touch or overlap (`seat_gap < 1`).
+    """
+
+    PAINTERS = ("array", "draw")
 
     AVAILABLE_COLOR = "#4CAF50"
     OCCUPIED_COLOR = "#7A7A7A"
@@ -31,15 +144,35 @@ class SeatMapRenderer:
         seat_size: int = 26,
         seat_gap: int = 6,
         margin: int = 20,
+        archive: bool = False,
+        base_cache_size: int = 16,
+        bytes_cache_size: int = 32,
+        cache: Optional[RenderCache] = None,
+        encoding: Optional[RenderEncoding] = None,
+        painter: str = "array",
     ) -> None:
+        if painter not in self.PAINTERS:
+            raise ValueError(f"Unknown painter: {painter} (expected one of {self.PAINTERS})")
+        self.painter = painter
         self.seat_size = seat_size
         self.seat_gap = seat_gap
         self.margin = margin
+        self.archive = archive
         base_dir = (
             Path(output_dir) if output_dir else Path(tempfile.gettempdir()) / "cinema-monitor"
         )
         self.output_dir = base_dir / "renders"
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        self.encoding = encoding or RenderEncoding()
+        self._output_cache: Optional[RenderCache] = cache
+        self.base_cache_size = base_cache_size
+        self._base_cache: "OrderedDict[Tuple[str, str], Image.Image]" = OrderedDict()
+        self._base_lock = threading.Lock()
+        self.bytes_cache_size = bytes_cache_size
+        self._bytes_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes_lock = threading.Lock()
+        self.base_hits = 0
+        self.base_misses = 0
 
         self._status_colors = {
             SeatStatus.AVAILABLE: self.AVAILABLE_COLOR,
@@ -47,35 +180,246 @@ class SeatMapRenderer:
             SeatStatus.WHEELCHAIR: self.WHEELCHAIR_COLOR,
             SeatStatus.UNKNOWN: self.UNKNOWN_COLOR,
         }
+        self._tile_runs: Optional[List[Tuple[int, int, bytes]]] = None
+        self._palette: Optional[Tuple[Dict[SeatStatus, int], List[int]]] = None
+
+    @property
+    def output_cache(self) -> RenderCache:
+        """Cache that manages `output_dir`; created on first use."""
+        with self._base_lock:
+            if self._output_cache is None:
+                self._output_cache = RenderCache(self.output_dir)
+            return self._output_cache
+
+    def cache_stats(self) -> Optional[RenderCacheStats]:
+        """Stats of the output cache, or ``None`` while it has not been created."""
+        cache = self._output_cache
+        return cache.stats() if cache is not None else None
 
     def render(self, seat_map: SeatMap, suggestion: SeatBlockSuggestion) -> str:
         """Render the given seat map, highlighting seats inside suggestion."""
+        cache = self.output_cache
+        key = RenderCache.key_for(seat_map, [suggestion], self.encoding.variant)
+        path = cache.get_path(key)
+        if path is None:
+            path = cache.put(
+                key,
+                self._encode(self.render_image(seat_map, suggestion)),
+                suffix=self.encoding.suffix,
+            )
+        return str(path)
+
+    def render_bytes(self, seat_map: SeatMap, suggestion: SeatBlockSuggestion) -> bytes:
+        """Render to in-memory image bytes (also archived to `output_dir` when enabled)."""
+        return self._render_encoded(seat_map, [suggestion])
+
+    def render_composite_bytes(
+        self, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion]
+    ) -> bytes:
+        """One preview highlighting every suggestion of a screening."""
+        return self._render_encoded(seat_map, suggestions)
+
+    def cached_bytes(
+        self, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion]
+    ) -> Optional[bytes]:
+        """Encoded preview from the disk or in-memory cache, or ``None`` on a miss."""
+        key = RenderCache.key_for(seat_map, suggestions, self.encoding.variant)
+        disk = self._disk_cache()
+        if disk is not None:
+            return disk.get(key)
+        with self._bytes_lock:
+            data = self._bytes_cache.get(key)
+            if data is not None:
+                self._bytes_cache.move_to_end(key)
+            return data
+
+    def store_bytes(
+        self, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion], data: bytes
+    ) -> None:
+        """Remember an encoded preview (rendered here or by a render worker)."""
+        key = RenderCache.key_for(seat_map, suggestions, self.encoding.variant)
+        disk = self._disk_cache()
+        if disk is not None:
+            disk.put(key, data, suffix=self.encoding.suffix)
+            return
+        if self.bytes_cache_size <= 0:
+            return
+        with self._bytes_lock:
+            self._bytes_cache[key] = data
+            self._bytes_cache.move_to_end(key)
+            while len(self._bytes_cache) > self.bytes_cache_size:
+                self._bytes_cache.popitem(last=False)
+
+    def _disk_cache(self) -> Optional[RenderCache]:
+        if self.cache is None and self.archive:
+            return self.output_cache
+        return self.cache
+
+    def _render_encoded(
+        self, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion]
+    ) -> bytes:
+        data = self.cached_bytes(seat_map, suggestions)
+        if data is None:
+            data = self._encode(self.render_composite_image(seat_map, suggestions))
+            self.store_bytes(seat_map, suggestions, data)
+        return data
+
+    def render_image(self, seat_map: SeatMap, suggestion: SeatBlockSuggestion) -> Image.Image:
+        return self.render_composite_image(seat_map, [suggestion])
+
+    def render_composite_image(
+        self, seat_map: SeatMap, suggestions: Sequence[SeatBlockSuggestion]
+    ) -> Image.Image:
+        from PIL import ImageDraw
+
+        with metrics.stage("render"):
+            image = self._base_image(seat_map).copy()
+            draw = ImageDraw.Draw(image)
+            for suggestion in suggestions:
+                row = seat_map.rows.get(suggestion.row_number)
+                if row is None:
+                    continue
+                seat_numbers = set(suggestion.seat_numbers)
+                for seat in row.seats:
+                    if seat.seat_number in seat_numbers:
+                        draw.rectangle(
+                            self._seat_box(seat_map, seat),
+                            fill=self.RECOMMENDED_COLOR,
+                            outline=self.RECOMMENDED_BORDER,
+                            width=2,
+                        )
+        return image
+
+    def _base_image(self, seat_map: SeatMap) -> Image.Image:
+        """Seat layer without highlights; treat the returned image as read-only."""
         if not seat_map.seats:
             raise ValueError("Cannot render seat map without seats.")
 
+        key = (seat_map.layout_fingerprint(), seat_map.status_vector())
+        with self._base_lock:
+            cached = self._base_cache.get(key)
+            if cached is not None:
+                self._base_cache.move_to_end(key)
+                self.base_hits += 1
+                return cached
+            self.base_misses += 1
+
         width = self._dimension(seat_map.min_grid_x, seat_map.max_grid_x)
         height = self._dimension(seat_map.min_grid_row, seat_map.max_grid_row)
 
-        image = Image.new("RGB", (width, height), self.BACKGROUND_COLOR)
-        draw = ImageDraw.Draw(image)
+        if self.painter == "array" and self.seat_gap >= 1:
+            image = self._paint_array(seat_map, width, height)
+        else:
+            image = self._paint_draw(seat_map, width, height)
+
+        with self._base_lock:
+            self._base_cache[key] = image
+            while len(self._base_cache) > max(self.base_cache_size, 0):
+                self._base_cache.popitem(last=False)
+        return image
 
-        highlighted = {(suggestion.row_number, seat_num) for seat_num in suggestion.seat_numbers}
+    def _paint_draw(self, seat_map: SeatMap, width: int, height: int) -> Image.Image:
+        from PIL import Image, ImageDraw
 
+        image = Image.new("RGB", (width, height), self.BACKGROUND_COLOR)
+        draw = ImageDraw.Draw(image)
         for seat in seat_map.seats:
             box = self._seat_box(seat_map, seat)
             fill = self._status_colors.get(seat.status, self.UNKNOWN_COLOR)
-            outline = self.BORDER_COLOR
+            draw.rectangle(box, fill=fill, outline=self.BORDER_COLOR, width=2)
+        return image
+
+    def _paint_array(self, seat_map: SeatMap, width: int, height: int) -> Image.Image:
+        from PIL import Image, ImageChops
+
+        status_codes, seat_palette = self._seat_palette()
+        pitch = self.seat_size + self.seat_gap
+        cols = seat_map.max_grid_x - seat_map.min_grid_x + 1
+        rows = seat_map.max_grid_row - seat_map.min_grid_row + 1
+        grid_width = cols * pitch
+
+        # One byte per grid cell: 0 for no seat, else the seat's palette base index.
+        # Later seats overwrite earlier ones in the same cell, like repeated draws.
+        cells = bytearray(cols * rows)
+        for seat in seat_map.seats:
+            col = seat.grid_x - seat_map.min_grid_x
+            row = seat.grid_row - seat_map.min_grid_row
+            cells[row * cols + col] = status_codes.get(
+                seat.status, status_codes[SeatStatus.UNKNOWN]
+            )
+        statuses = Image.frombytes("L", (cols, rows), bytes(cells)).resize(
+            (grid_width, rows), Image.Resampling.NEAREST
+        )
+
+        image = Image.new("RGB", (width, height), self.BACKGROUND_COLOR)
+        # A seat tile is a few runs of identical scanlines (border, interior,
+        # border); each run is painted for every row at once.
+        for y_offset, run_height, line in self._seat_tile_runs():
+            mask = Image.frombytes("L", (grid_width, rows), line * (cols * rows))
+            indexed = ImageChops.add(statuses, mask).convert("P")
+            indexed.putpalette(seat_palette)
+            band = indexed.convert("RGB")
+            if run_height > 1:
+                band = band.resize((grid_width, rows * run_height), Image.Resampling.NEAREST)
+            for row in range(rows):
+                image.paste(
+                    band.crop((0, row * run_height, grid_width, (row + 1) * run_height)),
+                    (self.margin, self.margin + row * pitch + y_offset),
+                )
+        return image
+
+    def _seat_tile_runs(self) -> List[Tuple[int, int, bytes]]:
+        """(y offset, height, mask scanline) runs of one seat tile, blank runs omitted.
+
+        The tile is drawn with the same `draw.rectangle` call as the draw painter,
+        with 0 for gap, 1 for border and 2 for fill pixels.
+        """
+        if self._tile_runs is None:
+            from PIL import Image, ImageDraw
+
+            pitch = self.seat_size + self.seat_gap
+            tile = Image.new("L", (pitch, pitch), 0)
+            ImageDraw.Draw(tile).rectangle(
+                (0, 0, self.seat_size, self.seat_size), fill=2, outline=1, width=2
+            )
+            data = tile.tobytes()
+            lines = [data[y * pitch : (y + 1) * pitch] for y in range(pitch)]
+            runs: List[Tuple[int, int, bytes]] = []
+            y = 0
+            while y < pitch:
+                run_height = 1
+                while y + run_height < pitch and lines[y + run_height] == lines[y]:
+                    run_height += 1
+                if any(lines[y]):
+                    runs.append((y, run_height, lines[y]))
+                y += run_height
+            self._tile_runs = runs
+        return self._tile_runs
+
+    def _seat_palette(self) -> Tuple[Dict[SeatStatus, int], List[int]]:
+        """Palette with index `3 * (n + 1) + part` for the n-th status and tile part."""
+        if self._palette is None:
+            self._palette = self._build_seat_palette()
+        return self._palette
 
-            if (seat.row_number, seat.seat_number) in highlighted:
-                fill = self.RECOMMENDED_COLOR
-                outline = self.RECOMMENDED_BORDER
+    def _build_seat_palette(self) -> Tuple[Dict[SeatStatus, int], List[int]]:
+        from PIL import ImageColor
 
-            draw.rectangle(box, fill=fill, outline=outline, width=2)
+        background = ImageColor.getrgb(self.BACKGROUND_COLOR)
+        border = ImageColor.getrgb(self.BORDER_COLOR)
+        colors = [background] * 256
+        codes: Dict[SeatStatus, int] = {}
+        for position, status in enumerate(SeatStatus, start=1):
+            codes[status] = 3 * position
+            colors[3 * position + 1] = border
+            colors[3 * position + 2] = ImageColor.getrgb(
+                self._status_colors.get(status, self.UNKNOWN_COLOR)
+            )
+        return codes, [channel for rgb in colors for channel in rgb[:3]]
 
-        filename = f"seatmap_{datetime.utcnow():%Y%m%d%H%M%S}_{uuid.uuid4().hex}.png"
-        output_path = self.output_dir / filename
-        image.save(output_path, format="PNG")
-        return str(output_path)
+    def _encode(self, image: Image.Image) -> bytes:
+        with metrics.stage("encode"):
+            return self.encoding.encode(image)
 
     def _dimension(self, min_value: int, max_value: int) -> int:
         span = max_value - min_value + 1
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+from src import metrics
+from src.seat_map import SeatMap, SeatMapParser
+from src.seatmap_fetcher import SeatMapFetcher, normalize_order_url
+
+logger = logging.getLogger(__name__)
+
+
+class SeatMapFetchResult:
+    """Outcome of one seat-map fetch shared by every caller of the same order URL.
+
+    The markup is parsed on first access to `seat_map`, once for all callers, so
+    a caller can check `presentation_date` before the parse (or its failure).
+    """
+
+    def __init__(
+        self,
+        order_url: str,
+        svg_markup: str,
+        presentation_date: Optional[date] = None,
+        *,
+        parser: SeatMapParser,
+    ):
+        self.order_url = order_url
+        self.svg_markup = svg_markup
+        self.presentation_date = presentation_date
+        self._parser = parser
+        self._seat_map: Optional[SeatMap] = None
+        self._parse_lock = threading.Lock()
+
+    @property
+    def seat_map(self) -> SeatMap:
+        with self._parse_lock:
+            if self._seat_map is None:
+                with metrics.stage("parse"):
+                    self._seat_map = self._parser.parse(self.svg_markup)
+            return self._seat_map
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[SeatMapFetchResult] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightSeatMapFetcher:
+    """Coalesce concurrent fetches of the same order URL into a single request.
+
+    Callers are keyed by `normalize_order_url`. The first caller performs the
+    fetch; callers arriving while it is in flight wait for its result. The seat
+    map is parsed lazily, once, by whichever caller first needs it.
+    Successful results stay fresh for `freshness_seconds`, so near-simultaneous
+    callers (overlapping watch targets, retries, several party sizes) reuse the
+    parsed `SeatMap` as well. Failures are shared with waiters but never cached.
+    Expired results are pruned whenever a new one is stored, and at most
+    `max_entries` are kept (oldest evicted first).
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[SeatMapFetcher] = None,
+        *,
+        parser: Optional[SeatMapParser] = None,
+        freshness_seconds: float = 30.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fetcher = fetcher or SeatMapFetcher()
+        self.parser = parser or SeatMapParser()
+        self.freshness_seconds = max(freshness_seconds, 0.0)
+        self.max_entries = max(max_entries, 1)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}
+        # Insertion ordered, and so also by expiry (the freshness window is fixed).
+        self._fresh: Dict[str, Tuple[float, SeatMapFetchResult]] = {}
+        self.last_presentation_date: Optional[date] = None
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, order_url: str) -> SeatMapFetchResult:
+        """Return the fetched seat map for `order_url` (parsed on first use)."""
+        key = normalize_order_url(order_url)
+        with self._lock:
+            cached = self._fresh.get(key)
+            if cached is not None:
+                expires_at, result = cached
+                if self._clock() < expires_at:
+                    self.hits += 1
+                    return result
+                del self._fresh[key]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            logger.debug("Joining in-flight seat map fetch for %s", key)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            assert flight.result is not None
+            return flight.result
+
+        try:
+            flight.result = self._load(key)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if flight.result is not None and self.freshness_seconds > 0:
+                    self._store(key, flight.result)
+            flight.done.set()
+        return flight.result
+
+    def fetch_svg(self, order_url: str) -> str:
+        """Drop-in replacement for `SeatMapFetcher.fetch_svg`."""
+        result = self.fetch(order_url)
+        self.last_presentation_date = result.presentation_date
+        return result.svg_markup
+
+    def invalidate(self, order_url: Optional[str] = None) -> None:
+        """Forget cached results for one order URL, or all of them."""
+        with self._lock:
+            if order_url is None:
+                self._fresh.clear()
+            else:
+                self._fresh.pop(normalize_order_url(order_url), None)
+
+    def _store(self, key: str, result: SeatMapFetchResult) -> None:
+        now = self._clock()
+        self._fresh.pop(key, None)
+        for stale_key, (expires_at, _result) in list(self._fresh.items()):
+            if expires_at > now and len(self._fresh) < self.max_entries:
+                break
+            del self._fresh[stale_key]
+        self._fresh[key] = (now + self.freshness_seconds, result)
+
+    def _load(self, key: str) -> SeatMapFetchResult:
+        fetch_with_date = getattr(self.fetcher, "fetch_svg_with_date", None)
+        if fetch_with_date is not None:
+            svg_markup, presentation_date = fetch_with_date(key)
+        else:
+            svg_markup = self.fetcher.fetch_svg(key)
+            presentation_date = getattr(self.fetcher, "last_presentation_date", None)
+        return SeatMapFetchResult(key, svg_markup, presentation_date, parser=self.parser)
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS screenings (
+    key TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    screening_date TEXT NOT NULL,
+    show_time TEXT NOT NULL,
+    label TEXT NOT NULL,
+    order_url TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seat_snapshots (
+    key TEXT PRIMARY KEY,
+    layout_fingerprint TEXT NOT NULL,
+    status_vector TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    show_at REAL NOT NULL,
+    next_check REAL NOT NULL,
+    change_rate REAL NOT NULL DEFAULT 0,
+    has_block INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS layout_fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    seat_count INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    alert_key TEXT PRIMARY KEY,
+    screening_key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    score REAL NOT NULL,
+    status_hash TEXT NOT NULL,
+    first_sent REAL NOT NULL,
+    last_sent REAL NOT NULL,
+    times_sent INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS alerts_screening_idx ON alerts (screening_key);
+"""
+
+
+@dataclass(frozen=True)
+class SeatSnapshot:
+    """Latest observed seat statuses (and polling state) for one screening."""
+
+    key: str
+    layout_fingerprint: str
+    status_vector: str
+    captured_at: float
+    show_at: float
+    next_check: float
+    change_rate: float = 0.0
+    has_block: bool = False
+
+
+@dataclass(frozen=True)
+class AlertRecord:
+    """Ledger entry for an alert that was sent."""
+
+    alert_key: str
+    screening_key: str
+    content_hash: str
+    score: float
+    status_hash: str
+    first_sent: float
+    last_sent: float
+    times_sent: int = 1
+
+
+class StateStore:
+    """Embedded SQLite (WAL) store for state that must survive between runs.
+
+    Holds discovered screenings, the latest seat-status snapshot per screening,
+    known hall layouts, sent alerts and small key/value entries such as the
+    latest screening date. Inside `batch()` writes are buffered and committed in
+    a single transaction when the outermost batch exits; outside a batch every
+    write commits immediately. Reads go to the database, so writes buffered in
+    an open batch are not visible to them yet.
+    """
+
+    def __init__(self, path: str | Path, *, clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._pending: List[Tuple[str, Sequence[Any]]] = []
+        self._batch_depth = 0
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # -- batching -----------------------------------------------------------------
+
+    @contextmanager
+    def batch(self) -> Iterator["StateStore"]:
+        """Buffer writes and commit them together when the outermost batch exits."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                self._conn.execute("BEGIN")
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as exc:
+                self._conn.execute("ROLLBACK")
+                logger.warning("Failed to persist %d state write(s): %s", len(pending), exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def _write(self, sql: str, params: Sequence[Any]) -> None:
+        with self._lock:
+            self._pending.append((sql, params))
+            if self._batch_depth == 0:
+                self.flush()
+
+    def _query_one(self, sql: str, params: Sequence[Any]) -> Optional[Tuple[Any, ...]]:
+        with self._lock:
+            row: Optional[Tuple[Any, ...]] = self._conn.execute(sql, params).fetchone()
+            return row
+
+    # -- key/value ----------------------------------------------------------------
+
+    def get_value(self, key: str) -> Optional[str]:
+        row = self._query_one("SELECT value FROM kv WHERE key = ?", (key,))
+        return str(row[0]) if row else None
+
+    def set_value(self, key: str, value: str) -> None:
+        self._write(
+            "INSERT INTO kv (key, value, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+            "updated_at = excluded.updated_at",
+            (key, value, self._clock()),
+        )
+
+    def get_date(self, key: str) -> Optional[date]:
+        value = self.get_value(key)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+
+    def set_date(self, key: str, value: date) -> None:
+        self.set_value(key, value.isoformat())
+
+    # -- screenings / snapshots / layouts -------------------------------------------
+
+    def record_screening(
+        self,
+        key: str,
+        *,
+        target: str,
+        screening_date: date,
+        show_time: str,
+        label: str,
+        order_url: str,
+    ) -> None:
+        now = self._clock()
+        self._write(
+            "INSERT INTO screenings "
+            "(key, target, screening_date, show_time, label, order_url, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen, "
+            "label = excluded.label",
+            (key, target, screening_date.isoformat(), show_time, label, order_url, now, now),
+        )
+
+    def load_snapshot(self, key: str) -> Optional[SeatSnapshot]:
+        row = self._query_one(
+            "SELECT key, layout_fingerprint, status_vector, captured_at, show_at, next_check, "
+            "change_rate, has_block FROM seat_snapshots WHERE key = ?",
+            (key,),
+        )
+        if row is None:
+            return None
+        return SeatSnapshot(
+            key=row[0],
+            layout_fingerprint=row[1],
+            status_vector=row[2],
+            captured_at=row[3],
+            show_at=row[4],
+            next_check=row[5],
+            change_rate=row[6],
+            has_block=bool(row[7]),
+        )
+
+    def save_snapshot(self, snapshot: SeatSnapshot) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO seat_snapshots "
+            "(key, layout_fingerprint, status_vector, captured_at, show_at, next_check, "
+            "change_rate, has_block) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                snapshot.key,
+                snapshot.layout_fingerprint,
+                snapshot.status_vector,
+                snapshot.captured_at,
+                snapshot.show_at,
+                snapshot.next_check,
+                snapshot.change_rate,
+                int(snapshot.has_block),
+            ),
+        )
+
+    def record_layout(self, fingerprint: str, seat_count: int) -> None:
+        now = self._clock()
+        self._write(
+            "INSERT INTO layout_fingerprints (fingerprint, seat_count, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(fingerprint) DO UPDATE SET last_seen = excluded.last_seen",
+            (fingerprint, seat_count, now, now),
+        )
+
+    def known_layout(self, fingerprint: str) -> bool:
+        row = self._query_one(
+            "SELECT 1 FROM layout_fingerprints WHERE fingerprint = ?", (fingerprint,)
+        )
+        return row is not None
+
+    # -- alerts -------------------------------------------------------------------
+
+    def load_alert(self, alert_key: str) -> Optional[AlertRecord]:
+        row = self._query_one(
+            "SELECT alert_key, screening_key, content_hash, score, status_hash, first_sent, "
+            "last_sent, times_sent FROM alerts WHERE alert_key = ?",
+            (alert_key,),
+        )
+        if row is None:
+            return None
+        return AlertRecord(*row)
+
+    def best_alert_score(self, screening_key: str) -> Optional[float]:
+        row = self._query_one(
+            "SELECT MAX(score) FROM alerts WHERE screening_key = ?", (screening_key,)
+        )
+        return float(row[0]) if row and row[0] is not None else None
+
+    def save_alert(self, record: AlertRecord) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO alerts "
+            "(alert_key, screening_key, content_hash, score, status_hash, first_sent, "
+            "last_sent, times_sent) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record.alert_key,
+                record.screening_key,
+                record.content_hash,
+                record.score,
+                record.status_hash,
+                record.first_sent,
+                record.last_sent,
+                record.times_sent,
+            ),
+        )
+
+    # -- maintenance --------------------------------------------------------------
+
+    def prune(self, older_than_seconds: float) -> None:
+        """Drop screenings, snapshots and alerts not touched within the window."""
+        cutoff = self._clock() - older_than_seconds
+        self._write("DELETE FROM screenings WHERE last_seen < ?", (cutoff,))
+        self._write("DELETE FROM seat_snapshots WHERE captured_at < ?", (cutoff,))
+        self._write("DELETE FROM alerts WHERE last_sent < ?", (cutoff,))
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config import AppConfig
+
+
+class WatchlistError(ValueError):
+    """Raised when a watchlist definition cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class WatchTarget:
+    """One movie/city/format combination to monitor.
+
+    Fields left as ``None`` inherit the value from the base `AppConfig`; the
+    party size, `top_n` and `min_score` overrides fall back to `SchedulerConfig`.
+    """
+
+    movie_name_slug: str
+    movie_id: str
+    city: Optional[str] = None
+    film_format: Optional[str] = None
+    party_size: Optional[int] = None
+    top_n: Optional[int] = None
+    min_score: Optional[float] = None
+
+    @property
+    def key(self) -> str:
+        parts = [self.movie_name_slug, self.movie_id, self.city or "", self.film_format or ""]
+        return ":".join(parts)
+
+    def apply(self, base: AppConfig) -> AppConfig:
+        """Return a copy of `base` describing this target."""
+        return replace(
+            base,
+            movie_name_slug=self.movie_name_slug,
+            movie_id=self.movie_id,
+            city=self.city or base.city,
+            film_format=self.film_format or base.film_format,
+        )
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> "WatchTarget":
+        return cls(
+            movie_name_slug=config.movie_name_slug,
+            movie_id=config.movie_id,
+            city=config.city,
+            film_format=config.film_format,
+        )
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "WatchTarget":
+        """Parse a ``slug:movie_id[:city[:format]]`` entry."""
+        parts = [part.strip() for part in spec.split(":")]
+        if len(parts) < 2 or len(parts) > 4 or not parts[0] or not parts[1]:
+            raise WatchlistError(f"Invalid watch target: {spec!r}")
+        city = parts[2] if len(parts) > 2 and parts[2] else None
+        film_format = parts[3] if len(parts) > 3 and parts[3] else None
+        return cls(movie_name_slug=parts[0], movie_id=parts[1], city=city, film_format=film_format)
+
+    @classmethod
+    def from_mapping(cls, data: Dict[str, Any]) -> "WatchTarget":
+        try:
+            slug = str(data["movie_name_slug"])
+            movie_id = str(data["movie_id"])
+        except KeyError as exc:
+            raise WatchlistError(f"Watch target missing field {exc.args[0]!r}") from exc
+        city = data.get("city")
+        film_format = data.get("film_format")
+        try:
+            party_size = _optional(data, "party_size", int)
+            top_n = _optional(data, "top_n", int)
+            min_score = _optional(data, "min_score", float)
+        except (TypeError, ValueError) as exc:
+            raise WatchlistError(f"Invalid watch target {slug}:{movie_id}: {exc}") from exc
+        return cls(
+            movie_name_slug=slug,
+            movie_id=movie_id,
+            city=str(city) if city else None,
+            film_format=str(film_format) if film_format else None,
+            party_size=party_size,
+            top_n=top_n,
+            min_score=min_score,
+        )
+
+    def overrides(self) -> Dict[str, Any]:
+        """`SchedulerConfig` fields this target overrides."""
+        values = {"party_size": self.party_size, "top_n": self.top_n, "min_score": self.min_score}
+        return {name: value for name, value in values.items() if value is not None}
+
+
+def _optional(data: Dict[str, Any], name: str, kind: Any) -> Any:
+    value = data.get(name)
+    return None if value is None else kind(value)
+
+
+@dataclass(frozen=True)
+class Watchlist:
+    """Ordered, de-duplicated set of targets processed by one scheduler."""
+
+    targets: Tuple[WatchTarget, ...]
+
+    def __post_init__(self) -> None:
+        if not self.targets:
+            raise WatchlistError("Watchlist must contain at least one target.")
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def of(cls, targets: Iterable[WatchTarget]) -> "Watchlist":
+        unique: Dict[str, WatchTarget] = {}
+        for target in targets:
+            unique.setdefault(target.key, target)
+        return cls(targets=tuple(unique.values()))
+
+    @classmethod
+    def from_app_config(cls, config: AppConfig) -> "Watchlist":
+        return cls(targets=(WatchTarget.from_app_config(config),))
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "Watchlist":
+        """Load targets from a JSON, TOML or YAML file (see `WatchlistFile`)."""
+        return WatchlistFile.load(path).watchlist
+
+    @classmethod
+    def from_env(cls, config: AppConfig) -> "Watchlist":
+        """Build the watchlist from ``WATCHLIST_FILE`` or ``WATCHLIST``.
+
+        Falls back to the single movie described by `config` when neither is set.
+        """
+        file_path = os.getenv("WATCHLIST_FILE")
+        if file_path and file_path.strip():
+            return cls.from_file(file_path.strip())
+        raw = os.getenv("WATCHLIST")
+        if raw and raw.strip():
+            specs = [part for part in raw.split(",") if part.strip()]
+            return cls.of(WatchTarget.from_spec(spec) for spec in specs)
+        return cls.from_app_config(config)
+
+    def configs(self, base: AppConfig) -> List[Tuple[WatchTarget, AppConfig]]:
+        """Pair each target with its derived `AppConfig`."""
+        return [(target, target.apply(base)) for target in self.targets]
+
+
+@dataclass(frozen=True)
+class WatchlistFile:
+    """Contents of a watchlist config file: targets plus scheduler settings.
+
+    The format follows the suffix (``.toml``, ``.yaml``/``.yml``, anything else
+    is JSON). The file is either a list of targets or a mapping with a
+    ``targets`` list and an optional ``scheduler`` table whose keys are
+    `SchedulerConfig` fields (thresholds, polling policy, ...). Targets are
+    ``slug:movie_id[:city[:format]]`` strings or mappings with the
+    `WatchTarget` fields.
+    """
+
+    watchlist: Watchlist
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "WatchlistFile":
+        data = _read_config_file(Path(path))
+        entries = data.get("targets") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise WatchlistError(f"Watchlist file {path} must define a list of targets.")
+        settings = data.get("scheduler", {}) if isinstance(data, dict) else {}
+        if not isinstance(settings, dict):
+            raise WatchlistError(f"Watchlist file {path}: 'scheduler' must be a table.")
+        targets: List[WatchTarget] = []
+        for entry in entries:
+            if isinstance(entry, str):
+                targets.append(WatchTarget.from_spec(entry))
+            elif isinstance(entry, dict):
+                targets.append(WatchTarget.from_mapping(entry))
+            else:
+                raise WatchlistError(f"Unsupported watch target entry: {entry!r}")
+        return cls(watchlist=Watchlist.of(targets), settings=dict(settings))
+
+
+def _read_config_file(path: Path) -> Any:
+    suffix = path.suffix.lower()
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise WatchlistError(f"Failed to read watchlist file {path}: {exc}") from exc
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10
+            try:
+                import tomli as tomllib
+            except ImportError as exc:
+                raise WatchlistError("Reading TOML on Python 3.10 requires `tomli`.") from exc
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError as exc:
+            raise WatchlistError(f"Failed to parse watchlist file {path}: {exc}") from exc
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise WatchlistError(
+                "Reading YAML watchlist files requires `PyYAML` (the `yaml` extra)."
+            ) from exc
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise WatchlistError(f"Failed to parse watchlist file {path}: {exc}") from exc
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise WatchlistError(f"Failed to parse watchlist file {path}: {exc}") from exc
@@ -1,11 +1,11 @@
-from datetime import date
+from datetime import date, time
 from pathlib import Path
 
 import httpx
 
 from src.advisor import SeatAdvisor
 from src.config import AppConfig
-from src.screenings import ScreeningDiscovery
+from src.screenings import ScreeningDescriptor, ScreeningDiscovery
 from src.seat_map import SeatMapParser
 from src.seatmap_fetcher import SeatMapFetcher
 
@@ -47,3 +47,103 @@ def test_advisor_returns_recommendations_for_party_size_two():
         )
         assert recommendation.seat_map.seats
         assert recommendation.presentation_date is None
+
+
+def test_evaluate_screening_keeps_no_state_on_the_advisor():
+    seatmap_html = load_fixture("seatmap_page.html")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=seatmap_html))
+    advisor = SeatAdvisor(
+        fetcher=SeatMapFetcher(transport=transport, enable_browser_fallback=False),
+        parser=SeatMapParser(),
+    )
+    screening = ScreeningDescriptor(
+        label="19:30",
+        show_time=time(19, 30),
+        order_url="https://tickets.example.com/order/1",
+    )
+
+    for _ in range(3):
+        recommendation = advisor.evaluate_screening(date(2025, 1, 6), screening, party_size=2)
+        assert recommendation is not None and recommendation.suggestions
+
+    assert advisor.last_observations == []
+    assert advisor.last_screening_dates == set()
+
+
+class RecordingBrowserDiscovery:
+    def __init__(self, screenings):
+        self.screenings = screenings
+        self.calls = []
+
+    def discover_many(self, config, dates):
+        self.calls.append(list(dates))
+        return {day: list(self.screenings) for day in dates}
+
+
+def test_recommend_discovers_all_dates_with_one_page_load():
+    movie_html = load_fixture("movie_page.html")
+    seatmap_html = load_fixture("seatmap_page.html")
+    movie_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "films" in request.url.path:
+            movie_requests.append(request.url)
+            return httpx.Response(200, text=movie_html)
+        return httpx.Response(200, text=seatmap_html)
+
+    transport = httpx.MockTransport(handler)
+    browser = RecordingBrowserDiscovery([])
+    advisor = SeatAdvisor(
+        discovery=ScreeningDiscovery(transport=transport),
+        fetcher=SeatMapFetcher(transport=transport, enable_browser_fallback=False),
+        browser_discovery=browser,
+    )
+    dates = [date(2025, 1, 6), date(2025, 1, 7), date(2025, 1, 8)]
+
+    results = advisor.recommend(AppConfig(date="2025-01-06"), party_size=2, top_n=1, dates=dates)
+
+    assert len(movie_requests) == 1
+    assert browser.calls == []
+    assert {result.screening_date for result in results} == set(dates)
+
+
+def test_dates_without_http_results_share_one_browser_session():
+    class EmptyDiscovery:
+        def discover_many(self, config, dates):
+            return {day: [] for day in dates}
+
+    screening = ScreeningDescriptor(label="19:30", show_time=time(19, 30), order_url="u")
+    browser = RecordingBrowserDiscovery([screening])
+    advisor = SeatAdvisor(discovery=EmptyDiscovery(), browser_discovery=browser)
+    dates = [date(2025, 1, 6), date(2025, 1, 7)]
+
+    assert advisor.discover_dates(AppConfig(), dates) == {day: [screening] for day in dates}
+    assert browser.calls == [dates]
+
+
+def test_wrong_date_page_is_skipped_before_the_seat_map_is_parsed(caplog):
+    class WrongDateFetcher:
+        def fetch_svg_with_date(self, order_url):
+            return "<svg>not a seat map</svg>", date(2025, 1, 7)
+
+    class FailingParser:
+        calls = 0
+
+        def parse(self, svg_markup):
+            FailingParser.calls += 1
+            raise ValueError("unparseable")
+
+    advisor = SeatAdvisor(fetcher=WrongDateFetcher(), parser=FailingParser())
+    screening = ScreeningDescriptor(
+        label="19:30",
+        show_time=time(19, 30),
+        order_url="https://tickets.example.com/order/1",
+    )
+
+    result = advisor._evaluate_screening(
+        date(2025, 1, 6), screening, party_size=2, top_n=1, include_wheelchair=False
+    )
+
+    assert result == (None, date(2025, 1, 7))
+    assert FailingParser.calls == 0
+    assert "seat map error" not in caplog.text
@@ -0,0 +1,91 @@
+from src.alert_ledger import AlertLedger, AlertLedgerConfig, RealertMode
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.state_store import StateStore
+
+
+def _seat_map(occupied=()):
+    return SeatMap.from_seats(
+        Seat(
+            row_number=1,
+            seat_number=idx,
+            label=str(idx),
+            status=SeatStatus.OCCUPIED if idx in occupied else SeatStatus.AVAILABLE,
+            grid_x=idx,
+            grid_row=1,
+        )
+        for idx in range(1, 11)
+    )
+
+
+def _suggestion(seats, score=0.9):
+    return SeatBlockSuggestion(
+        row_number=1,
+        seat_numbers=list(seats),
+        labels=[str(seat) for seat in seats],
+        grid_positions=list(seats),
+        score=score,
+    )
+
+
+def _ledger(tmp_path, mode, clock=None, **kwargs):
+    clock = clock or {"now": 0.0}
+    store = StateStore(tmp_path / "state.sqlite3", clock=lambda: clock["now"])
+    config = AlertLedgerConfig(mode=mode, **kwargs)
+    return AlertLedger(store, config, clock=lambda: clock["now"])
+
+
+def test_cooldown_mode_repeats_only_after_cooldown(tmp_path):
+    clock = {"now": 0.0}
+    ledger = _ledger(tmp_path, RealertMode.COOLDOWN, clock, cooldown_seconds=60)
+    seat_map, suggestion = _seat_map(), _suggestion([5, 6])
+
+    assert ledger.should_send("s", suggestion, seat_map)
+    ledger.record_sent("s", suggestion, seat_map)
+    assert not ledger.should_send("s", suggestion, seat_map)
+
+    clock["now"] = 61
+    assert ledger.should_send("s", suggestion, seat_map)
+    assert ledger.suppressed == 1
+
+
+def test_status_change_mode_repeats_when_seats_change(tmp_path):
+    ledger = _ledger(tmp_path, RealertMode.STATUS_CHANGE)
+    suggestion = _suggestion([5, 6])
+    ledger.record_sent("s", suggestion, _seat_map())
+
+    assert not ledger.should_send("s", suggestion, _seat_map())
+    assert ledger.should_send("s", suggestion, _seat_map(occupied={1}))
+
+
+def test_improvement_mode_requires_a_better_seat_set(tmp_path):
+    ledger = _ledger(tmp_path, RealertMode.IMPROVEMENT, min_improvement=0.05)
+    seat_map = _seat_map()
+    ledger.record_sent("s", _suggestion([5, 6], score=0.8), seat_map)
+
+    assert not ledger.should_send("s", _suggestion([5, 6], score=0.8), seat_map)
+    assert not ledger.should_send("s", _suggestion([4, 5], score=0.82), seat_map)
+    assert ledger.should_send("s", _suggestion([3, 4], score=0.9), seat_map)
+    assert ledger.should_send("other", _suggestion([3, 4], score=0.5), seat_map)
+
+
+def test_ledger_persists_between_instances(tmp_path):
+    seat_map, suggestion = _seat_map(), _suggestion([5, 6])
+    first = _ledger(tmp_path, RealertMode.COOLDOWN)
+    first.record_sent("s", suggestion, seat_map)
+
+    second = _ledger(tmp_path, RealertMode.COOLDOWN)
+    assert not second.should_send("s", suggestion, seat_map)
+    assert RealertMode.parse("Status_Change") is RealertMode.STATUS_CHANGE
+
+
+def test_recent_alert_cache_is_bounded(tmp_path):
+    ledger = _ledger(tmp_path, RealertMode.COOLDOWN, cache_size=2)
+    seat_map = _seat_map()
+    for screening in ("a", "b", "c"):
+        ledger.record_sent(screening, _suggestion([5, 6]), seat_map)
+
+    assert len(ledger._recent) == 2
+    assert len(ledger._best_scores) == 2
+    # Evicted entries are still read back from the store.
+    assert not ledger.should_send("a", _suggestion([5, 6]), seat_map)
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+import time as time_module
+from datetime import date, time, timedelta
+
+from src.advisor import SeatRecommendation
+from src.config import AppConfig
+from src.daemon import DaemonConfig, MonitorDaemon
+from src.scheduler import MonitorScheduler, SchedulerConfig
+from src.screenings import ScreeningDescriptor
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.watchlist import Watchlist, WatchTarget
+
+
+def _screening(idx: int) -> ScreeningDescriptor:
+    return ScreeningDescriptor(
+        label=f"1{idx}:00",
+        show_time=time(10 + idx, 0),
+        order_url=f"https://tickets.example.com/order/{idx}",
+    )
+
+
+def _seat_map() -> SeatMap:
+    return SeatMap.from_seats(
+        Seat(
+            row_number=5,
+            seat_number=idx + 1,
+            label=str(idx + 1),
+            status=SeatStatus.AVAILABLE,
+            grid_x=idx,
+            grid_row=5,
+        )
+        for idx in range(12)
+    )
+
+
+class FakeAdvisor:
+    def __init__(self, screening_count=1, delay=0.0):
+        self.screenings = [_screening(idx) for idx in range(screening_count)]
+        self.delay = delay
+        self.evaluated = []
+        self.discovered = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def discover_screenings(self, config, screening_date):
+        with self._lock:
+            self.discovered.append(config.movie_name_slug)
+        return list(self.screenings)
+
+    def evaluate_screening(self, screening_date, screening, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time_module.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.evaluated.append(screening.order_url)
+        suggestion = SeatBlockSuggestion(
+            row_number=5, seat_numbers=[6, 7], labels=["6", "7"], grid_positions=[5, 6], score=0.9
+        )
+        return SeatRecommendation(
+            screening_date=screening_date,
+            screening=screening,
+            seat_map=_seat_map(),
+            suggestions=[suggestion],
+        )
+
+
+class FakeNotifier:
+    def __init__(self):
+        self.messages = []
+
+    def send_alert_sync(self, message, screenshot_path=None):
+        self.messages.append(message)
+
+
+def _daemon(advisor, notifier, tmp_path, watchlist=None, clock=time_module.time, **config):
+    scheduler = MonitorScheduler(
+        AppConfig(date=date.today().isoformat()),
+        advisor=advisor,
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+        watchlist=watchlist,
+    )
+    scheduler.renderer = None
+    return MonitorDaemon(scheduler, DaemonConfig(**config), clock=clock)
+
+
+async def _run_until(daemon, predicate, timeout=5.0):
+    task = asyncio.create_task(daemon.run())
+    deadline = time_module.monotonic() + timeout
+    while not predicate() and time_module.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    daemon.request_stop()
+    await asyncio.wait_for(task, timeout)
+
+
+def test_daemon_runs_discovery_then_screening_jobs(tmp_path):
+    advisor = FakeAdvisor(screening_count=2)
+    notifier = FakeNotifier()
+    daemon = _daemon(advisor, notifier, tmp_path)
+
+    asyncio.run(_run_until(daemon, lambda: daemon.completed_jobs >= 3))
+
+    assert sorted(advisor.evaluated) == [
+        "https://tickets.example.com/order/0",
+        "https://tickets.example.com/order/1",
+    ]
+    assert all("Seat Alert" in message for message in notifier.messages)
+    # Discovery and both screenings were rescheduled rather than re-run immediately.
+    assert daemon.pending_jobs == 3
+    status = daemon.status()
+    assert status["jobs_pending"] == 3
+    assert status["jobs_completed"] >= 3
+    assert status["watch_targets"] == 1
+    assert "last_success_timestamp_seconds" in status
+
+
+def test_daemon_caps_concurrent_jobs(tmp_path):
+    advisor = FakeAdvisor(screening_count=6, delay=0.05)
+    daemon = _daemon(advisor, FakeNotifier(), tmp_path, max_concurrent_jobs=2)
+
+    asyncio.run(_run_until(daemon, lambda: len(advisor.evaluated) >= 6))
+
+    assert len(advisor.evaluated) == 6
+    assert advisor.max_active == 2
+
+
+def test_stop_drains_in_flight_jobs(tmp_path):
+    advisor = FakeAdvisor(screening_count=1, delay=0.2)
+    notifier = FakeNotifier()
+    daemon = _daemon(advisor, notifier, tmp_path)
+
+    asyncio.run(_run_until(daemon, lambda: advisor.active == 1))
+
+    assert advisor.evaluated == ["https://tickets.example.com/order/0"]
+    assert daemon.running_jobs == 0
+
+
+def test_apply_watchlist_only_touches_changed_targets(tmp_path):
+    watchlist = Watchlist.of([WatchTarget.from_spec("avatar:1"), WatchTarget.from_spec("dune:2")])
+    daemon = _daemon(FakeAdvisor(), FakeNotifier(), tmp_path, watchlist=watchlist)
+    daemon._seed_discovery_jobs()
+    avatar_job = next(job for job in daemon._queue if job.target.movie_name_slug == "avatar")
+
+    daemon.apply_watchlist(
+        Watchlist.of(
+            [
+                WatchTarget(movie_name_slug="avatar", movie_id="1", party_size=4),
+                WatchTarget.from_spec("oppenheimer:3"),
+            ]
+        ),
+        SchedulerConfig(horizon_days=1),
+    )
+
+    jobs = {job.target.movie_name_slug: job for job in daemon._queue}
+    assert set(jobs) == {"avatar", "oppenheimer"}
+    # The changed target keeps its timer but carries the new overrides.
+    assert jobs["avatar"] is avatar_job
+    assert jobs["avatar"].target.party_size == 4
+    assert all("dune" not in key for key in daemon._scheduled)
+
+
+def test_daemon_reloads_watchlist_file_on_change(tmp_path):
+    path = tmp_path / "watchlist.toml"
+    path.write_text('targets = ["avatar:1"]\n', encoding="utf-8")
+    advisor = FakeAdvisor(screening_count=0)
+    daemon = _daemon(
+        advisor,
+        FakeNotifier(),
+        tmp_path,
+        watchlist=Watchlist.from_file(path),
+        config_file=str(path),
+        config_check_interval_seconds=0.02,
+    )
+    scheduler = daemon.scheduler
+
+    async def scenario():
+        task = asyncio.create_task(daemon.run())
+        while "avatar" not in advisor.discovered:
+            await asyncio.sleep(0.01)
+        path.write_text(
+            'targets = ["dune:2"]\n\n[scheduler]\nhorizon_days = 1\nmin_score = 0.5\n',
+            encoding="utf-8",
+        )
+        deadline = time_module.monotonic() + 5
+        while "dune" not in advisor.discovered and time_module.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        daemon.request_stop()
+        await asyncio.wait_for(task, 5)
+
+    asyncio.run(scenario())
+
+    assert advisor.discovered == ["avatar", "dune"]
+    assert scheduler.scheduler_config.min_score == 0.5
+    assert [job.target.movie_name_slug for job in daemon._queue] == ["dune"]
+
+
+def test_past_dates_are_dropped_and_the_horizon_rolls_forward(tmp_path):
+    class RecordingPolicy:
+        def __init__(self):
+            self.pruned = []
+
+        def prune(self, before=None):
+            self.pruned.append(before)
+
+    now = {"value": time_module.time()}
+    daemon = _daemon(FakeAdvisor(), FakeNotifier(), tmp_path, clock=lambda: now["value"])
+    policy = daemon.scheduler.polling_policy = RecordingPolicy()
+    daemon._seed_discovery_jobs()
+    job = daemon._queue.pop()
+    daemon._scheduled.add(job.key)
+
+    now["value"] += 2 * 86400
+    daemon._after_discovery(job, [])
+
+    # The finished job's (now past) date is not re-armed; the sweep starts today.
+    later = date.today() + timedelta(days=2)
+    assert policy.pruned == [later]
+    assert [job.screening_date for job in daemon._queue] == [later]
+    daemon._seed_discovery_jobs()
+    assert daemon.pending_jobs == 1
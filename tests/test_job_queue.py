@@ -0,0 +1,255 @@
+import threading
+from datetime import date, time
+
+from src.advisor import SeatRecommendation
+from src.config import AppConfig
+from src.job_queue import LeaseJobQueue
+from src.scheduler import MonitorScheduler, SchedulerConfig
+from src.screenings import ScreeningDescriptor
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.watchlist import Watchlist, WatchTarget
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _queue(tmp_path, clock, **kwargs):
+    return LeaseJobQueue(tmp_path / "jobs.sqlite3", clock=clock, **kwargs)
+
+
+def test_claims_are_exclusive_between_workers(tmp_path):
+    clock = FakeClock()
+    queue = _queue(tmp_path, clock)
+    for idx in range(3):
+        queue.enqueue(f"job-{idx}", "screening", {"idx": idx})
+
+    first = queue.claim("worker-a", limit=2)
+    second = queue.claim("worker-b", limit=2)
+
+    assert [job.key for job in first] == ["job-0", "job-1"]
+    assert [job.key for job in second] == ["job-2"]
+    assert queue.claim("worker-c") == []
+    assert queue.stats() == {"total": 3, "due": 3, "leased": 3}
+
+
+def test_enqueue_keeps_existing_schedule(tmp_path):
+    clock = FakeClock()
+    queue = _queue(tmp_path, clock)
+
+    assert queue.enqueue("job", "discovery", {"v": 1}, due_at=2000.0)
+    assert not queue.enqueue("job", "discovery", {"v": 2})
+
+    assert queue.claim("worker") == []
+    clock.now = 2000.0
+    [job] = queue.claim("worker")
+    assert job.payload == {"v": 2}
+
+
+def test_expired_lease_is_reclaimed_and_stale_completion_rejected(tmp_path):
+    clock = FakeClock()
+    queue = _queue(tmp_path, clock, lease_seconds=60)
+    queue.enqueue("job", "screening", {})
+    queue.claim("crashed")
+
+    clock.now += 30
+    assert queue.claim("other") == []
+    clock.now += 31
+    [job] = queue.claim("other")
+
+    assert job.attempts == 2
+    assert not queue.complete("crashed", "job", next_due_in=300)
+    assert queue.complete("other", "job", next_due_in=300)
+
+
+def test_heartbeat_extends_lease(tmp_path):
+    clock = FakeClock()
+    queue = _queue(tmp_path, clock, lease_seconds=60)
+    queue.enqueue("job", "screening", {})
+    queue.claim("worker")
+
+    clock.now += 50
+    assert queue.heartbeat("worker", ["job"]) == 1
+    assert queue.heartbeat("intruder", ["job"]) == 0
+    clock.now += 50
+
+    assert queue.claim("other") == []
+
+
+def test_completed_job_is_not_due_again_within_interval(tmp_path):
+    clock = FakeClock()
+    queue = _queue(tmp_path, clock)
+    queue.enqueue("job", "screening", {})
+    queue.claim("worker")
+    queue.complete("worker", "job", next_due_in=300)
+
+    clock.now += 299
+    assert queue.claim("worker") == []
+    assert queue.seconds_until_next_due() == 1.0
+    clock.now += 1
+    assert [job.key for job in queue.claim("worker")] == ["job"]
+
+
+def test_release_and_remove(tmp_path):
+    clock = FakeClock()
+    queue = _queue(tmp_path, clock)
+    queue.enqueue("job", "screening", {})
+    queue.claim("worker")
+    queue.release("worker", "job", retry_in=10)
+
+    assert queue.claim("worker") == []
+    clock.now += 10
+    assert len(queue.claim("worker")) == 1
+
+    queue.remove("job")
+    assert queue.seconds_until_next_due() is None
+
+
+def test_retain_drops_rejected_jobs_but_not_live_leases(tmp_path):
+    queue = _queue(tmp_path, FakeClock())
+    for key in ("keep", "stale", "leased"):
+        queue.enqueue(key, "discovery", {})
+    queue.enqueue("other-kind", "screening", {})
+    queue.claim("worker", limit=3)
+    queue.release("worker", "stale")
+    queue.release("worker", "keep")
+
+    assert queue.retain("discovery", lambda key: key == "keep") == 1
+    assert queue.stats()["total"] == 3
+
+
+class FakeAdvisor:
+    def __init__(self, screening_count):
+        self.screenings = [
+            ScreeningDescriptor(
+                label=f"1{idx}:00",
+                show_time=time(10 + idx, 0),
+                order_url=f"https://tickets.example.com/order/{idx}",
+            )
+            for idx in range(screening_count)
+        ]
+        self.evaluated = []
+        self._lock = threading.Lock()
+
+    def discover_screenings(self, config, screening_date):
+        return list(self.screenings)
+
+    def evaluate_screening(self, screening_date, screening, **kwargs):
+        with self._lock:
+            self.evaluated.append(screening.order_url)
+        seat_map = SeatMap.from_seats(
+            Seat(
+                row_number=5,
+                seat_number=idx + 1,
+                label=str(idx + 1),
+                status=SeatStatus.AVAILABLE,
+                grid_x=idx,
+                grid_row=5,
+            )
+            for idx in range(12)
+        )
+        suggestion = SeatBlockSuggestion(
+            row_number=5, seat_numbers=[6, 7], labels=["6", "7"], grid_positions=[5, 6], score=0.9
+        )
+        return SeatRecommendation(
+            screening_date=screening_date,
+            screening=screening,
+            seat_map=seat_map,
+            suggestions=[suggestion],
+        )
+
+
+class FakeNotifier:
+    def __init__(self):
+        self.messages = []
+
+    def send_alert_sync(self, message, screenshot_path=None):
+        self.messages.append(message)
+
+
+def test_workers_share_queue_without_duplicate_checks(tmp_path):
+    advisor = FakeAdvisor(screening_count=4)
+    notifier = FakeNotifier()
+    queue = LeaseJobQueue(tmp_path / "jobs.sqlite3")
+    schedulers = []
+    for idx in range(2):
+        scheduler = MonitorScheduler(
+            AppConfig(date="2099-01-05"),
+            advisor=advisor,
+            notifier=notifier,
+            scheduler_config=SchedulerConfig(horizon_days=1, poll_interval_seconds=300),
+            latest_date_path=tmp_path / f"worker{idx}" / "latest_screening_date.txt",
+        )
+        scheduler.renderer = None
+        schedulers.append(scheduler)
+
+    threads = [
+        threading.Thread(target=scheduler.run_worker, args=(queue, f"worker-{idx}"))
+        for idx, scheduler in enumerate(schedulers)
+    ]
+    for thread in threads:
+        thread.start()
+    pause = threading.Event()
+    for _ in range(500):
+        if len(advisor.evaluated) >= 4 and queue.stats()["leased"] == 0:
+            break
+        pause.wait(0.01)
+    for scheduler in schedulers:
+        scheduler.stop()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert sorted(advisor.evaluated) == [
+        f"https://tickets.example.com/order/{idx}" for idx in range(4)
+    ]
+    assert len(notifier.messages) == 4
+    assert queue.stats() == {"total": 5, "due": 0, "leased": 0}
+
+
+def test_seed_queue_drops_jobs_outside_the_plan(tmp_path):
+    queue = LeaseJobQueue(tmp_path / "jobs.sqlite3")
+    queue.enqueue("discovery|gone:1::|2099-01-05", "discovery", {})
+    queue.enqueue("discovery|avatar:1::|2000-01-01", "discovery", {})
+    queue.enqueue("gone:1::|https://tickets.example.com/order/9", "screening", {})
+    queue.enqueue("avatar:1::|https://tickets.example.com/order/1", "screening", {})
+    scheduler = MonitorScheduler(
+        AppConfig(date="2099-01-05"),
+        advisor=FakeAdvisor(screening_count=0),
+        notifier=FakeNotifier(),
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+        watchlist=Watchlist.of([WatchTarget.from_spec("avatar:1")]),
+    )
+
+    assert scheduler.seed_queue(queue) == 1
+
+    assert queue.stats()["total"] == 2
+    assert [job.key for job in queue.claim("worker", limit=5)] == [
+        "avatar:1::|https://tickets.example.com/order/1",
+        "discovery|avatar:1::|2099-01-05",
+    ]
+
+
+def test_seed_queue_starts_the_plan_today_once_the_configured_date_passed(tmp_path):
+    queue = LeaseJobQueue(tmp_path / "jobs.sqlite3")
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=FakeAdvisor(screening_count=0),
+        notifier=FakeNotifier(),
+        scheduler_config=SchedulerConfig(horizon_days=2),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+        watchlist=Watchlist.of([WatchTarget.from_spec("avatar:1")]),
+    )
+
+    assert scheduler.seed_queue(queue, today=date(2026, 3, 1)) == 2
+    assert scheduler.seed_queue(queue, today=date(2026, 3, 2)) == 1
+
+    assert [job.key for job in queue.claim("worker", limit=5)] == [
+        "discovery|avatar:1::|2026-03-02",
+        "discovery|avatar:1::|2026-03-03",
+    ]
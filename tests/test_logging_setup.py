@@ -0,0 +1,98 @@
+import json
+import logging
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from src import logging_setup
+from src.logging_setup import JsonFormatter, log_context, setup_logging, shutdown_logging
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_root_logger_only_enqueues_records(tmp_path):
+    log_file = tmp_path / "logs" / "monitor.log"
+    setup_logging(log_file=str(log_file))
+    listener, _queue_handler = logging_setup._listener
+
+    (handler,) = logging.getLogger().handlers
+    assert isinstance(handler, QueueHandler)
+    writers = set()
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            writers.add(threading.current_thread().name)
+
+    listener.handlers = (*listener.handlers, RecordingHandler())
+    logging.getLogger("src.test").info("hello %s", "world")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("src.test").exception("failed")
+    shutdown_logging()
+
+    assert threading.current_thread().name not in writers
+    # After shutdown the real handlers log synchronously again.
+    assert not any(isinstance(handler, QueueHandler) for handler in logging.getLogger().handlers)
+    lines = log_file.read_text().splitlines()
+    assert lines[0].endswith("[INFO] src.test: hello world")
+    assert lines[1].endswith("[ERROR] src.test: failed")
+    assert lines[2] == "Traceback (most recent call last):"
+    assert lines[-1] == "RuntimeError: boom"
+
+
+def test_json_lines_carry_context_and_extra_fields(tmp_path):
+    log_file = tmp_path / "monitor.log"
+    setup_logging(log_file=str(log_file), log_format="json")
+
+    logger = logging.getLogger("src.test")
+    with log_context(screening="IMAX 19:30", order_url="https://example.com/order/1"):
+        with log_context(screening_date="2026-01-05"):
+            logger.info("fetched", extra={"stage": "seatmap_fetch", "duration_ms": 12.5})
+        try:
+            raise ValueError("bad svg")
+        except ValueError:
+            logger.exception("parse failed")
+    logger.warning("outside")
+    shutdown_logging()
+
+    first, second, third = (json.loads(line) for line in log_file.read_text().splitlines())
+    assert first["message"] == "fetched"
+    assert first["level"] == "INFO"
+    assert first["logger"] == "src.test"
+    assert first["timestamp"].endswith("+00:00")
+    assert first["stage"] == "seatmap_fetch"
+    assert first["duration_ms"] == 12.5
+    assert first["screening"] == "IMAX 19:30"
+    assert first["screening_date"] == "2026-01-05"
+    assert "screening_date" not in second
+    assert second["order_url"] == "https://example.com/order/1"
+    assert second["exception"].endswith("ValueError: bad svg")
+    assert "screening" not in third
+
+
+def test_json_formatter_stringifies_unknown_values():
+    record = logging.LogRecord("src.test", logging.INFO, __file__, 1, "hi", None, None)
+    record.path = tmp = object()
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["path"] == str(tmp)
+
+
+def test_unknown_log_format_is_rejected():
+    with pytest.raises(ValueError):
+        setup_logging(log_format="xml")
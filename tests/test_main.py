@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.main import build_parser
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Third-party packages that must only be imported once they are actually needed.
+HEAVY_MODULES = ("playwright", "bs4", "httpx", "telegram", "PIL")
+
+
+def _imported_packages(args, env):
+    """Run the CLI under `-X importtime`; return the top-level packages it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.main", *args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        name = line.rsplit("|", 1)[1]
+        imported.add(name.strip().split(".")[0])
+    return imported
+
+
+def _noop_env(tmp_path):
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in {"WATCHLIST", "WATCHLIST_FILE", "TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"}
+    }
+    env.update(
+        {
+            "HOME": str(tmp_path),
+            "LOG_FILE": str(tmp_path / "monitor.log"),
+            # 2026-01-05 is a Monday; the three-day horizon holds no Sunday.
+            "DATE": "2026-01-05",
+            "ALLOWED_WEEKDAYS": "sun",
+        }
+    )
+    return env
+
+
+def test_parser_defaults():
+    args = build_parser().parse_args([])
+    assert not args.daemon
+    assert not args.worker
+    assert args.queue_path is None
+
+
+def test_daemon_and_worker_modes_are_exclusive(capsys):
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--daemon", "--worker"])
+    assert "not allowed with argument" in capsys.readouterr().err
+
+
+def test_help_does_not_import_heavy_dependencies(tmp_path):
+    imported = _imported_packages(["--help"], _noop_env(tmp_path))
+
+    assert imported.isdisjoint(HEAVY_MODULES), imported & set(HEAVY_MODULES)
+
+
+def test_noop_run_does_not_import_heavy_dependencies(tmp_path):
+    imported = _imported_packages([], _noop_env(tmp_path))
+
+    assert imported.isdisjoint(HEAVY_MODULES), imported & set(HEAVY_MODULES)
+    assert "No eligible dates" in (tmp_path / "monitor.log").read_text()
+
+
+def test_invalid_watchlist_file_exits_with_an_error(tmp_path):
+    config = tmp_path / "watchlist.toml"
+    config.write_text('targets = ["dune:5376s2r"]\n[scheduler]\nparty_size = "two"\n')
+    result = subprocess.run(
+        [sys.executable, "-m", "src.main", "--config", str(config)],
+        cwd=REPO_ROOT,
+        env=_noop_env(tmp_path),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 1
+    log = result.stderr + (tmp_path / "monitor.log").read_text(encoding="utf-8")
+    assert "Invalid watchlist file" in log
+    assert "Traceback" not in result.stderr
@@ -0,0 +1,101 @@
+import json
+import logging
+
+import pytest
+
+from src import metrics
+from src.metrics import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registry():
+    clock = FakeClock()
+    registry = MetricsRegistry(buckets=(0.1, 1.0), clock=clock)
+    previous = metrics.set_registry(registry)
+    yield registry
+    metrics.set_registry(previous)
+
+
+def test_stage_records_histogram_and_errors(registry):
+    with metrics.stage("parse"):
+        registry.clock.now += 0.05
+    with pytest.raises(RuntimeError):
+        with metrics.stage("parse"):
+            registry.clock.now += 2.0
+            raise RuntimeError("boom")
+    metrics.increment("alerts_dispatched", 3)
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"alerts_dispatched": 3, "parse_errors": 1}
+    parse = snapshot["stages"]["parse"]
+    assert parse["count"] == 2
+    assert parse["sum"] == pytest.approx(2.05)
+    assert parse["buckets"] == {"0.1": 1, "1.0": 1, "+Inf": 2}
+    assert json.loads(registry.to_json()) == json.loads(json.dumps(snapshot))
+
+
+def test_prometheus_text_format(registry):
+    registry.observe("render", 0.5)
+    registry.increment("alerts_dispatched")
+
+    text = registry.to_prometheus()
+    assert "# TYPE cinema_monitor_alerts_dispatched_total counter" in text
+    assert "cinema_monitor_alerts_dispatched_total 1\n" in text
+    assert "# TYPE cinema_monitor_stage_seconds histogram" in text
+    assert 'cinema_monitor_stage_seconds_bucket{stage="render",le="0.1"} 0' in text
+    assert 'cinema_monitor_stage_seconds_bucket{stage="render",le="1.0"} 1' in text
+    assert 'cinema_monitor_stage_seconds_bucket{stage="render",le="+Inf"} 1' in text
+    assert 'cinema_monitor_stage_seconds_sum{stage="render"} 0.5' in text
+    assert 'cinema_monitor_stage_seconds_count{stage="render"} 1' in text
+
+
+def test_cycle_summary_resets_between_cycles(registry):
+    registry.observe("discovery_http", 0.25)
+    registry.observe("discovery_http", 0.5)
+    registry.observe("notify", 0.125)
+
+    assert registry.take_cycle_summary() == "discovery_http=2x0.750s notify=1x0.125s"
+    assert registry.take_cycle_summary() == ""
+    assert registry.snapshot()["stages"]["discovery_http"]["count"] == 2
+
+
+def test_disabled_registry_is_a_no_op():
+    registry = MetricsRegistry(enabled=False)
+
+    assert registry.stage("parse") is registry.stage("render")
+    with registry.stage("parse"):
+        pass
+    registry.increment("alerts_dispatched")
+    assert registry.snapshot() == {"counters": {}, "stages": {}}
+    assert registry.to_prometheus() == ""
+
+
+def test_write_picks_format_from_suffix(registry, tmp_path):
+    registry.observe("render", 0.01)
+
+    registry.write(tmp_path / "metrics.prom")
+    registry.write(tmp_path / "out" / "metrics.json")
+
+    assert (tmp_path / "metrics.prom").read_text().startswith("# HELP")
+    data = json.loads((tmp_path / "out" / "metrics.json").read_text())
+    assert data["stages"]["render"]["count"] == 1
+
+
+def test_stage_logs_timing_fields_at_debug(registry, caplog):
+    caplog.set_level(logging.DEBUG, logger="src.metrics")
+
+    with metrics.stage("render"):
+        registry.clock.now += 0.25
+
+    (record,) = caplog.records
+    assert record.stage == "render"
+    assert record.duration_ms == 250.0
+    assert record.failed is False
@@ -0,0 +1,127 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.metrics import MetricsRegistry
+from src.metrics_server import MetricsServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _get(server, path):
+    host, port = server.address
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as response:
+            return response.status, response.headers["Content-Type"], response.read().decode()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.headers["Content-Type"], exc.read().decode()
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe("parse", 0.05)
+    registry.increment("alerts_dispatched")
+    return registry
+
+
+def test_metrics_endpoint_serves_prometheus_and_json(registry):
+    status = {"jobs_pending": 3, "last_success_timestamp_seconds": 990.5}
+    with MetricsServer(lambda: status, registry=registry, cache_seconds=0) as server:
+        code, content_type, body = _get(server, "/metrics")
+        assert code == 200
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "# TYPE cinema_monitor_jobs_pending gauge\ncinema_monitor_jobs_pending 3\n" in body
+        assert "cinema_monitor_last_success_timestamp_seconds 990.5" in body
+        assert "cinema_monitor_alerts_dispatched_total 1" in body
+        assert 'cinema_monitor_stage_seconds_count{stage="parse"} 1' in body
+
+        code, content_type, body = _get(server, "/metrics?format=json")
+        data = json.loads(body)
+        assert (code, content_type) == (200, "application/json")
+        assert data["gauges"] == status
+        assert data["stages"]["parse"]["count"] == 1
+
+        assert _get(server, "/nope")[0] == 404
+
+
+def test_metrics_body_is_reused_within_cache_window(registry):
+    calls = []
+    clock = FakeClock()
+    server = MetricsServer(
+        lambda: calls.append(1) or {}, registry=registry, cache_seconds=1.0, clock=clock
+    )
+
+    first = server.render_metrics()
+    registry.increment("alerts_dispatched")
+    assert server.render_metrics() == first
+    clock.now += 1.0
+    assert server.render_metrics() != first
+    assert len(calls) == 2
+
+
+def test_healthz_reports_stale_when_last_success_is_too_old():
+    clock = FakeClock()
+    status = {}
+    server = MetricsServer(lambda: status, max_age_seconds=60, clock=clock)
+
+    # Before the first success the server start is the reference point.
+    assert server.health() == (
+        True,
+        {"status": "ok", "last_success_age_seconds": None, "max_age_seconds": 60},
+    )
+    clock.now += 61
+    assert server.health()[0] is False
+
+    status["last_success_timestamp_seconds"] = clock.now - 10
+    healthy, details = server.health()
+    assert healthy and details["last_success_age_seconds"] == 10
+
+    with server:
+        status["last_success_timestamp_seconds"] = clock.now - 120
+        code, _content_type, body = _get(server, "/healthz")
+        assert code == 503
+        assert json.loads(body)["status"] == "stale"
+
+
+def test_requests_beyond_the_concurrency_limit_are_rejected(registry):
+    entered = threading.Event()
+    release = threading.Event()
+
+    def slow_status():
+        entered.set()
+        release.wait(5)
+        return {}
+
+    with MetricsServer(
+        slow_status, registry=registry, cache_seconds=0, max_concurrent_requests=1
+    ) as server:
+        results = []
+        scrape = threading.Thread(target=lambda: results.append(_get(server, "/metrics")))
+        scrape.start()
+        assert entered.wait(5)
+        assert _get(server, "/healthz")[0] == 503
+        release.set()
+        scrape.join(5)
+
+    assert results[0][0] == 200
+
+
+def test_failing_status_provider_still_serves_registry(registry):
+    def broken():
+        raise RuntimeError("boom")
+
+    with MetricsServer(broken, registry=registry) as server:
+        code, _content_type, body = _get(server, "/metrics")
+
+    assert code == 200
+    assert "cinema_monitor_alerts_dispatched_total 1" in body
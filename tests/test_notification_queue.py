@@ -0,0 +1,216 @@
+import json
+import threading
+from dataclasses import asdict
+
+import pytest
+
+from src.alert_ledger import AlertTicket
+from src.notification_queue import NotificationQueue, NotificationQueueConfig
+
+
+class RecordingSender:
+    def __init__(self, gate=None, fail=False):
+        self.gate = gate
+        self.fail = fail
+        self.sent = []
+
+    def send_alert_sync(self, message, screenshot_path=None):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("telegram down")
+        self.sent.append((message, screenshot_path))
+
+
+def test_submit_does_not_wait_for_slow_sender():
+    gate = threading.Event()
+    sender = RecordingSender(gate=gate)
+    notifications = NotificationQueue(sender)
+
+    notifications.submit("first", "/tmp/first.png")
+    notifications.submit("second")
+    assert sender.sent == []
+    assert notifications.pending == 2
+
+    gate.set()
+    assert notifications.flush(timeout=5)
+    notifications.close()
+
+    assert sender.sent == [("first", "/tmp/first.png"), ("second", None)]
+    assert notifications.sent == 2
+
+
+def test_full_queue_overflows_to_spool(tmp_path):
+    gate = threading.Event()
+    sender = RecordingSender(gate=gate)
+    notifications = NotificationQueue(
+        sender,
+        NotificationQueueConfig(max_size=1, put_timeout_seconds=0.01, spool_dir=tmp_path),
+    )
+
+    for idx in range(4):
+        notifications.submit(f"alert {idx}")
+    assert notifications.overflowed >= 1
+    assert len(list(tmp_path.rglob("*.json"))) == 4
+
+    gate.set()
+    notifications.close()
+
+    assert sorted(message for message, _path in sender.sent) == [f"alert {idx}" for idx in range(4)]
+    assert list(tmp_path.rglob("*.json")) == []
+
+
+def test_undelivered_alerts_are_replayed_after_restart(tmp_path):
+    config = NotificationQueueConfig(spool_dir=tmp_path, flush_timeout_seconds=1)
+    failing = NotificationQueue(RecordingSender(fail=True), config)
+    failing.submit("survives")
+    failing.close()
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+    sender = RecordingSender()
+    replay = NotificationQueue(sender, config)
+    assert replay.flush(timeout=5)
+    replay.close()
+
+    assert sender.sent == [("survives", None)]
+    assert list(tmp_path.rglob("*.json")) == []
+
+
+def test_closed_queue_rejects_new_alerts():
+    notifications = NotificationQueue(RecordingSender())
+    notifications.close()
+
+    with pytest.raises(RuntimeError):
+        notifications.submit("late")
+
+
+def test_in_memory_photos_survive_the_spool(tmp_path):
+    class PhotoSender(RecordingSender):
+        def send_alert_sync(self, message, screenshot_path=None, photo=None):
+            if self.fail:
+                raise RuntimeError("telegram down")
+            self.sent.append((message, photo))
+
+    config = NotificationQueueConfig(spool_dir=tmp_path, flush_timeout_seconds=1)
+    failing = NotificationQueue(PhotoSender(fail=True), config)
+    failing.submit("with photo", photo=b"\x89PNG\x00\xff")
+    failing.close()
+
+    sender = PhotoSender()
+    replay = NotificationQueue(sender, config)
+    assert replay.flush(timeout=5)
+    replay.close()
+
+    assert sender.sent == [("with photo", b"\x89PNG\x00\xff")]
+
+
+def test_running_queues_do_not_replay_each_others_spool(tmp_path):
+    gate = threading.Event()
+    config = NotificationQueueConfig(spool_dir=tmp_path, flush_timeout_seconds=1)
+    busy = NotificationQueue(RecordingSender(gate=gate), config)
+    busy.submit("owned by the first process")
+
+    sender = RecordingSender()
+    other = NotificationQueue(sender, config)
+    assert other.flush(timeout=5)
+    other.close()
+    gate.set()
+    busy.close()
+
+    assert sender.sent == []
+    assert list(tmp_path.rglob("*.json")) == []
+
+
+def test_failed_send_stays_spooled_and_reports_failure(tmp_path):
+    results = []
+    config = NotificationQueueConfig(spool_dir=tmp_path, flush_timeout_seconds=1)
+    failing = NotificationQueue(RecordingSender(fail=True), config)
+    failing.submit("not delivered", on_result=results.append)
+    failing.close()
+
+    assert results == [False]
+    assert failing.sent == 0
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+
+def test_alerts_spooled_at_the_top_level_are_claimed_once(tmp_path):
+    legacy = tmp_path / "00000000000000000001-legacy00.json"
+    legacy.write_text('{"message": "from an older version"}', encoding="utf-8")
+    config = NotificationQueueConfig(spool_dir=tmp_path)
+
+    sender = RecordingSender()
+    first = NotificationQueue(sender, config)
+    second = NotificationQueue(RecordingSender(), config)
+    assert first.flush(timeout=5) and second.flush(timeout=5)
+    first.close()
+    second.close()
+
+    assert sender.sent == [("from an older version", None)]
+    assert second.sender.sent == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def _ticket():
+    return AlertTicket(
+        alert_key="k", screening_key="s", content_hash="c", score=0.9, status_hash="h"
+    )
+
+
+def test_failed_alerts_are_dropped_after_max_attempts(tmp_path):
+    config = NotificationQueueConfig(spool_dir=tmp_path, flush_timeout_seconds=1, max_attempts=2)
+    first = NotificationQueue(RecordingSender(fail=True), config)
+    first.submit("never deliverable")
+    first.close()
+    assert len(list(tmp_path.rglob("*.json"))) == 1
+
+    replay = NotificationQueue(RecordingSender(fail=True), config)
+    assert replay.flush(timeout=5)
+    replay.close()
+
+    assert list(tmp_path.rglob("*.json")) == []
+
+
+def test_failed_ticketed_alert_is_left_to_the_ledger(tmp_path):
+    config = NotificationQueueConfig(spool_dir=tmp_path, flush_timeout_seconds=1)
+    failing = NotificationQueue(RecordingSender(fail=True), config)
+    failing.submit("released for a fresh dispatch", ticket=_ticket())
+    failing.close()
+
+    assert list(tmp_path.rglob("*.json")) == []
+
+
+def test_replayed_alert_gets_its_ticket_callback(tmp_path):
+    record = {"message": "left behind by a crash", "ticket": asdict(_ticket())}
+    (tmp_path / "00000000000000000001-crashed0.json").write_text(json.dumps(record))
+    replayed, results = [], []
+
+    def on_replay(ticket):
+        replayed.append(ticket)
+        return results.append
+
+    sender = RecordingSender()
+    queue = NotificationQueue(
+        sender, NotificationQueueConfig(spool_dir=tmp_path), on_replay=on_replay
+    )
+    assert queue.flush(timeout=5)
+    queue.close()
+
+    assert replayed == [_ticket()]
+    assert results == [True]
+    assert sender.sent == [("left behind by a crash", None)]
+
+
+def test_close_does_not_block_on_a_full_queue():
+    gate = threading.Event()
+    notifications = NotificationQueue(
+        RecordingSender(gate=gate),
+        NotificationQueueConfig(max_size=1, workers=2, flush_timeout_seconds=0.1),
+    )
+    for idx in range(3):
+        notifications.submit(f"alert {idx}")
+
+    closer = threading.Thread(target=notifications.close)
+    closer.start()
+    closer.join(timeout=2)
+    assert not closer.is_alive()
+    gate.set()
@@ -1,5 +1,11 @@
+import asyncio
+import time
+
+from telegram.error import RetryAfter
+
 from src.config import AppConfig
-from src.notifier import Notifier
+from src.notifier import AlertBatchConfig, Notifier, _split_message
+from src.rate_limit import RateLimitedSender
 
 
 class DummyBot:
@@ -27,7 +33,7 @@ def test_notifier_falls_back_when_unconfigured():
     config = AppConfig(telegram_bot_token=None, telegram_chat_id=None)
     notifier = Notifier(config, fallback_handler=fallback)
 
-    notifier.send_alert_sync("Hello")
+    assert notifier.send_alert_sync("Hello") is False
     assert captured
     assert captured[0][0] == "Hello"
     assert captured[0][1] == "missing_config"
@@ -46,9 +52,11 @@ def test_notifier_falls_back_on_send_failure():
         bot_factory=lambda token: DummyBot(token, should_fail=True),
     )
 
-    notifier.send_alert_sync("Test")
+    results = []
+    assert notifier.send_alert_sync("Test", on_result=results.append) is False
     assert captured
     assert "network error" in captured[0]
+    assert results == [False]
 
 
 def test_notifier_sends_screenshot_when_provided(tmp_path):
@@ -64,3 +72,278 @@ def test_notifier_sends_screenshot_when_provided(tmp_path):
     assert dummy_bot.sent_messages
     assert dummy_bot.sent_messages[0] == ("chat", "Message")
     assert dummy_bot.sent_photos
+
+
+class SessionBot(DummyBot):
+    def __init__(self, token):
+        super().__init__(token)
+        self.initialized = 0
+        self.shut_down = 0
+
+    async def initialize(self):
+        self.initialized += 1
+
+    async def shutdown(self):
+        self.shut_down += 1
+
+
+def test_notifier_reuses_one_bot_until_closed():
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    created = []
+
+    def factory(token):
+        created.append(SessionBot(token))
+        return created[-1]
+
+    notifier = Notifier(config, bot_factory=factory)
+    for idx in range(3):
+        notifier.send_alert_sync(f"Message {idx}")
+    thread = notifier._thread
+    notifier.close()
+
+    assert len(created) == 1
+    assert created[0].initialized == 1
+    assert created[0].shut_down == 1
+    assert [text for _chat, text in created[0].sent_messages] == [
+        "Message 0",
+        "Message 1",
+        "Message 2",
+    ]
+    assert thread is not None and not thread.is_alive()
+    notifier.close()  # idempotent
+
+
+def test_notifier_async_send_runs_on_background_loop():
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    bot = SessionBot("token")
+    notifier = Notifier(config, bot_factory=lambda token: bot)
+
+    asyncio.run(notifier.send_alert("From a caller loop"))
+    notifier.send_alert_sync("From sync code")
+    notifier.close()
+
+    assert [text for _chat, text in bot.sent_messages] == ["From a caller loop", "From sync code"]
+    assert bot.initialized == 1
+
+
+class SlowBot(SessionBot):
+    def __init__(self, token, delay):
+        super().__init__(token)
+        self.delay = delay
+        self.cancelled = 0
+
+    async def send_message(self, chat_id, text):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.sent_messages.append((chat_id, text))
+
+
+def test_timed_out_send_is_cancelled():
+    captured = []
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    bot = SlowBot("token", delay=5)
+    notifier = Notifier(
+        config,
+        bot_factory=lambda token: bot,
+        fallback_handler=lambda message, screenshot, reason: captured.append(reason),
+        send_timeout_seconds=0.05,
+    )
+
+    assert notifier.send_alert_sync("Too slow") is False
+    for _ in range(100):
+        if bot.cancelled:
+            break
+        time.sleep(0.01)
+    notifier.close()
+
+    assert captured == ["timeout"]
+    assert bot.cancelled == 1
+    assert bot.sent_messages == []
+
+
+def test_close_waits_for_in_flight_background_sends():
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    bot = SlowBot("token", delay=0.1)
+    notifier = Notifier(config, bot_factory=lambda token: bot, send_timeout_seconds=5)
+    results = []
+
+    async def caller():
+        # Inside a running loop the send is handed to the background loop.
+        notifier.send_alert_sync("In flight", on_result=results.append)
+
+    asyncio.run(caller())
+    notifier.close()
+
+    assert [text for _chat, text in bot.sent_messages] == ["In flight"]
+    assert results == [True]
+    assert bot.cancelled == 0
+
+
+class AlbumBot(SessionBot):
+    def __init__(self, token):
+        super().__init__(token)
+        self.albums = []
+
+    async def send_media_group(self, chat_id, media):
+        self.albums.append((chat_id, len(media)))
+
+
+def _batching_notifier(bot, **batch):
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    return Notifier(config, bot_factory=lambda token: bot, batch_config=AlertBatchConfig(**batch))
+
+
+def _photos(tmp_path, count):
+    paths = []
+    for idx in range(count):
+        path = tmp_path / f"seatmap_{idx}.png"
+        path.write_bytes(b"png")
+        paths.append(str(path))
+    return paths
+
+
+def test_batched_alerts_become_one_message_and_album(tmp_path):
+    bot = AlbumBot("token")
+    notifier = _batching_notifier(bot, linger_seconds=60)
+
+    for idx, photo in enumerate(_photos(tmp_path, 3)):
+        notifier.send_alert_sync(f"Row {idx}", photo, group_key="screening-1")
+    notifier.send_alert_sync("Other screening", group_key="screening-2")
+    assert bot.sent_messages == []
+
+    notifier.flush_batches_sync()
+    notifier.close()
+
+    assert sorted(text for _chat, text in bot.sent_messages) == [
+        "Other screening",
+        "Row 0\n\nRow 1\n\nRow 2",
+    ]
+    assert bot.albums == [("chat", 3)]
+    assert bot.sent_photos == []
+
+
+def test_full_batch_is_sent_without_waiting(tmp_path):
+    bot = AlbumBot("token")
+    notifier = _batching_notifier(bot, linger_seconds=60, max_batch_size=2)
+
+    first, second = _photos(tmp_path, 2)
+    notifier.send_alert_sync("A", first, group_key="screening")
+    notifier.send_alert_sync("B", second, group_key="screening")
+
+    assert [text for _chat, text in bot.sent_messages] == ["A\n\nB"]
+    assert bot.albums == [("chat", 2)]
+    notifier.close()
+
+
+def test_batched_alerts_report_delivery_per_alert():
+    bot = AlbumBot("token")
+    notifier = _batching_notifier(bot, linger_seconds=60)
+    results = []
+
+    notifier.send_alert_sync("A", group_key="screening", on_result=results.append)
+    notifier.send_alert_sync("B", group_key="screening", on_result=results.append)
+    assert results == []
+
+    notifier.flush_batches_sync()
+    notifier.close()
+
+    assert results == [True, True]
+
+
+def test_batch_is_sent_after_linger_time():
+    bot = AlbumBot("token")
+    notifier = _batching_notifier(bot, linger_seconds=0.05)
+
+    notifier.send_alert_sync("Lingering", group_key="screening")
+    for _ in range(100):
+        if bot.sent_messages:
+            break
+        time.sleep(0.01)
+    notifier.close()
+
+    assert [text for _chat, text in bot.sent_messages] == ["Lingering"]
+
+
+def test_split_message_respects_telegram_limit():
+    parts = _split_message("\n\n".join(["x" * 3000, "y" * 3000, "z" * 5000]), limit=4096)
+
+    assert parts == ["x" * 3000, "y" * 3000, "z" * 4096, "z" * 904]
+
+
+class FloodedBot(SessionBot):
+    def __init__(self, token):
+        super().__init__(token)
+        self.floods = 1
+
+    async def send_message(self, chat_id, text):
+        if self.floods:
+            self.floods -= 1
+            raise RetryAfter(2)
+        await super().send_message(chat_id, text)
+
+
+def test_notifier_retries_after_telegram_flood_control():
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    captured = []
+    bot = FloodedBot("token")
+    notifier = Notifier(
+        AppConfig(telegram_bot_token="token", telegram_chat_id="chat"),
+        fallback_handler=lambda message, screenshot, reason: captured.append(reason),
+        bot_factory=lambda token: bot,
+        rate_limiter=RateLimitedSender(sleep=fake_sleep),
+    )
+
+    notifier.send_alert_sync("Eventually delivered")
+    notifier.close()
+
+    assert bot.sent_messages == [("chat", "Eventually delivered")]
+    assert captured == []
+    assert sleeps and sleeps[0] >= 2
+
+
+def test_notifier_sends_in_memory_photo():
+    sent = []
+
+    class BytesBot(DummyBot):
+        async def send_photo(self, chat_id, photo):
+            sent.append(photo)
+
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    bot = BytesBot("token")
+    notifier = Notifier(config, bot_factory=lambda token: bot)
+
+    notifier.send_alert_sync("Message", photo=b"\x89PNG data")
+    notifier.close()
+
+    assert bot.sent_messages == [("chat", "Message")]
+    assert sent == [b"\x89PNG data"]
+
+
+def test_failed_preview_does_not_resend_the_alert_text():
+    class NoPhotoBot(DummyBot):
+        async def send_photo(self, chat_id, photo):
+            raise RuntimeError("upload failed")
+
+    config = AppConfig(telegram_bot_token="token", telegram_chat_id="chat")
+    bot = NoPhotoBot("token")
+    fallbacks = []
+    notifier = Notifier(
+        config,
+        bot_factory=lambda token: bot,
+        fallback_handler=lambda message, path, reason: fallbacks.append(reason),
+    )
+
+    results = []
+    assert notifier.send_alert_sync("Message", photo=b"\x89PNG", on_result=results.append)
+    notifier.close()
+
+    assert bot.sent_messages == [("chat", "Message")]
+    assert results == [True]
+    assert fallbacks == []
@@ -0,0 +1,81 @@
+from datetime import date, datetime, time, timedelta
+
+from src.advisor import SeatRecommendation
+from src.polling import AdaptivePollingConfig, AdaptivePollingPolicy
+from src.screenings import ScreeningDescriptor
+from src.seat_map import Seat, SeatMap, SeatStatus
+
+NOW = datetime(2026, 1, 5, 12, 0)
+
+
+def _seat_map(occupied: int = 0) -> SeatMap:
+    seats = [
+        Seat(
+            row_number=1,
+            seat_number=idx + 1,
+            label=str(idx + 1),
+            status=SeatStatus.OCCUPIED if idx < occupied else SeatStatus.AVAILABLE,
+            grid_x=idx,
+            grid_row=1,
+        )
+        for idx in range(10)
+    ]
+    return SeatMap.from_seats(seats)
+
+
+def _recommendation(show_at: datetime, occupied: int = 0) -> SeatRecommendation:
+    screening = ScreeningDescriptor(
+        label=show_at.strftime("%H:%M"),
+        show_time=show_at.time(),
+        order_url="https://tickets.example.com/order/1",
+    )
+    return SeatRecommendation(
+        screening_date=show_at.date(),
+        screening=screening,
+        seat_map=_seat_map(occupied),
+        suggestions=[],
+    )
+
+
+def _policy(clock):
+    config = AdaptivePollingConfig(min_interval_seconds=60, max_interval_seconds=3600)
+    return AdaptivePollingPolicy(config, clock=lambda: clock["now"])
+
+
+def test_interval_grows_with_time_until_showtime_within_bounds():
+    policy = _policy({"now": NOW.timestamp()})
+
+    imminent = policy.interval_for(NOW + timedelta(hours=2))
+    tomorrow = policy.interval_for(NOW + timedelta(days=1))
+    next_month = policy.interval_for(NOW + timedelta(days=30))
+
+    assert imminent == 60
+    assert imminent < tomorrow < next_month
+    assert next_month == 3600
+    assert policy.interval_for(NOW + timedelta(days=1), has_block=True) < tomorrow
+
+
+def test_seat_changes_shorten_the_next_interval_and_unknown_screenings_are_due():
+    clock = {"now": NOW.timestamp()}
+    policy = _policy(clock)
+    show_at = datetime.combine(date(2026, 1, 8), time(19, 30))
+
+    assert policy.is_due("a")
+    quiet = policy.observe("a", _recommendation(show_at), has_block=False)
+    assert not policy.is_due("a")
+
+    clock["now"] += quiet
+    assert policy.is_due("a")
+    busy = policy.observe("a", _recommendation(show_at, occupied=6), has_block=False)
+    assert busy < quiet
+    assert policy.seconds_until_next_due() == busy
+
+
+def test_prune_drops_started_screenings():
+    clock = {"now": NOW.timestamp()}
+    policy = _policy(clock)
+    policy.observe("a", _recommendation(NOW + timedelta(hours=1)), has_block=False)
+
+    clock["now"] += 2 * 3600
+    policy.prune()
+    assert policy.state_for("a") is None
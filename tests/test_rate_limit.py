@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from telegram.error import BadRequest, Forbidden, RetryAfter, TimedOut
+
+from src.rate_limit import RateLimitConfig, RateLimitedSender, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakyRequest:
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _sender(clock, **config):
+    return RateLimitedSender(
+        RateLimitConfig(**config), clock=clock, sleep=clock.sleep, jitter=lambda: 0.0
+    )
+
+
+def test_token_bucket_allows_burst_then_spaces_calls():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_per_chat_limit_spaces_messages_to_same_chat():
+    clock = FakeClock()
+    sender = _sender(clock, per_chat_rate_per_second=1.0, per_chat_burst=1)
+
+    async def _run():
+        for _ in range(3):
+            await sender.call("chat", FlakyRequest())
+        await sender.call("other-chat", FlakyRequest())
+
+    asyncio.run(_run())
+
+    assert clock.sleeps == [1.0, 1.0]
+    assert sender.stats.sent == 4
+    assert sender.stats.queue_wait_max == 1.0
+
+
+def test_retry_after_is_honoured():
+    clock = FakeClock()
+    sender = _sender(clock, retry_after_margin_seconds=0.5)
+    request = FlakyRequest(RetryAfter(3))
+
+    assert asyncio.run(sender.call("chat", request)) == "ok"
+
+    assert request.calls == 2
+    assert clock.sleeps == [3.5]
+    assert sender.stats.rate_limited == 1
+    assert sender.stats.retries == 1
+
+
+def test_transient_errors_use_backoff_and_bad_request_is_not_retried():
+    clock = FakeClock()
+    sender = _sender(clock, backoff_base_seconds=1.0, max_attempts=3)
+
+    request = FlakyRequest(TimedOut(), TimedOut())
+    assert asyncio.run(sender.call("chat", request)) == "ok"
+    assert clock.sleeps == [0.5, 1.0]
+
+    bad = FlakyRequest(BadRequest("chat not found"))
+    with pytest.raises(BadRequest):
+        asyncio.run(sender.call("chat", bad))
+    assert bad.calls == 1
+
+
+def test_gives_up_after_max_attempts():
+    clock = FakeClock()
+    sender = _sender(clock, max_attempts=2)
+    request = FlakyRequest(TimedOut(), TimedOut(), TimedOut())
+
+    with pytest.raises(TimedOut):
+        asyncio.run(sender.call("chat", request))
+
+    assert request.calls == 2
+    assert sender.stats.failed == 1
+
+
+def test_errors_that_are_not_retried_count_as_failed():
+    sender = _sender(FakeClock())
+
+    for error in (BadRequest("chat not found"), Forbidden("bot was blocked")):
+        with pytest.raises(type(error)):
+            asyncio.run(sender.call("chat", FlakyRequest(error)))
+
+    assert sender.stats.failed == 2
+    assert sender.stats.retries == 0
@@ -0,0 +1,106 @@
+from src.render_cache import RenderCache
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.seatmap_renderer import SeatMapRenderer
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _seat_map() -> SeatMap:
+    return SeatMap.from_seats(
+        Seat(
+            row_number=1,
+            seat_number=number,
+            label=str(number),
+            status=SeatStatus.AVAILABLE,
+            grid_x=number,
+            grid_row=1,
+        )
+        for number in range(1, 9)
+    )
+
+
+def _suggestion(*seats: int) -> SeatBlockSuggestion:
+    return SeatBlockSuggestion(
+        row_number=1,
+        seat_numbers=list(seats),
+        labels=[str(seat) for seat in seats],
+        grid_positions=list(seats),
+        score=0.9,
+    )
+
+
+def test_keys_address_layout_status_and_highlights():
+    seat_map = _seat_map()
+
+    assert RenderCache.key_for(seat_map, [_suggestion(3, 4)]) == RenderCache.key_for(
+        _seat_map(), [_suggestion(4, 3)]
+    )
+    assert RenderCache.key_for(seat_map, [_suggestion(3, 4)]) != RenderCache.key_for(
+        seat_map, [_suggestion(4, 5)]
+    )
+    assert RenderCache.key_for(seat_map, [_suggestion(3)]) != RenderCache.key_for(
+        seat_map, [_suggestion(3)], variant="webp"
+    )
+
+
+def test_lru_eviction_by_entries_and_bytes(tmp_path):
+    clock = FakeClock()
+    cache = RenderCache(tmp_path, max_entries=2, max_bytes=10, clock=clock)
+
+    cache.put("a", b"1234")
+    clock.now += 1
+    cache.put("b", b"1234")
+    clock.now += 1
+    assert cache.get("a") == b"1234"  # "a" is now the most recently used
+    clock.now += 1
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    cache.put("d", b"12345678")
+
+    stats = cache.stats()
+    assert stats.entries == 1
+    assert stats.total_bytes == 8
+    assert stats.evictions == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["d.png"]
+
+
+def test_entries_expire_and_survive_restart(tmp_path):
+    clock = FakeClock()
+    cache = RenderCache(tmp_path, max_age_seconds=60, clock=clock)
+    cache.put("old", b"x")
+    clock.now += 50
+    cache.put("fresh", b"y")
+
+    reopened = RenderCache(tmp_path, max_age_seconds=60, clock=clock)
+    assert reopened.stats().entries == 2
+
+    clock.now += 20
+    assert reopened.get("old") is None
+    assert reopened.get("fresh") == b"y"
+    reopened.evict()
+    assert not (tmp_path / "old.png").exists()
+
+
+def test_renderer_reuses_identical_renders(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    renderer = SeatMapRenderer(output_dir=tmp_path, cache=cache)
+    seat_map = _seat_map()
+
+    first = renderer.render_bytes(seat_map, _suggestion(3, 4))
+    second = renderer.render_bytes(_seat_map(), _suggestion(3, 4))
+    path_one = renderer.render(seat_map, _suggestion(5))
+    path_two = renderer.render(seat_map, _suggestion(5))
+
+    assert first == second
+    assert path_one == path_two
+    assert renderer.base_misses == 1
+    assert (cache.stats().hits, cache.stats().entries) == (2, 2)
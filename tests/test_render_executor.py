@@ -0,0 +1,164 @@
+import pickle
+import time as time_module
+from concurrent.futures import Future
+from datetime import date, time
+
+import pytest
+
+from src.advisor import SeatRecommendation
+from src.config import AppConfig
+from src.render_cache import RenderCache
+from src.render_executor import RenderExecutor, RenderPayload
+from src.scheduler import MonitorScheduler, SchedulerConfig
+from src.screenings import ScreeningDescriptor
+from src.seat_map import Seat, SeatMap, SeatStatus
+from src.seat_selection import SeatBlockSuggestion
+from src.seatmap_renderer import RenderEncoding, SeatMapRenderer
+
+
+def _hall() -> SeatMap:
+    statuses = [SeatStatus.AVAILABLE, SeatStatus.OCCUPIED, SeatStatus.WHEELCHAIR]
+    return SeatMap.from_seats(
+        Seat(
+            row_number=row,
+            seat_number=number,
+            label=str(number),
+            status=statuses[(row * number) % len(statuses)],
+            grid_x=number,
+            grid_row=row,
+            metadata={"class": "seat", "data-seat-id": f"{row}-{number}"},
+        )
+        for row in range(1, 6)
+        for number in range(1, 11)
+    )
+
+
+def _suggestion(row: int = 3) -> SeatBlockSuggestion:
+    return SeatBlockSuggestion(
+        row_number=row, seat_numbers=[4, 5], labels=["4", "5"], grid_positions=[4, 5], score=0.9
+    )
+
+
+def test_payload_is_compact_and_round_trips():
+    seat_map = _hall()
+    payload = RenderPayload.from_seat_map(seat_map, [_suggestion()])
+
+    assert len(pickle.dumps(payload)) < len(pickle.dumps(seat_map)) / 2
+    rebuilt = payload.seat_map()
+    assert rebuilt.layout_fingerprint() == seat_map.layout_fingerprint()
+    assert rebuilt.status_vector() == seat_map.status_vector()
+    assert [(s.row_number, s.seat_numbers) for s in payload.suggestions()] == [(3, [4, 5])]
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_executor_matches_inline_render(kind):
+    seat_map = _hall()
+    renderer = SeatMapRenderer(encoding=RenderEncoding.preset("png-palette"))
+    expected = renderer.render_bytes(seat_map, _suggestion())
+
+    with RenderExecutor(renderer, kind=kind, max_workers=2) as executor:
+        futures = [executor.submit(seat_map, [_suggestion(row)]) for row in (3, 1)]
+        results = [future.result(timeout=60) for future in futures]
+
+    assert results[0] == expected
+    assert results[1] == renderer.render_bytes(seat_map, _suggestion(1))
+
+
+@pytest.mark.parametrize("archive", [False, True])
+def test_process_executor_reuses_the_parent_render_cache(tmp_path, archive):
+    seat_map = _hall()
+    cache = RenderCache(tmp_path / "renders") if archive else None
+    renderer = SeatMapRenderer(cache=cache)
+
+    with RenderExecutor(renderer, kind="process", max_workers=1) as executor:
+        first = executor.submit(seat_map, [_suggestion()]).result(timeout=60)
+        # The parent stores the result from a done callback, just after `result()`.
+        for _ in range(100):
+            if renderer.cached_bytes(seat_map, [_suggestion()]) is not None:
+                break
+            time_module.sleep(0.01)
+        second = executor.submit(seat_map, [_suggestion()])
+
+    assert second.done() and second.result() == first
+    assert len(list(tmp_path.rglob("*.png"))) == (1 if archive else 0)
+
+
+def test_unknown_executor_kind_is_rejected():
+    with pytest.raises(ValueError):
+        RenderExecutor(kind="fiber")
+
+
+class PhotoNotifier:
+    def __init__(self):
+        self.sent = []
+
+    def send_alert_sync(self, message, screenshot_path=None, photo=None):
+        self.sent.append((message, photo))
+
+
+def _recommendation(seat_map, suggestions):
+    return SeatRecommendation(
+        screening_date=date(2026, 1, 5),
+        screening=ScreeningDescriptor(
+            label="19:30",
+            show_time=time.fromisoformat("19:30"),
+            order_url="https://tickets.example.com/222",
+        ),
+        seat_map=seat_map,
+        suggestions=suggestions,
+        presentation_date=date(2026, 1, 5),
+    )
+
+
+def test_scheduler_sends_off_thread_renders_in_order(tmp_path):
+    seat_map = _hall()
+    renderer = SeatMapRenderer()
+    notifier = PhotoNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        notifier=notifier,
+        renderer=renderer,
+        scheduler_config=SchedulerConfig(
+            horizon_days=1, min_score=None, avoid_aisle=False, render_workers=2
+        ),
+        render_executor=RenderExecutor(renderer, kind="thread", max_workers=2),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+    suggestions = [_suggestion(3), _suggestion(1)]
+
+    assert scheduler.dispatch(_recommendation(seat_map, suggestions)) == 2
+    scheduler.send_rendered_alerts()
+    scheduler.close()
+
+    assert [message.split("Row: ")[1][:1] for message, _photo in notifier.sent] == ["3", "1"]
+    assert [photo for _message, photo in notifier.sent] == [
+        renderer.render_bytes(seat_map, suggestion) for suggestion in suggestions
+    ]
+    assert all("Seat map preview attached." in message for message, _photo in notifier.sent)
+
+
+def test_failed_render_still_sends_the_alert(tmp_path):
+    class BrokenExecutor:
+        def submit(self, seat_map, suggestions):
+            future = Future()
+            future.set_exception(RuntimeError("renderer crashed"))
+            return future
+
+        def close(self):
+            pass
+
+    notifier = PhotoNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1, min_score=None, avoid_aisle=False),
+        render_executor=BrokenExecutor(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+
+    scheduler.dispatch(_recommendation(_hall(), [_suggestion()]))
+    scheduler.close()
+
+    [(message, photo)] = notifier.sent
+    assert photo is None
+    assert "Seat map preview attached." not in message
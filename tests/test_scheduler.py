@@ -1,11 +1,20 @@
+import shutil
+import threading
 from datetime import date, time
 
+import pytest
+
+from src import metrics
 from src.advisor import SeatRecommendation
 from src.config import AppConfig
+from src.metrics import MetricsRegistry
+from src.notifier import Notifier
 from src.scheduler import MonitorScheduler, SchedulerConfig
 from src.screenings import ScreeningDescriptor
 from src.seat_map import Seat, SeatMap, SeatStatus
 from src.seat_selection import SeatBlockSuggestion
+from src.state_store import AlertRecord, StateStore
+from src.watchlist import Watchlist, WatchlistError, WatchTarget
 
 
 def _build_row_seats(row_number: int, seat_count: int = 12, start_grid: int = 0):
@@ -102,6 +111,48 @@ def test_run_once_dispatches_notifications(tmp_path):
     assert notifier.attachments[0].endswith(".png")
 
 
+@pytest.mark.parametrize("archive", [False, True])
+def test_default_renderer_caches_previews(tmp_path, archive):
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05", render_archive=archive),
+        advisor=FakeAdvisor([]),
+        notifier=FakeNotifier(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+    recommendation = make_recommendation()
+    suggestion = recommendation.suggestions[0]
+
+    first = scheduler.renderer.render_bytes(recommendation.seat_map, suggestion)
+    again = scheduler.renderer.render_bytes(recommendation.seat_map, suggestion)
+
+    assert again == first
+    # Only archiving writes previews to disk; otherwise they are cached in memory.
+    archived = list((tmp_path / "renders").glob("*.png"))
+    assert len(archived) == (1 if archive else 0)
+    if archive:
+        assert scheduler.renderer.cache_stats().hits == 1
+
+
+def test_status_reports_last_success_and_available_components(tmp_path):
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=FakeNotifier(),
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+    assert scheduler.status() == {"pending_renders": 0}
+
+    scheduler.run_once()
+
+    status = scheduler.status()
+    assert status["last_success_timestamp_seconds"] == scheduler.last_success_at
+    # The fake advisor has no seat-map cache or browser session to report.
+    assert not any(name.startswith(("seatmap_", "browser_")) for name in status)
+
+
 def test_poll_with_retry_retries_on_error(monkeypatch, tmp_path):
     advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
     notifier = FakeNotifier()
@@ -265,3 +316,347 @@ def test_no_new_screening_day_sends_message(tmp_path):
     scheduler.run_once()
     assert notifier.messages
     assert "No new screening day" in notifier.messages[0]
+
+
+def test_run_once_processes_every_watchlist_target(tmp_path):
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    notifier = FakeNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1, realert_cooldown_seconds=0),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+        watchlist=Watchlist.of(
+            [WatchTarget.from_spec("avatar:1:prague"), WatchTarget.from_spec("dune:2:brno")]
+        ),
+    )
+
+    assert scheduler.run_once() == 2
+    assert {"Movie: avatar" in msg for msg in notifier.messages} == {True, False}
+    for target in scheduler.watchlist.targets:
+        assert scheduler.state_store.get_date(scheduler._latest_date_key(target)) == date(
+            2026, 1, 5
+        )
+
+    # Targets rotate between cycles so the same one is not always processed last.
+    first_cycle = [message.split("\n")[2] for message in notifier.messages]
+    notifier.messages.clear()
+    scheduler.run_once()
+    second_cycle = [message.split("\n")[2] for message in notifier.messages if "Seat" in message]
+    assert second_cycle == list(reversed(first_cycle))
+
+
+def test_adaptive_polling_skips_screenings_until_due(tmp_path):
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=FakeNotifier(),
+        scheduler_config=SchedulerConfig(horizon_days=1, adaptive_polling=True),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+
+    scheduler.run_once()
+    screening_filter = advisor.calls[0]["screening_filter"]
+    screening = make_recommendation().screening
+    assert screening_filter(date(2026, 1, 5), screening) is False
+    assert 0 < scheduler._next_wait_seconds() <= scheduler.scheduler_config.poll_interval_seconds
+
+
+def test_latest_screening_date_migrates_from_legacy_file(tmp_path):
+    latest_date_path = tmp_path / "latest_screening_date.txt"
+    latest_date_path.write_text("2026-01-05", encoding="utf-8")
+    notifier = FakeNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=FakeAdvisor([], screening_dates={date(2026, 1, 5)}),
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        latest_date_path=latest_date_path,
+    )
+
+    scheduler.run_once()
+    assert "No new screening day" in notifier.messages[0]
+    assert (tmp_path / "state.sqlite3").exists()
+
+
+def test_repeat_alerts_are_suppressed_before_rendering(tmp_path):
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    notifier = FakeNotifier()
+    renderer = FakeRenderer()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        renderer=renderer,
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+
+    assert scheduler.run_once() == 1
+    assert scheduler.run_once() == 0
+    assert scheduler.run_once() == 0
+    assert renderer.calls == 1
+    # The "no new screening day" notice is also sent only once.
+    notices = [message for message in notifier.messages if "No new screening day" in message]
+    assert len(notices) == 1
+
+
+def test_undelivered_alerts_are_not_recorded_as_sent(tmp_path):
+    class FailingNotifier(FakeNotifier):
+        reports_delivery = True
+
+        def __init__(self):
+            super().__init__()
+            self.deliver = False
+
+        def send_alert_sync(self, message, screenshot_path=None, on_result=None):
+            self.messages.append(message)
+            if on_result is not None:
+                on_result(self.deliver)
+            return self.deliver
+
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    notifier = FailingNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+
+    scheduler.run_once()
+    notifier.deliver = True
+    scheduler.run_once()
+    scheduler.run_once()
+
+    alerts = [message for message in notifier.messages if "Seat Alert" in message]
+    assert len(alerts) == 2
+
+
+def test_run_once_prunes_state_past_the_retention_window(tmp_path):
+    now = {"value": 1_000_000.0}
+    store = StateStore(tmp_path / "state.sqlite3", clock=lambda: now["value"])
+    store.save_alert(
+        AlertRecord(
+            alert_key="old",
+            screening_key="gone",
+            content_hash="h",
+            score=0.9,
+            status_hash="x",
+            first_sent=now["value"],
+            last_sent=now["value"],
+        )
+    )
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=FakeAdvisor([]),
+        notifier=FakeNotifier(),
+        scheduler_config=SchedulerConfig(horizon_days=1, state_retention_seconds=3600),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+        state_store=store,
+    )
+
+    now["value"] += 7 * 3600  # Past the retention window and the 6 h re-alert cooldown.
+    scheduler.run_once()
+
+    assert store.load_alert("old") is None
+
+
+def test_alerts_are_sent_through_background_queue(tmp_path):
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    notifier = FakeNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(
+            horizon_days=1,
+            notification_queue_size=10,
+            notification_spool_dir=str(tmp_path / "outbox"),
+        ),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+
+    assert scheduler.run_once() == 1
+    scheduler.close()
+
+    assert "Seat Alert" in notifier.messages[0]
+    assert notifier.attachments[0].endswith(".png")
+    assert list((tmp_path / "outbox").rglob("*.json")) == []
+
+
+def test_replayed_alert_is_not_dispatched_again(tmp_path):
+    class GatedNotifier(FakeNotifier):
+        def __init__(self):
+            super().__init__()
+            self.gate = threading.Event()
+
+        def send_alert_sync(self, message, screenshot_path=None):
+            self.gate.wait(5)
+            super().send_alert_sync(message, screenshot_path)
+
+    def make_scheduler(name, notifier):
+        return MonitorScheduler(
+            AppConfig(date="2026-01-05"),
+            advisor=FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)}),
+            notifier=notifier,
+            scheduler_config=SchedulerConfig(
+                horizon_days=1,
+                notification_queue_size=10,
+                notification_spool_dir=str(tmp_path / name / "outbox"),
+            ),
+            renderer=FakeRenderer(),
+            latest_date_path=tmp_path / name / "latest_screening_date.txt",
+        )
+
+    stuck = GatedNotifier()
+    crashed = make_scheduler("crashed", stuck)
+    assert crashed.run_once() == 1
+    # Simulate a crash: the spooled alert shows up in the next process's spool.
+    (spooled,) = (tmp_path / "crashed" / "outbox").rglob("*.json")
+    (tmp_path / "restarted" / "outbox").mkdir(parents=True)
+    shutil.copy(spooled, tmp_path / "restarted" / "outbox" / spooled.name)
+
+    notifier = FakeNotifier()
+    restarted = make_scheduler("restarted", notifier)
+    assert restarted.run_once() == 0
+    restarted.close()
+    stuck.gate.set()
+    crashed.close()
+
+    assert len(notifier.messages) == 1
+    assert restarted.alert_ledger.suppressed == 1
+
+
+def test_log_only_alerts_are_recorded_and_not_repeated(tmp_path):
+    logged = []
+    notifier = Notifier(
+        AppConfig(telegram_bot_token=None, telegram_chat_id=None),
+        fallback_handler=lambda message, path, reason: logged.append(message),
+    )
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)}),
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+
+    assert scheduler.run_once() == 1
+    assert scheduler.run_once() == 0
+    scheduler.close()
+
+    assert len([message for message in logged if "Seat Alert" in message]) == 1
+
+
+def test_target_overrides_party_size_and_min_score(tmp_path):
+    advisor = FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)})
+    notifier = FakeNotifier()
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=advisor,
+        notifier=notifier,
+        scheduler_config=SchedulerConfig(horizon_days=1, party_size=2, min_score=0.5),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+        watchlist=Watchlist.of(
+            [WatchTarget(movie_name_slug="avatar", movie_id="1", party_size=4, min_score=0.95)]
+        ),
+    )
+
+    assert scheduler.run_once() == 0
+    assert advisor.calls[0]["party_size"] == 4
+    assert not any("Seat Alert" in message for message in notifier.messages)
+
+
+def test_reconfigure_applies_live_settings_and_keeps_resources(tmp_path):
+    scheduler = MonitorScheduler(
+        AppConfig(date="2026-01-05"),
+        advisor=FakeAdvisor([]),
+        notifier=FakeNotifier(),
+        scheduler_config=SchedulerConfig(horizon_days=1, adaptive_polling=True),
+        renderer=FakeRenderer(),
+        latest_date_path=tmp_path / "latest_screening_date.txt",
+    )
+    renderer, policy, ledger = scheduler.renderer, scheduler.polling_policy, scheduler.alert_ledger
+    watchlist = Watchlist.of([WatchTarget.from_spec("dune:2:brno")])
+
+    scheduler.reconfigure(
+        watchlist,
+        SchedulerConfig().with_overrides(
+            {
+                "horizon_days": 5,
+                "min_poll_interval_seconds": 30,
+                "realert_mode": "improvement",
+                "render_workers": 2,
+            }
+        ),
+    )
+
+    assert scheduler.watchlist is watchlist
+    assert scheduler.renderer is renderer and scheduler.polling_policy is policy
+    assert scheduler.alert_ledger is ledger
+    assert scheduler.scheduler_config.horizon_days == 5
+    assert policy.config.min_interval_seconds == 30
+    assert ledger.config.mode.value == "improvement"
+    # Pool sizes and the polling switch only change on restart.
+    assert scheduler.scheduler_config.render_workers == 0
+    assert scheduler.scheduler_config.adaptive_polling is True
+    assert scheduler.render_executor is None
+
+
+def test_scheduler_config_rejects_unknown_settings():
+    with pytest.raises(ValueError, match="poll_every"):
+        SchedulerConfig().with_overrides({"poll_every": 10})
+
+
+def test_scheduler_config_overrides_are_converted_to_field_types():
+    config = SchedulerConfig().with_overrides(
+        {"party_size": "4", "poll_interval_seconds": 60.0, "adaptive_polling": "yes"}
+    )
+    assert config.party_size == 4
+    assert config.poll_interval_seconds == 60
+    assert config.adaptive_polling is True
+    assert SchedulerConfig().with_overrides({"min_score": None}).min_score is None
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [{"party_size": "two"}, {"poll_interval_seconds": 2.5}, {"avoid_aisle": "maybe"}],
+)
+def test_scheduler_config_rejects_mistyped_settings(settings):
+    with pytest.raises(WatchlistError, match=next(iter(settings))):
+        SchedulerConfig().with_overrides(settings)
+
+
+def test_run_once_logs_cycle_metrics_and_writes_snapshot(tmp_path, caplog):
+    registry = MetricsRegistry()
+    previous = metrics.set_registry(registry)
+    try:
+        scheduler = MonitorScheduler(
+            AppConfig(date="2026-01-05"),
+            advisor=FakeAdvisor([make_recommendation()], screening_dates={date(2026, 1, 5)}),
+            notifier=FakeNotifier(),
+            scheduler_config=SchedulerConfig(
+                horizon_days=1, metrics_file=str(tmp_path / "metrics.prom")
+            ),
+            renderer=FakeRenderer(),
+            latest_date_path=tmp_path / "latest_screening_date.txt",
+        )
+        with caplog.at_level("INFO", logger="src.scheduler"):
+            scheduler.run_once()
+    finally:
+        metrics.set_registry(previous)
+
+    assert any("Cycle metrics: cycle=1x" in record.message for record in caplog.records)
+    assert registry.snapshot()["counters"]["alerts_dispatched"] == 1
+    assert "cinema_monitor_alerts_dispatched_total 1" in (tmp_path / "metrics.prom").read_text()
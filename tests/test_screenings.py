@@ -2,9 +2,15 @@ from datetime import date, time
 from pathlib import Path
 
 import httpx
+from bs4 import BeautifulSoup
 
 from src.config import AppConfig
-from src.screenings import ScreeningDescriptor, ScreeningDiscovery, filter_screenings_for_config
+from src.screenings import (
+    ScreeningDescriptor,
+    ScreeningDiscovery,
+    filter_screenings_for_config,
+    parse_show_time,
+)
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
@@ -92,3 +98,137 @@ def test_discovery_filters_non_english_or_non_imax():
     screenings = discovery.discover("https://example.com/movie", config)
 
     assert [s.order_url for s in screenings] == ["https://tickets.example.com/order/111"]
+
+
+def _parse_with_soup(html: str, film_format: str = "imax"):
+    """The previous BeautifulSoup implementation, kept as the reference."""
+    descriptors = []
+    soup = BeautifulSoup(html, "html.parser")
+    for column in soup.select("div.qb-movie-info-column"):
+        for anchor in column.select("a.btn.btn-primary.btn-lg"):
+            data_attrs = anchor.get("data-attrs") or ""
+            if not isinstance(anchor.get("data-url"), str):
+                continue
+            if "original-lang-en" not in data_attrs.lower():
+                continue
+            if film_format.lower() not in data_attrs.lower():
+                continue
+            label = anchor.get_text(strip=True)
+            show_time = parse_show_time(label)
+            if show_time is None:
+                continue
+            metadata = {
+                key: str(value)
+                for key, value in anchor.attrs.items()
+                if key.startswith("data-") and key != "data-url"
+            }
+            descriptors.append(
+                ScreeningDescriptor(label, show_time, anchor["data-url"], metadata=metadata)
+            )
+    return descriptors
+
+
+TRICKY_PAGE = """
+<a class="btn btn-primary btn-lg" data-url="outside" data-attrs="imax,original-lang-en">10:00</a>
+<div class="wrapper qb-movie-info-column extra">
+  <div class="inner">
+    <a class="btn-lg btn btn-primary" data-url="https://t.example/order/1"
+       data-attrs="IMAX,original-lang-en" data-flag data-note="a &amp; b">
+      <!-- 09:00 -->
+      <b> 11:15 </b><span>&nbsp;left</span>
+    </a>
+  </div>
+  <a class="btn btn-primary" data-url="not-large" data-attrs="imax,original-lang-en">12:00</a>
+  <a class="btn btn-primary btn-lg" data-attrs="imax,original-lang-en">12:30</a>
+  <a class="btn btn-primary btn-lg" data-url="no-time" data-attrs="imax,original-lang-en">TBA</a>
+  <a class="btn btn-primary btn-lg" data-url="dubbed" data-attrs="imax,dubbed-lang-cs">13:00</a>
+  <div><a class="btn btn-primary btn-lg" data-url="unclosed" data-attrs="imax,original-lang-en">
+    14:45 <span>last</span></div>
+</div>
+<div class="qb-movie-info-column">
+  <a class="btn btn-primary btn-lg" data-url="https://t.example/order/2"
+     data-attrs="4dx,imax,original-lang-en">22:05</a>
+</div>
+"""
+
+
+def test_streaming_parser_matches_soup_reference():
+    discovery = ScreeningDiscovery()
+
+    for html in (load_fixture("movie_page.html"), TRICKY_PAGE):
+        assert discovery._parse_screenings(html) == _parse_with_soup(html)
+    assert [s.order_url for s in discovery._parse_screenings(TRICKY_PAGE)] == [
+        "https://t.example/order/1",
+        "unclosed",
+        "https://t.example/order/2",
+    ]
+    assert discovery._parse_screenings(TRICKY_PAGE, film_format="4dx") == _parse_with_soup(
+        TRICKY_PAGE, film_format="4dx"
+    )
+
+
+DATED_PAGE = """
+<div data-date="2026-01-05">
+  <div class="qb-movie-info-column">
+    <a class="btn btn-primary btn-lg" data-url="mon-1" data-attrs="imax,original-lang-en">10:00</a>
+    <a class="btn btn-primary btn-lg" data-url="mon-2" data-attrs="imax,original-lang-en">20:00</a>
+  </div>
+</div>
+<div data-date="2026-01-06">
+  <div class="qb-movie-info-column">
+    <a class="btn btn-primary btn-lg" data-url="tue-1" data-attrs="imax,original-lang-en">21:00</a>
+    <a class="btn btn-primary btn-lg" data-url="wed-1" data-date="2026-01-07"
+       data-attrs="imax,original-lang-en">19:00</a>
+  </div>
+</div>
+<div data-date="2026-01-09">
+  <div class="qb-movie-info-column">
+    <a class="btn btn-primary btn-lg" data-url="fri-1" data-attrs="imax,original-lang-en">19:00</a>
+  </div>
+</div>
+"""
+
+
+def test_discover_many_fetches_each_movie_page_once_and_groups_by_date():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        return httpx.Response(200, text=DATED_PAGE)
+
+    discovery = ScreeningDiscovery(transport=httpx.MockTransport(handler))
+    config = AppConfig(date="2026-01-05", earliest_show_time="18:00")
+    dates = [date(2026, 1, 5), date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 8)]
+
+    grouped = discovery.discover_many(config, dates)
+
+    assert len(requests) == 1
+    assert {day: [s.order_url for s in screenings] for day, screenings in grouped.items()} == {
+        date(2026, 1, 5): ["mon-2"],
+        date(2026, 1, 6): ["tue-1"],
+        date(2026, 1, 7): ["wed-1"],
+        date(2026, 1, 8): [],
+    }
+    assert (
+        discovery.discover(config.movie_url_for_date(dates[1]), config, dates[1])
+        == grouped[dates[1]]
+    )
+
+
+def test_discover_many_applies_undated_pages_to_every_date():
+    html = load_fixture("movie_page.html")
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        return httpx.Response(200, text=html)
+
+    discovery = ScreeningDiscovery(transport=httpx.MockTransport(handler))
+    config = AppConfig(date="2026-01-05")
+    dates = [date(2026, 1, 5), date(2026, 1, 6)]
+
+    grouped = discovery.discover_many(config, dates)
+
+    assert len(requests) == 1
+    for day in dates:
+        assert grouped[day] == discovery.discover(config.movie_url_for_date(day), config, day)
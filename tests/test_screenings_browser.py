@@ -1,6 +1,7 @@
 from datetime import date
 
-from src.screenings_browser import _extract_date_from_url
+from src.config import AppConfig
+from src.screenings_browser import BrowserScreeningDiscovery, _extract_date_from_url
 
 
 def test_extract_date_from_url_fragment():
@@ -14,3 +15,113 @@ def test_extract_date_from_url_fragment():
 def test_extract_date_from_url_missing():
     url = "https://www.cinemacity.cz/films/avatar/123?lang=en_GB"
     assert _extract_date_from_url(url) is None
+
+
+class FakeAnchor:
+    def __init__(self, order_url, label):
+        self.order_url = order_url
+        self.label = label
+
+    def get_attribute(self, name):
+        return {"data-url": self.order_url, "data-attrs": "imax,original-lang-en"}.get(name)
+
+    def inner_text(self):
+        return self.label
+
+
+class FakeMoviePage:
+    """Single-page booking widget whose showtimes follow the `at=` fragment."""
+
+    def __init__(self, showtimes_by_date):
+        self.showtimes_by_date = showtimes_by_date
+        self.url = "about:blank"
+        self.calls = []
+
+    def goto(self, url, **kwargs):
+        self.calls.append("goto")
+        self.url = url
+
+    def reload(self, **kwargs):
+        self.calls.append("reload")
+
+    def evaluate(self, script, arg=None):
+        if "location.hash" in script:
+            self.calls.append("hash")
+            self.url = self.url.split("#", 1)[0] + "#" + arg
+            return None
+        return "|".join(anchor.order_url for anchor in self._anchors())
+
+    def wait_for_selector(self, selector, **kwargs):
+        self.calls.append("wait_for_selector")
+
+    def wait_for_function(self, script, arg=None, **kwargs):
+        self.calls.append("wait_for_function")
+        assert arg["previous"] == self.previous_signature
+
+    def query_selector_all(self, selector):
+        anchors = self._anchors()
+        self.previous_signature = "|".join(anchor.order_url for anchor in anchors)
+        return anchors
+
+    def _anchors(self):
+        return self.showtimes_by_date.get(_extract_date_from_url(self.url), [])
+
+
+class PageDiscovery(BrowserScreeningDiscovery):
+    def __init__(self, page, **kwargs):
+        super().__init__(**kwargs)
+        self.page = page
+
+    def _run(self, config, work):
+        return work(self.page)
+
+
+def test_discover_many_switches_dates_by_fragment_after_one_load():
+    days = [date(2026, 1, 5), date(2026, 1, 6), date(2026, 1, 7)]
+    page = FakeMoviePage(
+        {
+            days[0]: [FakeAnchor("order/1", "18:00")],
+            days[1]: [FakeAnchor("order/2", "19:30"), FakeAnchor("order/3", "21:00")],
+        }
+    )
+    discovery = PageDiscovery(page)
+    config = AppConfig(date="2026-01-05")
+
+    grouped = discovery.discover_many(config, days)
+
+    assert {day: [s.order_url for s in found] for day, found in grouped.items()} == {
+        days[0]: ["order/1"],
+        days[1]: ["order/2", "order/3"],
+        days[2]: [],
+    }
+    assert (discovery.page_loads, discovery.fragment_navigations) == (1, 2)
+    assert page.calls == [
+        "goto",
+        "wait_for_selector",
+        "hash",
+        "wait_for_function",
+        "hash",
+        "wait_for_function",
+    ]
+
+
+def test_next_cycle_reloads_the_open_page_instead_of_reusing_stale_showtimes():
+    day = date(2026, 1, 5)
+    page = FakeMoviePage({day: [FakeAnchor("order/1", "18:00")]})
+    discovery = PageDiscovery(page)
+    config = AppConfig(date="2026-01-05")
+
+    discovery.discover_many(config, [day])
+    page.calls.clear()
+    discovery.discover_many(config, [day])
+    assert page.calls == ["reload", "wait_for_selector"]
+
+    page.calls.clear()
+    discovery.page_max_age_seconds = 0
+    discovery.discover(config.movie_url_for_date(day), config, day)
+    assert page.calls == ["reload", "wait_for_selector"]
+    assert discovery.page_loads == 3
+
+
+def test_close_without_session_is_a_no_op():
+    BrowserScreeningDiscovery().close()
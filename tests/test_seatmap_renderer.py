@@ -1,10 +1,13 @@
+import io
+from dataclasses import replace
 from pathlib import Path
 
-from PIL import Image, ImageColor
+import pytest
+from PIL import Image, ImageColor, ImageDraw
 
 from src.seat_map import Seat, SeatMap, SeatStatus
 from src.seat_selection import SeatBlockSuggestion
-from src.seatmap_renderer import SeatMapRenderer
+from src.seatmap_renderer import RenderEncoding, SeatMapRenderer
 
 
 def _build_seat(row_number: int, seat_number: int, grid_x: int) -> Seat:
@@ -53,3 +56,195 @@ def test_renderer_highlights_recommendations(tmp_path):
 def _seat_center(renderer: SeatMapRenderer, seat_map: SeatMap, seat: Seat) -> tuple[int, int]:
     x0, y0, x1, y1 = renderer._seat_box(seat_map, seat)
     return (x0 + (renderer.seat_size // 2), y0 + (renderer.seat_size // 2))
+
+
+def test_render_bytes_stays_in_memory_unless_archiving(tmp_path):
+    seat_map = SeatMap.from_seats([_build_seat(1, 1, 1), _build_seat(1, 2, 2)])
+    suggestion = SeatBlockSuggestion(
+        row_number=1, seat_numbers=[2], labels=["2"], grid_positions=[2], score=0.95
+    )
+
+    renderer = SeatMapRenderer(output_dir=tmp_path)
+    data = renderer.render_bytes(seat_map, suggestion)
+
+    assert data.startswith(b"\x89PNG")
+    assert not (tmp_path / "renders").exists()
+    # Repeats are served from the in-memory LRU without re-encoding.
+    assert renderer.render_bytes(seat_map, suggestion) is data
+
+    archiving = SeatMapRenderer(output_dir=tmp_path, archive=True)
+    archived = archiving.render_bytes(seat_map, suggestion)
+
+    [archive_file] = (tmp_path / "renders").iterdir()
+    assert archive_file.read_bytes() == archived
+
+
+def _mixed_hall() -> SeatMap:
+    statuses = [SeatStatus.AVAILABLE, SeatStatus.OCCUPIED, SeatStatus.WHEELCHAIR]
+    return SeatMap.from_seats(
+        Seat(
+            row_number=row,
+            seat_number=number,
+            label=str(number),
+            status=statuses[(row + number) % len(statuses)],
+            grid_x=number,
+            grid_row=row,
+        )
+        for row in range(1, 4)
+        for number in range(1, 13)
+    )
+
+
+def _reference_render(renderer, seat_map, suggestions):
+    """Full redraw of every seat, as the renderer did before caching the base layer."""
+    width = renderer._dimension(seat_map.min_grid_x, seat_map.max_grid_x)
+    height = renderer._dimension(seat_map.min_grid_row, seat_map.max_grid_row)
+    image = Image.new("RGB", (width, height), renderer.BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(image)
+    highlighted = {
+        (suggestion.row_number, number)
+        for suggestion in suggestions
+        for number in suggestion.seat_numbers
+    }
+    for seat in seat_map.seats:
+        fill = renderer._status_colors[seat.status]
+        outline = renderer.BORDER_COLOR
+        if (seat.row_number, seat.seat_number) in highlighted:
+            fill, outline = renderer.RECOMMENDED_COLOR, renderer.RECOMMENDED_BORDER
+        draw.rectangle(renderer._seat_box(seat_map, seat), fill=fill, outline=outline, width=2)
+    return image
+
+
+def test_cached_base_layer_matches_full_redraw(tmp_path):
+    seat_map = _mixed_hall()
+    suggestions = [
+        SeatBlockSuggestion(
+            row_number=row, seat_numbers=[5, 6], labels=["5", "6"], grid_positions=[5, 6], score=1
+        )
+        for row in (1, 2, 3)
+    ]
+    renderer = SeatMapRenderer(output_dir=tmp_path)
+
+    for suggestion in suggestions:
+        image = renderer.render_image(seat_map, suggestion)
+        assert image.tobytes() == _reference_render(renderer, seat_map, [suggestion]).tobytes()
+
+    composite = renderer.render_composite_image(seat_map, suggestions)
+    assert composite.tobytes() == _reference_render(renderer, seat_map, suggestions).tobytes()
+    assert (renderer.base_misses, renderer.base_hits) == (1, 3)
+
+
+def test_status_change_invalidates_base_layer(tmp_path):
+    seat_map = _mixed_hall()
+    suggestion = SeatBlockSuggestion(
+        row_number=1, seat_numbers=[2], labels=["2"], grid_positions=[2], score=1
+    )
+    renderer = SeatMapRenderer(output_dir=tmp_path, base_cache_size=1)
+    renderer.render_image(seat_map, suggestion)
+
+    seat_map = SeatMap.from_seats(
+        [replace(seat_map.seats[0], status=SeatStatus.OCCUPIED), *seat_map.seats[1:]]
+    )
+    changed = renderer.render_image(seat_map, suggestion)
+
+    assert renderer.base_misses == 2
+    assert changed.tobytes() == _reference_render(renderer, seat_map, [suggestion]).tobytes()
+
+
+@pytest.mark.parametrize("preset", ["png-palette", "png-optimized", "webp"])
+def test_compact_encodings_are_lossless(preset):
+    seat_map = _mixed_hall()
+    suggestion = SeatBlockSuggestion(
+        row_number=2, seat_numbers=[3, 4], labels=["3", "4"], grid_positions=[3, 4], score=1
+    )
+    reference = SeatMapRenderer().render_image(seat_map, suggestion)
+    default_size = len(SeatMapRenderer().render_bytes(seat_map, suggestion))
+
+    renderer = SeatMapRenderer(encoding=RenderEncoding.preset(preset))
+    data = renderer.render_bytes(seat_map, suggestion)
+
+    decoded = Image.open(io.BytesIO(data))
+    assert decoded.format == preset.split("-")[0].upper()
+    assert decoded.convert("RGB").tobytes() == reference.tobytes()
+    assert len(data) < default_size
+
+
+def test_max_dimension_downscales_to_flat_colours():
+    seat_map = _mixed_hall()
+    suggestion = SeatBlockSuggestion(
+        row_number=1, seat_numbers=[1], labels=["1"], grid_positions=[1], score=1
+    )
+    renderer = SeatMapRenderer(encoding=RenderEncoding.preset("png", max_dimension=200))
+    reference = renderer.render_image(seat_map, suggestion)
+
+    decoded = Image.open(io.BytesIO(renderer.render_bytes(seat_map, suggestion)))
+
+    assert max(decoded.size) == 200
+    assert decoded.width / decoded.height == pytest.approx(reference.width / reference.height, 0.05)
+    source_colors = {rgb for _count, rgb in reference.getcolors()}
+    assert {rgb for _count, rgb in decoded.convert("RGB").getcolors()} <= source_colors
+
+
+def test_encoding_is_part_of_the_file_name_and_cache_key(tmp_path):
+    seat_map = _mixed_hall()
+    suggestion = SeatBlockSuggestion(
+        row_number=1, seat_numbers=[1], labels=["1"], grid_positions=[1], score=1
+    )
+    png = SeatMapRenderer(output_dir=tmp_path).render(seat_map, suggestion)
+    webp = SeatMapRenderer(output_dir=tmp_path, encoding=RenderEncoding(format="webp")).render(
+        seat_map, suggestion
+    )
+
+    assert Path(png).suffix == ".png"
+    assert Path(webp).suffix == ".webp"
+    assert Image.open(webp).format == "WEBP"
+
+
+def test_unknown_encoding_preset_is_rejected():
+    with pytest.raises(ValueError):
+        RenderEncoding.preset("gif")
+
+
+def _irregular_hall() -> SeatMap:
+    """Sparse grid with an aisle, a missing row, staggered rows and every status."""
+    statuses = list(SeatStatus)
+    seats = [
+        Seat(
+            row_number=row,
+            seat_number=number,
+            label=str(number),
+            status=statuses[(row * 7 + number) % len(statuses)],
+            grid_x=number + (3 if number > 6 else 0) + row % 2,
+            grid_row=row + (1 if row > 3 else 0),
+        )
+        for row in range(1, 7)
+        for number in range(1, 11)
+    ]
+    return SeatMap.from_seats(seats)
+
+
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        {},
+        {"seat_size": 4, "seat_gap": 1, "margin": 0},
+        {"seat_size": 1, "seat_gap": 2, "margin": 3},
+        {"seat_size": 12, "seat_gap": 3, "margin": 7},
+        {"seat_size": 10, "seat_gap": 0},
+    ],
+)
+def test_array_painter_matches_draw_painter(geometry):
+    seat_map = _irregular_hall()
+    suggestion = SeatBlockSuggestion(
+        row_number=2, seat_numbers=[3, 4], labels=["3", "4"], grid_positions=[3, 4], score=1
+    )
+
+    array = SeatMapRenderer(painter="array", **geometry).render_image(seat_map, suggestion)
+    draw = SeatMapRenderer(painter="draw", **geometry).render_image(seat_map, suggestion)
+
+    assert array.tobytes() == draw.tobytes()
+
+
+def test_unknown_painter_is_rejected():
+    with pytest.raises(ValueError):
+        SeatMapRenderer(painter="numpy")
@@ -0,0 +1,120 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.seat_map import SeatMapParser
+from src.seatmap_fetcher import SeatMapFetcherError
+from src.single_flight import SingleFlightSeatMapFetcher
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SVG = (FIXTURES / "seatmap_sample.svg").read_text(encoding="utf-8")
+
+
+class CountingFetcher:
+    def __init__(self, release=None, fail=False):
+        self.calls = []
+        self.release = release
+        self.fail = fail
+        self.last_presentation_date = None
+
+    def fetch_svg(self, order_url):
+        self.calls.append(order_url)
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        if self.fail:
+            raise SeatMapFetcherError("boom")
+        return SVG
+
+
+def test_concurrent_callers_share_one_fetch_and_seat_map():
+    release = threading.Event()
+    fetcher = CountingFetcher(release=release)
+    single_flight = SingleFlightSeatMapFetcher(fetcher)
+    results = []
+
+    def worker(url):
+        results.append(single_flight.fetch(url))
+
+    threads = [
+        threading.Thread(target=worker, args=("https://tickets.example.com/api/order/1",)),
+        threading.Thread(target=worker, args=("https://tickets.example.com/order/1",)),
+        threading.Thread(target=worker, args=("https://tickets.example.com/order/1",)),
+    ]
+    for thread in threads:
+        thread.start()
+    while single_flight.misses + single_flight.hits < len(threads):
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert fetcher.calls == ["https://tickets.example.com/order/1"]
+    assert len(results) == 3
+    assert all(result.seat_map is results[0].seat_map for result in results)
+
+
+def test_results_expire_after_freshness_window():
+    now = {"value": 0.0}
+    fetcher = CountingFetcher()
+    single_flight = SingleFlightSeatMapFetcher(
+        fetcher, freshness_seconds=10, clock=lambda: now["value"]
+    )
+
+    single_flight.fetch_svg("https://tickets.example.com/order/1")
+    now["value"] = 5.0
+    single_flight.fetch_svg("https://tickets.example.com/order/1")
+    assert len(fetcher.calls) == 1
+
+    now["value"] = 11.0
+    single_flight.fetch_svg("https://tickets.example.com/order/1")
+    assert len(fetcher.calls) == 2
+
+
+def test_expired_results_are_pruned_and_entries_capped():
+    now = {"value": 0.0}
+    single_flight = SingleFlightSeatMapFetcher(
+        CountingFetcher(), freshness_seconds=10, max_entries=2, clock=lambda: now["value"]
+    )
+
+    single_flight.fetch("https://tickets.example.com/order/1")
+    now["value"] = 11.0
+    single_flight.fetch("https://tickets.example.com/order/2")
+    assert list(single_flight._fresh) == ["https://tickets.example.com/order/2"]
+
+    single_flight.fetch("https://tickets.example.com/order/3")
+    single_flight.fetch("https://tickets.example.com/order/4")
+    assert list(single_flight._fresh) == [
+        "https://tickets.example.com/order/3",
+        "https://tickets.example.com/order/4",
+    ]
+
+
+def test_failures_are_not_cached():
+    fetcher = CountingFetcher(fail=True)
+    single_flight = SingleFlightSeatMapFetcher(fetcher)
+
+    for _ in range(2):
+        with pytest.raises(SeatMapFetcherError):
+            single_flight.fetch("https://tickets.example.com/order/1")
+    assert len(fetcher.calls) == 2
+
+
+def test_seat_map_is_parsed_once_on_first_use():
+    class CountingParser:
+        def __init__(self):
+            self.calls = 0
+
+        def parse(self, svg_markup):
+            self.calls += 1
+            return SeatMapParser().parse(svg_markup)
+
+    parser = CountingParser()
+    single_flight = SingleFlightSeatMapFetcher(CountingFetcher(), parser=parser)
+
+    first = single_flight.fetch("https://tickets.example.com/order/1")
+    second = single_flight.fetch("https://tickets.example.com/order/1")
+    assert parser.calls == 0
+
+    assert first.seat_map is second.seat_map
+    assert parser.calls == 1
@@ -0,0 +1,64 @@
+from datetime import date
+
+from src.state_store import AlertRecord, SeatSnapshot, StateStore
+
+
+def test_state_persists_across_instances_in_wal_mode(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    store = StateStore(path)
+    store.set_date("latest_screening_date|avatar", date(2026, 1, 8))
+    store.save_snapshot(
+        SeatSnapshot(
+            key="avatar|https://tickets.example.com/order/1",
+            layout_fingerprint="abc",
+            status_vector="aao",
+            captured_at=10.0,
+            show_at=100.0,
+            next_check=70.0,
+            has_block=True,
+        )
+    )
+    store.close()
+
+    reopened = StateStore(path)
+    journal_mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+    assert reopened.get_date("latest_screening_date|avatar") == date(2026, 1, 8)
+    snapshot = reopened.load_snapshot("avatar|https://tickets.example.com/order/1")
+    assert snapshot is not None
+    assert snapshot.status_vector == "aao"
+    assert snapshot.has_block is True
+
+
+def test_batch_defers_writes_until_outermost_batch_exits(tmp_path):
+    store = StateStore(tmp_path / "state.sqlite3")
+
+    with store.batch():
+        store.set_value("a", "1")
+        with store.batch():
+            store.record_layout("abc", seat_count=120)
+        assert store.get_value("a") is None
+        assert not store.known_layout("abc")
+
+    assert store.get_value("a") == "1"
+    assert store.known_layout("abc")
+
+
+def test_prune_drops_stale_rows(tmp_path):
+    now = {"value": 1000.0}
+    store = StateStore(tmp_path / "state.sqlite3", clock=lambda: now["value"])
+    store.save_alert(
+        AlertRecord(
+            alert_key="k",
+            screening_key="s",
+            content_hash="h",
+            score=0.9,
+            status_hash="x",
+            first_sent=1000.0,
+            last_sent=1000.0,
+        )
+    )
+
+    now["value"] = 5000.0
+    store.prune(older_than_seconds=3600)
+    assert store.load_alert("k") is None
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from src.config import AppConfig
+from src.watchlist import Watchlist, WatchlistError, WatchlistFile, WatchTarget
+
+
+def test_watch_target_inherits_missing_fields_from_base_config():
+    base = AppConfig(city="prague", film_format="imax")
+    target = WatchTarget.from_spec("dune-part-two:5376s2r::4dx")
+
+    config = target.apply(base)
+    assert config.movie_name_slug == "dune-part-two"
+    assert config.movie_id == "5376s2r"
+    assert config.city == "prague"
+    assert config.film_format == "4dx"
+
+
+def test_watchlist_from_env_parses_specs_and_deduplicates(monkeypatch):
+    monkeypatch.delenv("WATCHLIST_FILE", raising=False)
+    monkeypatch.setenv("WATCHLIST", "avatar:7148s2r:prague, avatar:7148s2r:prague, dune:1:brno")
+
+    watchlist = Watchlist.from_env(AppConfig())
+    assert [target.key for target in watchlist.targets] == [
+        "avatar:7148s2r:prague:",
+        "dune:1:brno:",
+    ]
+
+
+def test_watchlist_from_env_defaults_to_app_config(monkeypatch):
+    monkeypatch.delenv("WATCHLIST_FILE", raising=False)
+    monkeypatch.delenv("WATCHLIST", raising=False)
+    config = AppConfig(movie_name_slug="avatar", movie_id="7148s2r")
+
+    watchlist = Watchlist.from_env(config)
+    assert len(watchlist) == 1
+    assert watchlist.targets[0].apply(config) == config
+
+
+def test_watchlist_from_file(tmp_path):
+    path = tmp_path / "watchlist.json"
+    path.write_text(
+        json.dumps(
+            {
+                "targets": [
+                    {"movie_name_slug": "avatar", "movie_id": "7148s2r", "city": "brno"},
+                    "dune:5376s2r",
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    watchlist = Watchlist.from_file(path)
+    assert [target.movie_name_slug for target in watchlist.targets] == ["avatar", "dune"]
+    assert watchlist.targets[0].city == "brno"
+
+
+def test_watchlist_rejects_invalid_entries(tmp_path):
+    with pytest.raises(WatchlistError):
+        WatchTarget.from_spec("missing-id")
+    path = tmp_path / "watchlist.json"
+    path.write_text(json.dumps([{"movie_id": "1"}]), encoding="utf-8")
+    with pytest.raises(WatchlistError):
+        Watchlist.from_file(path)
+
+
+def test_watchlist_file_reads_toml_targets_and_scheduler_settings(tmp_path):
+    path = tmp_path / "watchlist.toml"
+    path.write_text(
+        """
+[scheduler]
+min_score = 0.6
+adaptive_polling = true
+
+[[targets]]
+movie_name_slug = "avatar"
+movie_id = "7148s2r"
+party_size = 4
+min_score = 0.9
+""",
+        encoding="utf-8",
+    )
+
+    watchlist_file = WatchlistFile.load(path)
+    (target,) = watchlist_file.watchlist.targets
+    assert target.key == "avatar:7148s2r::"
+    assert target.overrides() == {"party_size": 4, "min_score": 0.9}
+    assert watchlist_file.settings == {"min_score": 0.6, "adaptive_polling": True}
+
+
+def test_watchlist_file_reads_yaml(tmp_path):
+    path = tmp_path / "watchlist.yaml"
+    path.write_text(
+        "scheduler:\n"
+        "  top_n: 5\n"
+        "targets:\n"
+        "  - dune:5376s2r:brno\n"
+        "  - movie_name_slug: avatar\n"
+        "    movie_id: 7148s2r\n"
+        "    top_n: 1\n",
+        encoding="utf-8",
+    )
+
+    watchlist_file = WatchlistFile.load(path)
+    assert [target.key for target in watchlist_file.watchlist.targets] == [
+        "dune:5376s2r:brno:",
+        "avatar:7148s2r::",
+    ]
+    assert watchlist_file.watchlist.targets[1].top_n == 1
+    assert watchlist_file.settings == {"top_n": 5}
+
+
+def test_watchlist_file_rejects_invalid_overrides(tmp_path):
+    path = tmp_path / "watchlist.toml"
+    path.write_text(
+        '[[targets]]\nmovie_name_slug = "avatar"\nmovie_id = "1"\nparty_size = "many"\n',
+        encoding="utf-8",
+    )
+    with pytest.raises(WatchlistError):
+        WatchlistFile.load(path)
+    path.write_text('targets = ["avatar:1"]\nscheduler = 3\n', encoding="utf-8")
+    with pytest.raises(WatchlistError):
+        WatchlistFile.load(path)